@@ -0,0 +1,113 @@
+"""
+Capa de Configuración: Instrumentación del Pool de Conexiones.
+Extiende los pools de SQLAlchemy para medir cuánto espera cada petición por una
+conexión (checkout), cuántas peticiones están esperando y cuántas agotaron el
+timeout, exponiendo una instantánea consultable desde la API de monitoreo.
+"""
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Límites superiores (ms) del histograma de latencia de checkout
+LIMITES_LATENCIA_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class MetricasPool:
+    """Acumula contadores y el histograma de latencia de checkout de un pool."""
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.esperando = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.suma_latencia_ms = 0.0
+        self.max_latencia_ms = 0.0
+        self._cubetas = [0] * (len(LIMITES_LATENCIA_MS) + 1)
+
+    def iniciar_espera(self):
+        with self._candado:
+            self.esperando += 1
+
+    def finalizar_espera(self, latencia_ms: float, exito: bool):
+        with self._candado:
+            self.esperando -= 1
+            if not exito:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.suma_latencia_ms += latencia_ms
+            self.max_latencia_ms = max(self.max_latencia_ms, latencia_ms)
+            indice = next(
+                (i for i, limite in enumerate(LIMITES_LATENCIA_MS) if latencia_ms <= limite),
+                len(LIMITES_LATENCIA_MS)
+            )
+            self._cubetas[indice] += 1
+
+    def histograma(self) -> dict:
+        """Histograma acumulado al estilo Prometheus: {'le_5': n, ..., 'le_inf': total}."""
+        with self._candado:
+            cubetas = list(self._cubetas)
+        acumulado, salida = 0, {}
+        for limite, cantidad in zip(LIMITES_LATENCIA_MS + ("inf",), cubetas):
+            acumulado += cantidad
+            salida[f"le_{limite}"] = acumulado
+        return salida
+
+
+class _CheckoutMedido:
+    """Mixin: envuelve la obtención de conexiones del pool midiendo la espera."""
+
+    @property
+    def metricas(self) -> MetricasPool:
+        if not hasattr(self, "_metricas"):
+            self._metricas = MetricasPool()
+        return self._metricas
+
+    def _do_get(self):
+        metricas = self.metricas
+        metricas.iniciar_espera()
+        inicio = time.perf_counter()
+        exito = False
+        try:
+            conexion = super()._do_get()
+            exito = True
+            return conexion
+        finally:
+            metricas.finalizar_espera((time.perf_counter() - inicio) * 1000, exito)
+
+
+class QueuePoolInstrumentado(_CheckoutMedido, QueuePool):
+    """QueuePool del motor síncrono con métricas de checkout."""
+
+
+class AsyncQueuePoolInstrumentado(_CheckoutMedido, AsyncAdaptedQueuePool):
+    """Pool del motor asíncrono con métricas de checkout."""
+
+
+def instantanea_pool(pool) -> dict:
+    """Estado vivo del pool: tamaño, conexiones prestadas, overflow, esperas y latencias."""
+    datos = {"clase": type(pool).__name__, "estado": pool.status()}
+    if isinstance(pool, QueuePool):
+        datos.update({
+            "tamano": pool.size(),
+            "prestadas": pool.checkedout(),
+            "libres": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout_segundos": pool.timeout(),
+        })
+
+    metricas: Optional[MetricasPool] = getattr(pool, "metricas", None)
+    if metricas is not None:
+        datos.update({
+            "esperando": metricas.esperando,
+            "checkouts": metricas.checkouts,
+            "timeouts": metricas.timeouts,
+            "latencia_checkout_ms": {
+                "promedio": round(metricas.suma_latencia_ms / metricas.checkouts, 3) if metricas.checkouts else 0.0,
+                "maxima": round(metricas.max_latencia_ms, 3),
+                "histograma": metricas.histograma(),
+            },
+        })
+    return datos
@@ -3,29 +3,115 @@ Capa de Presentación: Controladores API (API Layer)
 Orquesta las peticiones HTTP y mapea los Casos de Uso (CU) del sistema, 
 delegando la lógica de negocio a la Capa de Servicios para cumplir con SOLID (SRP).
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List
-from app.domain.schemas import DerivacionInput
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import quote
+import os
+from app.domain.enums import EstadoSolicitud, RolFlujo
+from app.domain.excepciones import AdjuntoDemasiadoGrande, ConflictoTransicion
+from app.domain.maquina_estados import maquina_estados
+from app.domain.schemas import DerivacionInput, DerivacionLoteInput
 
 # Importamos nuestros esquemas (DTOs) y dependencias
-from app.domain.schemas import SolicitudDTO, DictamenInput
+from app.domain.schemas import SolicitudDTO, DictamenInput, DictamenLoteInput, SolicitudCreateInput
+from app.config import settings
 from app.config.database import get_db
 from app.services.bandeja_facade import BandejaAprobacionFacade
+from app.services.almacen_adjuntos import almacen_adjuntos
+from app.services.detalle_facade import DetalleSolicitudFacade
+from app.services import busqueda, exportacion_historial, notificaciones
 from app.repositories import solicitud_repository
+from app.repositories.estado_repository import obtener_nombre_estado
+from app.services.paginacion import LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+from app.services.versiones_bandeja import marcar_version, no_modificado, versiones_bandeja
 
 router = APIRouter()
 
+# Tope de ítems para la carga masiva en un único cuerpo JSON
+MAX_ITEMS_CARGA_JSON = 10_000
+
+# Bandejas particionadas: segmento de la URL -> rol que la atiende
+BANDEJAS_ROL = {"secretaria": RolFlujo.SECRETARIO, "jefatura": RolFlujo.APROBADOR}
+
 
 @router.get("/approvals/pending", response_model=List[SolicitudDTO])
-def listar_pendientes(db: Session = Depends(get_db)):
+def listar_pendientes(
+    request: Request,
+    response: Response,
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    sla: Optional[str] = Query(None, pattern="^(vencidas|por_vencer)$"),
+    horas: Optional[int] = Query(None, ge=1, le=720),
+    db: Session = Depends(get_db)
+):
     """
     CU-01: Listar Bandeja de Pendientes.
     Patrón Estructural: Utiliza BandejaAprobacionFacade para encapsular la lógica 
     compleja de ordenamiento por SLA y cálculo del semáforo.
+    Paginación keyset: el cursor de la siguiente página viaja en la cabecera
+    'X-Siguiente-Cursor' (ausente en la última página).
+    Filtro de urgencia opcional: sla=vencidas | sla=por_vencer (&horas=N,
+    por defecto el umbral AMBAR).
+    GET condicional: con If-None-Match vigente responde 304 sin consultar MySQL.
     """
+    return servir_bandeja(request, response, db, limite, cursor, sla, horas)
+
+
+@router.get("/approvals/pending/{bandeja}", response_model=List[SolicitudDTO])
+def listar_pendientes_por_rol(
+    request: Request,
+    response: Response,
+    bandeja: str = Path(pattern="^(secretaria|jefatura)$"),
+    area: Optional[str] = Query(None, max_length=50),
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    sla: Optional[str] = Query(None, pattern="^(vencidas|por_vencer)$"),
+    horas: Optional[int] = Query(None, ge=1, le=720),
+    db: Session = Depends(get_db)
+):
+    """
+    CU-01 por rol: cada rol consulta solo su porción de la bandeja.
+    - secretaria: PENDIENTE y OBSERVADO (revisión técnica).
+    - jefatura: POR_APROBAR; con 'area' solo lo derivado a esa área.
+    Misma paginación, filtros de urgencia y GET condicional que /approvals/pending.
+    """
+    return servir_bandeja(request, response, db, limite, cursor, sla, horas, rol=BANDEJAS_ROL[bandeja], area=area)
+
+
+def servir_bandeja(request: Request, response: Response, db: Session, limite: int, cursor: Optional[str],
+                   sla: Optional[str], horas: Optional[int], rol: Optional[RolFlujo] = None, area: Optional[str] = None):
+    etag = etag_bandeja(request, horas)
+    sin_cambios = no_modificado(request, etag)
+    if sin_cambios:
+        return sin_cambios
+
     fachada = BandejaAprobacionFacade(db)
-    return fachada.obtener_bandeja_ordenada()
+    try:
+        bandeja, siguiente_cursor = fachada.obtener_bandeja_ordenada(limite=limite, cursor=cursor, filtro_sla=sla, horas=horas,
+                                                                     rol=rol, area=area)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if siguiente_cursor:
+        response.headers["X-Siguiente-Cursor"] = siguiente_cursor
+    marcar_version(response, etag)
+    return bandeja
+
+
+def etag_bandeja(request: Request, horas: Optional[int]) -> str:
+    """
+    Los cambios de semáforo con el umbral por defecto llegan como eventos del
+    planificador; un umbral a medida (o sin planificador) depende del reloj.
+    """
+    return versiones_bandeja.etag_bandeja(
+        f"{request.url.path}?{request.query_params}",
+        por_minuto=horas is not None or not settings.SLA_PLANIFICADOR_HABILITADO
+    )
 
 
 
@@ -36,8 +122,9 @@ def registrar_dictamen(id: int, payload: DictamenInput, db: Session = Depends(ge
     CU-02: Registrar Dictamen (Aprobar/Rechazar).
     Ejecuta el cambio de estado definitivo. El payload (DictamenInput) impone 
     el cumplimiento de la RN-03 (Comentario obligatorio) mediante Pydantic.
+    Un dictamen concurrente o sobre una versión ya superada responde 409.
     """
-    if payload.decision not in ["APROBADO", "RECHAZADO", "OBSERVADO"]:
+    if not maquina_estados.admite_destino(payload.decision, RolFlujo.APROBADOR):
         raise HTTPException(status_code=400, detail="Estado no válido")
     
     try:
@@ -46,7 +133,8 @@ def registrar_dictamen(id: int, payload: DictamenInput, db: Session = Depends(ge
             db=db,
             solicitud_id=id,
             nuevo_estado_str=payload.decision,
-            comentario=payload.comentario
+            comentario=payload.comentario,
+            version_esperada=payload.version
         )
 
         if not solicitud_actualizada:
@@ -54,30 +142,161 @@ def registrar_dictamen(id: int, payload: DictamenInput, db: Session = Depends(ge
 
         return {
             "mensaje": f"Solicitud {id} procesada exitosamente",
-            "nuevo_estado": solicitud_actualizada.estado_actual.tipoEstado,
+            "nuevo_estado": obtener_nombre_estado(db, solicitud_actualizada.estado_id),
             "audit_log": "Cambio registrado en MySQL"
         }
+    except ConflictoTransicion as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/approvals/verdict/batch")
+def registrar_dictamen_lote(payload: DictamenLoteInput, db: Session = Depends(get_db)):
+    """
+    CU-02 (masivo): Registrar el mismo dictamen sobre varias solicitudes.
+    Valida las transiciones de todo el lote con un único bloqueo y confirma
+    el historial en una sola transacción; reporta el resultado por id.
+    """
+    if not maquina_estados.admite_destino(payload.decision, RolFlujo.APROBADOR):
+        raise HTTPException(status_code=400, detail="Estado no válido")
+
+    try:
+        resultados = solicitud_repository.actualizar_estado_lote(db, payload.ids, payload.decision, payload.comentario)
+    except ConflictoTransicion as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return resumen_lote(resultados)
+
 
 
 @router.get("/approvals/history")
-def consultar_historial(db: Session = Depends(get_db)):
+def consultar_historial(request: Request, response: Response, db: Session = Depends(get_db)):
     
     """
     CU-03: Consultar Historial de Decisiones.
     Recupera y formatea las solicitudes que ya han alcanzado un estado resolutivo.
+    Admite GET condicional (ETag / If-None-Match).
     """
+    etag = versiones_bandeja.etag_historial()
+    sin_cambios = no_modificado(request, etag)
+    if sin_cambios:
+        return sin_cambios
+
     solicitudes_historicas = solicitud_repository.consultar_historial(db)
-    
-    # Formateamos la salida rápidamente 
+    marcar_version(response, etag)
+    return formatear_historial(solicitudes_historicas)
+
+
+@router.get("/approvals/history/export")
+def exportar_historial(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    estado: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    CU-03 (exportación): Historial completo en streaming (NDJSON o CSV).
+    Recorre el historial por bloques keyset, con memoria constante aun en
+    exportaciones de millones de filas. Filtros opcionales: rango de fechas
+    de la última decisión (desde/hasta) y uno o más estados finales.
+    """
+    estados_validos = [e.value for e in solicitud_repository.ESTADOS_HISTORIAL]
+    if estado and any(e not in estados_validos for e in estado):
+        raise HTTPException(status_code=400, detail=f"Estado no válido; permitidos: {', '.join(estados_validos)}")
+
+    nombre_archivo = f"historial_{datetime.now():%Y%m%d_%H%M%S}.{formato}"
+    return StreamingResponse(
+        exportacion_historial.exportar_historial(db, formato, estados=estado, desde=desde, hasta=hasta),
+        media_type=exportacion_historial.FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre_archivo}"'}
+    )
+
+
+@router.get("/approvals/search")
+def buscar_solicitudes(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    estado: Optional[List[str]] = Query(None),
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    desplazamiento: int = Query(0, ge=0, le=busqueda.MAX_DESPLAZAMIENTO),
+    db: Session = Depends(get_db)
+):
+    """
+    Búsqueda de solicitudes por alumno, tipo de trámite o texto de la
+    descripción, con coincidencia por prefijo ('garc nota' encuentra a
+    "García" con "Rectificación de Nota"). Resultados por relevancia; filtros
+    opcionales de estado y fecha de creación (desde/hasta). Si hay más
+    resultados, la cabecera X-Siguiente-Desplazamiento indica la siguiente página.
+    """
+    terminos, estados = validar_busqueda(q, estado)
+    filas, hay_mas = solicitud_repository.buscar_solicitudes(
+        db, terminos, estados=estados, desde=desde, hasta=hasta, limite=limite, desplazamiento=desplazamiento
+    )
+    if hay_mas:
+        response.headers["X-Siguiente-Desplazamiento"] = str(desplazamiento + limite)
+    return formatear_busqueda(filas)
+
+
+def validar_busqueda(q: str, estado: Optional[List[str]]):
+    """Términos normalizados y estados del filtro; 400 si alguno no es válido."""
+    estados_validos = [e.value for e in EstadoSolicitud]
+    if estado and any(e not in estados_validos for e in estado):
+        raise HTTPException(status_code=400, detail=f"Estado no válido; permitidos: {', '.join(estados_validos)}")
+    try:
+        return busqueda.normalizar_terminos(q), estado
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def formatear_busqueda(filas) -> list:
+    """Formato de salida de la búsqueda, compartido con el controlador asíncrono."""
+    return [
+        {
+            "id": sol.idSolicitud,
+            "alumno": sol.solicitante,
+            "tipo_tramite": sol.tipoSolicitud,
+            "estado": sol.estado_actual.tipoEstado,
+            "prioridad": sol.prioridad,
+            "fecha_creacion": sol.fechaCreacion,
+            "relevancia": round(float(relevancia), 4)
+        }
+        for sol, relevancia in filas
+    ]
+
+
+@router.get("/approvals/stream")
+async def suscribir_cambios(request: Request, ultimo_id: Optional[int] = Query(None, ge=0)):
+    """
+    Notificaciones en vivo de la bandeja (Server-Sent Events).
+    El cliente se suscribe una vez y aplica los cambios incrementales
+    (creada, derivacion, dictamen, sla_por_vencer, sla_vencido) en lugar de
+    sondear; 'resincronizar' indica que debe recargar la bandeja completa.
+    Reanuda desde la cabecera Last-Event-ID (o ?ultimo_id=) tras un corte.
+    """
+    cabecera = request.headers.get("last-event-id")
+    if cabecera and cabecera.isdigit():
+        ultimo_id = int(cabecera)
+    return StreamingResponse(
+        notificaciones.flujo_sse(notificaciones.broker_notificaciones, ultimo_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def formatear_historial(solicitudes_historicas) -> list:
+    """Formato de salida de CU-03, compartido con el controlador asíncrono."""
     return [
         {
             "id": sol.idSolicitud, 
             "tramite": sol.tipoSolicitud, 
             "estado_final": sol.estado_actual.tipoEstado, 
             "alumno": sol.solicitante,
-            "fecha_decision": sol.historial_decisiones[-1].fecha if sol.historial_decisiones else None
+            "fecha_decision": sol.fechaUltimaDecision
         } 
         for sol in solicitudes_historicas
     ]
@@ -101,40 +320,199 @@ def evaluar_secretaria(id: int, payload: DerivacionInput, db: Session = Depends(
         
         return {
             "mensaje": f"Solicitud {id} validada y {accion} exitosamente.",
-            "nuevo_estado": solicitud.estado_actual.tipoEstado
+            "nuevo_estado": obtener_nombre_estado(db, solicitud.estado_id)
         }
     except Exception as e:
         raise HTTPException(status_code=409, detail=str(e))
 
 
 
+@router.post("/workflow/escalate/batch")
+def evaluar_secretaria_lote(payload: DerivacionLoteInput, db: Session = Depends(get_db)):
+    """
+    CU-04 (masivo): Derivar u observar varias solicitudes en una sola operación.
+    """
+    try:
+        resultados = solicitud_repository.derivar_solicitud_lote(db, payload.ids, payload)
+    except ConflictoTransicion as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return resumen_lote(resultados)
+
+
+def resumen_lote(resultados: list) -> dict:
+    """Totales de una operación masiva más el detalle por id."""
+    procesadas = sum(1 for r in resultados if r["error"] is None)
+    return {
+        "total": len(resultados),
+        "procesadas": procesadas,
+        "rechazadas": len(resultados) - procesadas,
+        "resultados": resultados
+    }
+
+
+
 @router.get("/approvals/{id}/detail")
-def ver_detalle_solicitud(id: int, db: Session = Depends(get_db)):
+def ver_detalle_solicitud(id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     
     """
     CU-05: Ver Detalle Consolidado.
     Recupera la entidad Solicitud junto con sus relaciones ORM 
-    (Historial y Auditoría) de forma consolidada.
+    (Historial y Auditoría) de forma consolidada, a través de la caché
+    de lectura del detalle. Admite GET condicional (ETag / If-None-Match).
     """
-    solicitud = solicitud_repository.obtener_detalle(db, id)
-    if not solicitud:
+    etag = versiones_bandeja.etag_detalle(id)
+    sin_cambios = no_modificado(request, etag)
+    if sin_cambios:
+        return sin_cambios
+
+    detalle = DetalleSolicitudFacade(db).obtener_detalle(id)
+    if not detalle:
         raise HTTPException(status_code=404, detail="Solicitud no encontrada.")
     
-    return {
-        "id": solicitud.idSolicitud,
-        "alumno": solicitud.solicitante,
-        "tramite": solicitud.tipoSolicitud,
-        "estado_actual": solicitud.estado_actual.tipoEstado,
-        "prioridad": solicitud.prioridad,
-        "fecha_creacion": solicitud.fechaCreacion,
-        "sla_objetivo": solicitud.slaObjetivo,
-        # Mostramos el historial extrayéndolo de las tablas relacionales
-        "auditoria_decisiones": [
-            {"accion": h.accion, "comentario": h.comentario, "fecha": h.fecha, "actor": h.usuario_id}
-            for h in solicitud.historial_decisiones
-        ]
+    marcar_version(response, etag)
+    return detalle
+
+
+@router.post("/approvals/{id}/attachments", status_code=201)
+async def subir_adjunto(
+    id: int,
+    request: Request,
+    nombre: str = Query(..., min_length=1, max_length=255),
+    db: Session = Depends(get_db)
+):
+    """
+    Adjunta un archivo a la solicitud. El cuerpo es el contenido binario (no
+    multipart, Content-Type del archivo) y se escribe al almacén por bloques a
+    medida que llega. Un contenido ya almacenado no se duplica; la solicitud
+    solo guarda la referencia {sha256, nombre, tipo, tamano, fecha}.
+    """
+    longitud = request.headers.get("content-length", "")
+    if longitud.isdigit() and int(longitud) > almacen_adjuntos.max_bytes:
+        raise HTTPException(status_code=413, detail=f"El adjunto supera el máximo de {settings.ADJUNTOS_MAX_MB} MB.")
+    if not await run_in_threadpool(solicitud_repository.existe_solicitud, db, id):
+        raise HTTPException(status_code=404, detail="Solicitud no encontrada.")
+
+    try:
+        sha256, tamano = await almacen_adjuntos.guardar_flujo(request.stream())
+    except AdjuntoDemasiadoGrande as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    referencia = {
+        "sha256": sha256,
+        "nombre": os.path.basename(nombre.replace("\\", "/")).strip() or "adjunto",
+        "tipo": request.headers.get("content-type", "application/octet-stream")[:100],
+        "tamano": tamano,
+        "fecha": datetime.now().isoformat(timespec="seconds")
     }
+    try:
+        adjunto = await run_in_threadpool(solicitud_repository.agregar_adjunto, db, id, referencia)
+    except ConflictoTransicion as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if adjunto is None:
+        raise HTTPException(status_code=404, detail="Solicitud no encontrada.")
+    return adjunto
+
 
+@router.get("/approvals/{id}/attachments/{sha256}")
+def descargar_adjunto(id: int, sha256: str = Path(pattern="^[0-9a-f]{64}$"), db: Session = Depends(get_db)):
+    """
+    Descarga un adjunto de la solicitud. El archivo se envía desde disco por
+    bloques, con soporte de Range (reanudar descargas, visores de PDF por
+    páginas). Con ADJUNTOS_X_ACCEL_PREFIJO lo sirve nginx (sendfile) y Python
+    solo responde las cabeceras. El contenido es inmutable: caché de un año.
+    """
+    adjunto = solicitud_repository.obtener_adjunto(db, id, sha256)
+    if adjunto is None or not almacen_adjuntos.existe(sha256):
+        raise HTTPException(status_code=404, detail="Adjunto no encontrado.")
+
+    cabeceras = {
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "ETag": f'"{sha256}"',
+        "X-Content-Type-Options": "nosniff"
+    }
+    if settings.ADJUNTOS_X_ACCEL_PREFIJO:
+        cabeceras["X-Accel-Redirect"] = f"{settings.ADJUNTOS_X_ACCEL_PREFIJO.rstrip('/')}/{almacen_adjuntos.ruta_relativa(sha256)}"
+        cabeceras["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(adjunto['nombre'])}"
+        return Response(media_type=adjunto["tipo"], headers=cabeceras)
+    return FileResponse(almacen_adjuntos.ruta(sha256), media_type=adjunto["tipo"], filename=adjunto["nombre"], headers=cabeceras)
+
+
+
+@router.post("/approvals/bulk")
+def crear_solicitudes_masivo(items: List[SolicitudCreateInput], db: Session = Depends(get_db)):
+    """
+    Carga Masiva de Trámites (inicio de semestre).
+    Aplica Factory y Strategy a todo el lote en una pasada e inserta por lotes
+    multi-fila en transacciones controladas. Reporta el id o el error de cada ítem.
+    """
+    if len(items) > MAX_ITEMS_CARGA_JSON:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo {MAX_ITEMS_CARGA_JSON} ítems por petición; usar /approvals/bulk/ndjson para volúmenes mayores."
+        )
+    try:
+        resultados = solicitud_repository.crear_solicitudes_masivo(db, items)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en la carga masiva: {str(e)}")
+    return resumen_carga(resultados)
+
+
+@router.post("/approvals/bulk/ndjson")
+async def crear_solicitudes_masivo_ndjson(request: Request, db: Session = Depends(get_db)):
+    """
+    Carga Masiva en streaming (application/x-ndjson): un SolicitudCreateInput por línea.
+    El cuerpo se procesa por bloques a medida que llega, con memoria acotada;
+    las líneas inválidas se reportan como error sin detener la carga.
+    """
+    resultados, items, indices = [], [], []
+    pendiente, indice = b"", 0
+
+    async def procesar_bloque():
+        if items:
+            resultados.extend(await run_in_threadpool(
+                solicitud_repository.crear_solicitudes_masivo, db, list(items), list(indices)
+            ))
+            items.clear()
+            indices.clear()
+
+    async def procesar_linea(linea: bytes):
+        nonlocal indice
+        if not linea.strip():
+            return
+        try:
+            items.append(SolicitudCreateInput.model_validate_json(linea))
+            indices.append(indice)
+        except ValidationError as e:
+            resultados.append({"indice": indice, "id": None, "error": e.errors()[0]["msg"]})
+        indice += 1
+        if len(items) >= solicitud_repository.TAMANO_LOTE_INSERCION:
+            await procesar_bloque()
+
+    async for trozo in request.stream():
+        pendiente += trozo
+        *lineas, pendiente = pendiente.split(b"\n")
+        for linea in lineas:
+            await procesar_linea(linea)
+
+    await procesar_linea(pendiente)
+    await procesar_bloque()
+
+    return resumen_carga(sorted(resultados, key=lambda r: r["indice"]))
+
+
+def resumen_carga(resultados: list) -> dict:
+    """Totales de la carga masiva más el detalle por ítem."""
+    creadas = sum(1 for r in resultados if r["error"] is None)
+    return {
+        "total": len(resultados),
+        "creadas": creadas,
+        "con_error": len(resultados) - creadas,
+        "resultados": resultados
+    }
 
 
 @router.post("/approvals/test-seed")
@@ -160,7 +538,7 @@ def crear_solicitud_prueba(
             "mensaje": "¡Solicitud creada en MySQL exitosamente!", 
             "id_generado": nueva_solicitud.idSolicitud,
             "prioridad_asignada": nueva_solicitud.prioridad,
-            "estado": nueva_solicitud.estado_actual.tipoEstado,
+            "estado": obtener_nombre_estado(db, nueva_solicitud.estado_id),
             "descripcion_registrada": nueva_solicitud.descripcion # 3. CONFIRMACIÓN EN EL JSON
         }
     except Exception as e:
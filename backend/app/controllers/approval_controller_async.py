@@ -0,0 +1,171 @@
+"""
+Capa de Presentación: Controladores API Asíncronos (DB_MODO=async).
+Sirve las mismas rutas de alto tráfico que approval_controller con 'async def'
+y AsyncSession, de modo que un worker mantenga miles de consultas de bandeja
+en vuelo sin agotar el threadpool. Se registra antes que el router síncrono,
+por lo que estas rutas tienen precedencia y el resto sigue siendo síncrono.
+"""
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+
+from app.domain.enums import RolFlujo
+from app.domain.excepciones import ConflictoTransicion
+from app.domain.maquina_estados import maquina_estados
+from app.domain.schemas import SolicitudDTO, DictamenInput, DerivacionInput
+from app.config.database import get_async_db
+from app.controllers.approval_controller import (
+    BANDEJAS_ROL, etag_bandeja, formatear_busqueda, formatear_historial, validar_busqueda
+)
+from app.services.bandeja_facade import BandejaAprobacionFacade
+from app.services.detalle_facade import DetalleSolicitudFacade
+from app.services import busqueda
+from app.services.paginacion import LIMITE_POR_DEFECTO, LIMITE_MAXIMO
+from app.repositories import solicitud_repository_async
+from app.services.versiones_bandeja import marcar_version, no_modificado, versiones_bandeja
+
+router = APIRouter()
+
+
+@router.get("/approvals/pending", response_model=List[SolicitudDTO])
+async def listar_pendientes(
+    request: Request,
+    response: Response,
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    sla: Optional[str] = Query(None, pattern="^(vencidas|por_vencer)$"),
+    horas: Optional[int] = Query(None, ge=1, le=720),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """CU-01: Listar Bandeja de Pendientes (versión asíncrona)."""
+    return await servir_bandeja(request, response, db, limite, cursor, sla, horas)
+
+
+@router.get("/approvals/pending/{bandeja}", response_model=List[SolicitudDTO])
+async def listar_pendientes_por_rol(
+    request: Request,
+    response: Response,
+    bandeja: str = Path(pattern="^(secretaria|jefatura)$"),
+    area: Optional[str] = Query(None, max_length=50),
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    sla: Optional[str] = Query(None, pattern="^(vencidas|por_vencer)$"),
+    horas: Optional[int] = Query(None, ge=1, le=720),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """CU-01 por rol (versión asíncrona)."""
+    return await servir_bandeja(request, response, db, limite, cursor, sla, horas, rol=BANDEJAS_ROL[bandeja], area=area)
+
+
+async def servir_bandeja(request: Request, response: Response, db: AsyncSession, limite: int, cursor: Optional[str],
+                         sla: Optional[str], horas: Optional[int], rol: Optional[RolFlujo] = None, area: Optional[str] = None):
+    etag = etag_bandeja(request, horas)
+    sin_cambios = no_modificado(request, etag)
+    if sin_cambios:
+        return sin_cambios
+
+    fachada = BandejaAprobacionFacade(db)
+    try:
+        bandeja, siguiente_cursor = await fachada.obtener_bandeja_ordenada_async(limite=limite, cursor=cursor, filtro_sla=sla,
+                                                                                 horas=horas, rol=rol, area=area)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if siguiente_cursor:
+        response.headers["X-Siguiente-Cursor"] = siguiente_cursor
+    marcar_version(response, etag)
+    return bandeja
+
+
+@router.post("/approvals/{id}/verdict")
+async def registrar_dictamen(id: int, payload: DictamenInput, db: AsyncSession = Depends(get_async_db)):
+    """CU-02: Registrar Dictamen (versión asíncrona)."""
+    if not maquina_estados.admite_destino(payload.decision, RolFlujo.APROBADOR):
+        raise HTTPException(status_code=400, detail="Estado no válido")
+
+    try:
+        solicitud_actualizada = await solicitud_repository_async.actualizar_estado(
+            db, id, payload.decision, payload.comentario, payload.version
+        )
+
+        if not solicitud_actualizada:
+            raise HTTPException(status_code=404, detail="Solicitud no encontrada en MySQL")
+
+        return {
+            "mensaje": f"Solicitud {id} procesada exitosamente",
+            "nuevo_estado": await solicitud_repository_async.nombre_estado(db, solicitud_actualizada.estado_id),
+            "audit_log": "Cambio registrado en MySQL"
+        }
+    except ConflictoTransicion as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/approvals/history")
+async def consultar_historial(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """CU-03: Consultar Historial de Decisiones (versión asíncrona)."""
+    etag = versiones_bandeja.etag_historial()
+    sin_cambios = no_modificado(request, etag)
+    if sin_cambios:
+        return sin_cambios
+
+    solicitudes_historicas = await solicitud_repository_async.consultar_historial(db)
+    marcar_version(response, etag)
+    return formatear_historial(solicitudes_historicas)
+
+
+@router.get("/approvals/search")
+async def buscar_solicitudes(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    estado: Optional[List[str]] = Query(None),
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    desplazamiento: int = Query(0, ge=0, le=busqueda.MAX_DESPLAZAMIENTO),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Búsqueda de texto completo (versión asíncrona)."""
+    terminos, estados = validar_busqueda(q, estado)
+    filas, hay_mas = await solicitud_repository_async.buscar_solicitudes(
+        db, terminos, estados=estados, desde=desde, hasta=hasta, limite=limite, desplazamiento=desplazamiento
+    )
+    if hay_mas:
+        response.headers["X-Siguiente-Desplazamiento"] = str(desplazamiento + limite)
+    return formatear_busqueda(filas)
+
+
+@router.post("/workflow/{id}/escalate")
+async def evaluar_secretaria(id: int, payload: DerivacionInput, db: AsyncSession = Depends(get_async_db)):
+    """CU-04: Evaluar Solicitud (versión asíncrona)."""
+    try:
+        solicitud = await solicitud_repository_async.derivar_solicitud(db, id, payload)
+        if not solicitud:
+            raise HTTPException(status_code=404, detail="Solicitud no encontrada en BD.")
+
+        accion = "derivada a la Jefatura" if payload.checklist_valido else "observada y devuelta al alumno"
+
+        return {
+            "mensaje": f"Solicitud {id} validada y {accion} exitosamente.",
+            "nuevo_estado": await solicitud_repository_async.nombre_estado(db, solicitud.estado_id)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/approvals/{id}/detail")
+async def ver_detalle_solicitud(id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """CU-05: Ver Detalle Consolidado (versión asíncrona)."""
+    etag = versiones_bandeja.etag_detalle(id)
+    sin_cambios = no_modificado(request, etag)
+    if sin_cambios:
+        return sin_cambios
+
+    detalle = await DetalleSolicitudFacade(db).obtener_detalle_async(id)
+    if not detalle:
+        raise HTTPException(status_code=404, detail="Solicitud no encontrada.")
+
+    marcar_version(response, etag)
+    return detalle
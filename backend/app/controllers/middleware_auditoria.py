@@ -0,0 +1,31 @@
+"""
+Capa de Presentación: Middleware de Auditoría.
+Registra en la bitácora cada petición HTTP atendida por la API (lecturas y
+escrituras), identificando al usuario por la cabecera X-Usuario. Es un
+middleware ASGI puro: no envuelve el cuerpo de la respuesta, por lo que no
+interfiere con las respuestas en streaming, y solo encola el evento.
+"""
+from app.services.bitacora_auditoria import EscritorAuditoria
+
+CABECERA_USUARIO = b"x-usuario"
+
+
+class MiddlewareAuditoria:
+
+    def __init__(self, app, escritor: EscritorAuditoria):
+        self.app = app
+        self.escritor = escritor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            usuario = dict(scope["headers"]).get(CABECERA_USUARIO)
+            self.escritor.registrar(
+                endpoint=f"{scope['method']} {scope['path']}",
+                usuario=usuario.decode("latin-1") if usuario else None
+            )
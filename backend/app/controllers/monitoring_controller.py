@@ -0,0 +1,77 @@
+"""
+Capa de Presentación: Controlador de Monitoreo Operativo.
+Expone métricas internas del servicio (pool de conexiones, bitácora de
+auditoría, planificador de SLA, caché de detalle, archivador, arranque) para diagnosticar bloqueos bajo carga sin
+necesidad de acceder al servidor de base de datos, y operaciones de
+mantenimiento en caliente (recarga del registro de trámites).
+"""
+from fastapi import APIRouter, HTTPException
+
+from app.config import database
+from app.config.metricas_pool import instantanea_pool
+from app.services.archivador import archivador
+from app.services.arranque import medidor_arranque
+from app.services.bitacora_auditoria import escritor_auditoria
+from app.services.cache_detalle import cache_detalle
+from app.services.planificador_sla import planificador_sla
+from app.services.registro_tramites import registro_tramites
+
+router = APIRouter()
+
+
+@router.get("/metrics/pool")
+def metricas_pool():
+    """
+    Instantánea del pool de conexiones: prestadas, libres, overflow, peticiones
+    esperando y el histograma de latencia de checkout (ms).
+    """
+    metricas = {"sync": instantanea_pool(database.engine.pool)}
+    if database.async_engine is not None:
+        metricas["async"] = instantanea_pool(database.async_engine.pool)
+    return metricas
+
+
+@router.get("/metrics/auditoria")
+def metricas_auditoria():
+    """
+    Estado del escritor de auditoría: eventos en cola, escritos, desviados al
+    spool local y reprocesados desde él.
+    """
+    return escritor_auditoria.instantanea()
+
+
+@router.get("/metrics/sla")
+def metricas_sla():
+    """Tamaño del índice de vencimientos en memoria y el próximo cambio de semáforo."""
+    return planificador_sla.instantanea()
+
+
+@router.get("/metrics/cache_detalle")
+def metricas_cache_detalle():
+    """Aciertos, fallos, invalidaciones y ocupación de la caché del detalle consolidado."""
+    return cache_detalle.instantanea()
+
+
+@router.get("/metrics/archivo")
+def metricas_archivo():
+    """Retención vigente, filas movidas al archivo frío y última ejecución del archivador."""
+    return archivador.instantanea()
+
+
+@router.get("/metrics/arranque")
+def metricas_arranque():
+    """Duración del arranque en frío de este worker, por fase, frente a ARRANQUE_PRESUPUESTO_MS."""
+    return medidor_arranque.instantanea()
+
+
+@router.post("/config/tramites/recargar")
+def recargar_registro_tramites():
+    """
+    Relee el registro de tipos de trámite (TRAMITES_REGISTRO_RUTA) sin reiniciar
+    el servicio. Si el archivo es inválido se conserva la configuración vigente.
+    """
+    try:
+        registro_tramites.recargar()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Registro de trámites inválido: {e}")
+    return {"mensaje": "Registro de trámites recargado."}
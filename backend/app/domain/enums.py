@@ -13,4 +13,21 @@ class EstadoSolicitud(str, Enum):
     POR_APROBAR = "POR_APROBAR"
     APROBADO = "APROBADO"
     OBSERVADO = "OBSERVADO"
-    RECHAZADO = "RECHAZADO"
\ No newline at end of file
+    RECHAZADO = "RECHAZADO"
+
+class SemaforoSla(str, Enum):
+    """
+    Indicador de urgencia de una solicitud abierta según su slaObjetivo (RN-08).
+    AMBAR: vence dentro del umbral configurado (SLA_UMBRAL_AMBAR_HORAS).
+    """
+    VERDE = "VERDE"
+    AMBAR = "AMBAR"
+    ROJO = "ROJO"
+
+class RolFlujo(str, Enum):
+    """
+    Actores que pueden transicionar una solicitud (ver maquina_estados).
+    SECRETARIO: revisión técnica (RN-06). APROBADOR: dictamen final (Jefatura).
+    """
+    SECRETARIO = "SECRETARIO"
+    APROBADOR = "APROBADOR"
@@ -0,0 +1,17 @@
+"""
+Capa de Dominio: Excepciones de Negocio.
+Permiten a los controladores traducir cada regla violada a su código HTTP sin
+inspeccionar el texto del mensaje.
+"""
+
+
+class ConflictoTransicion(Exception):
+    """
+    La transición no puede aplicarse sobre el estado vigente de la solicitud
+    (HTTP 409): el estado de origen no la admite, o otra escritura concurrente
+    la modificó después de leerla (versión distinta a la esperada).
+    """
+
+
+class AdjuntoDemasiadoGrande(Exception):
+    """El archivo supera el tamaño máximo de adjunto configurado (HTTP 413)."""
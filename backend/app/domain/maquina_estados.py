@@ -0,0 +1,104 @@
+"""
+Capa de Dominio: Máquina de Estados del Flujo de Aprobaciones (RN-06).
+Las transiciones permitidas se declaran una sola vez (REGLAS) y se compilan
+al importar el módulo en una tabla de adyacencia (origen, destino, rol). Cada
+validación es una búsqueda O(1) en memoria, sin consultas a la base de datos,
+y todos los endpoints (individuales y masivos) la aplican en el mismo punto:
+solicitud_repository.
+"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from app.domain.enums import EstadoSolicitud, RolFlujo
+from app.domain.excepciones import ConflictoTransicion
+
+
+@dataclass(frozen=True)
+class Regla:
+    """Desde cualquiera de 'origenes', el 'rol' puede llevar la solicitud a cualquiera de 'destinos'."""
+    rol: RolFlujo
+    origenes: Tuple[EstadoSolicitud, ...]
+    destinos: Tuple[EstadoSolicitud, ...]
+
+
+REGLAS = (
+    # Revisión técnica: derivar a Jefatura u observar (devolver al alumno)
+    Regla(RolFlujo.SECRETARIO,
+          origenes=(EstadoSolicitud.PENDIENTE, EstadoSolicitud.OBSERVADO),
+          destinos=(EstadoSolicitud.POR_APROBAR, EstadoSolicitud.OBSERVADO)),
+    # Dictamen final sobre cualquier solicitud abierta
+    Regla(RolFlujo.APROBADOR,
+          origenes=(EstadoSolicitud.PENDIENTE, EstadoSolicitud.POR_APROBAR, EstadoSolicitud.OBSERVADO),
+          destinos=(EstadoSolicitud.APROBADO, EstadoSolicitud.RECHAZADO, EstadoSolicitud.OBSERVADO)),
+)
+
+
+class MaquinaEstados:
+    """Tabla de transiciones precompilada a partir de reglas declarativas."""
+
+    def __init__(self, reglas: Iterable[Regla] = REGLAS):
+        permitidas = set()
+        origenes: Dict[Tuple[str, str], dict] = {}  # dict: conserva el orden declarado
+        for regla in reglas:
+            for origen in regla.origenes:
+                for destino in regla.destinos:
+                    permitidas.add((origen.value, destino.value, regla.rol.value))
+                    origenes.setdefault((destino.value, regla.rol.value), {})[origen.value] = None
+        self._permitidas: FrozenSet[Tuple[str, str, str]] = frozenset(permitidas)
+        self._origenes: Dict[Tuple[str, str], Tuple[str, ...]] = {
+            clave: tuple(valores) for clave, valores in origenes.items()
+        }
+        self._con_salida: FrozenSet[str] = frozenset(origen for origen, _, _ in permitidas)
+
+    @staticmethod
+    def _nombre(valor) -> str:
+        return getattr(valor, "value", valor)
+
+    def admite_destino(self, destino, rol) -> bool:
+        """¿Existe algún estado desde el que el rol pueda llevar la solicitud a 'destino'?"""
+        return (self._nombre(destino), self._nombre(rol)) in self._origenes
+
+    def destinos(self, rol) -> List[str]:
+        rol = self._nombre(rol)
+        return sorted({destino for destino, r in self._origenes if r == rol})
+
+    def origenes(self, destino, rol) -> Tuple[str, ...]:
+        """Estados de origen válidos para (destino, rol); sirve como guarda del UPDATE masivo."""
+        return self._origenes.get((self._nombre(destino), self._nombre(rol)), ())
+
+    def es_final(self, estado) -> bool:
+        """Sin transiciones de salida para ningún rol: la solicitud ya no cambia de estado."""
+        return self._nombre(estado) not in self._con_salida
+
+    def es_valida(self, origen, destino, rol) -> bool:
+        return (self._nombre(origen), self._nombre(destino), self._nombre(rol)) in self._permitidas
+
+    def motivo_rechazo(self, origen, destino, rol) -> str:
+        origen, destino, rol = self._nombre(origen), self._nombre(destino), self._nombre(rol)
+        if origen not in self._con_salida:
+            return f"Conflicto: la solicitud ya fue resuelta ({origen})."
+        permitidos = ", ".join(self.origenes(destino, rol)) or "ningún estado"
+        return (f"Conflicto: la solicitud está en {origen}; el rol {rol} solo puede llevarla a {destino} "
+                f"desde: {permitidos}.")
+
+    def validar(self, origen, destino, rol):
+        """Lanza ConflictoTransicion si la transición no está en la tabla."""
+        if not self.es_valida(origen, destino, rol):
+            raise ConflictoTransicion(self.motivo_rechazo(origen, destino, rol))
+
+    def validar_lote(self, estados_actuales: Dict[int, str], destino, rol) -> Tuple[List[int], Dict[int, str]]:
+        """
+        Valida un lote en una pasada: retorna los ids que pueden transicionar (en
+        el orden recibido) y el motivo de rechazo de los demás.
+        """
+        validos, rechazados = [], {}
+        for id_solicitud, origen in estados_actuales.items():
+            if self.es_valida(origen, destino, rol):
+                validos.append(id_solicitud)
+            else:
+                rechazados[id_solicitud] = self.motivo_rechazo(origen, destino, rol)
+        return validos, rechazados
+
+
+# Instancia única, compilada al importar el módulo
+maquina_estados = MaquinaEstados()
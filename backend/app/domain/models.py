@@ -3,12 +3,16 @@ Capa de Infraestructura: Modelos ORM (Persistencia).
 Mapea las entidades del Dominio (Diagrama de Clases UML) a tablas físicas en MySQL.
 Garantiza la integridad referencial y la trazabilidad de las transacciones.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index, LargeBinary
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 
 from app.config.database import Base
 
+# Dialectos con índices FULLTEXT (búsqueda de texto completo)
+DIALECTOS_FULLTEXT = ("mysql", "mariadb")
+
 class Estado(Base):
     """
     Entidad paramétrica. Almacena el catálogo de estados permitidos 
@@ -31,20 +35,58 @@ class Solicitud(Base):
 
     idSolicitud = Column(Integer, primary_key=True, autoincrement=True)
     tipoSolicitud = Column(String(100), nullable=False)
-    descripcion = Column(String(1000), nullable=True) # NUEVO ATRIBUTO: ALTER TABLE solicitudes ADD COLUMN descripcion VARCHAR(1000);
+    descripcion = Column(String(1000), nullable=True)
     fechaCreacion = Column(DateTime, default=datetime.now)
     prioridad = Column(String(20), default="NORMAL")
     slaObjetivo = Column(DateTime, nullable=False)
     solicitante = Column(String(100), nullable=False)
     
-    # Se utiliza JSON para optimizar el almacenamiento del MVP
-    adjuntos = Column(JSON, default=list)
+    # Solo referencias (sha256, nombre, tipo, tamaño); el contenido vive en el
+    # almacén de adjuntos. Diferida: la bandeja, el historial y la búsqueda no la leen.
+    adjuntos = deferred(Column(JSON, default=list))
 
     estado_id = Column(Integer, ForeignKey("estados.idEstado"), nullable=False)
     estado_actual = relationship("Estado", back_populates="solicitudes")
+
+    # Proyección desnormalizada de la última decisión (se mantiene en la misma
+    # transacción que inserta el HistorialDecision). Evita leer el historial
+    # completo para listar el historial de solicitudes.
+    fechaUltimaDecision = Column(DateTime, nullable=True)
+    actorUltimaDecision = Column(String(50), nullable=True)
+    accionUltimaDecision = Column(String(100), nullable=True)
+
+    # Área a la que el Secretario derivó la solicitud (bandeja de cada Jefatura)
+    areaDestino = Column(String(50), nullable=True)
+
+    # Control de concurrencia optimista: cada transición hace un compare-and-swap
+    # (UPDATE ... WHERE version = :leida) en lugar de serializar las escrituras
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Clave de correlación de la carga masiva: cada INSERT multi-fila marca sus
+    # filas con el UUID del lote y la posición del ítem, y los ids generados se
+    # recuperan con un SELECT por esa clave (NULL en las altas individuales)
+    loteCarga = Column(String(32), nullable=True)
+    posicionLote = Column(Integer, nullable=True)
     
-    # Relación 1:N para garantizar el historial de dictámenes
-    historial_decisiones = relationship("HistorialDecision", back_populates="solicitud")
+    # Relación 1:N para garantizar el historial de dictámenes (en orden cronológico)
+    historial_decisiones = relationship(
+        "HistorialDecision",
+        back_populates="solicitud",
+        order_by="(HistorialDecision.fecha, HistorialDecision.id)"
+    )
+
+    # Índices compuestos de las consultas calientes (migraciones 0002 a 0009)
+    __table_args__ = (
+        Index("ix_solicitudes_bandeja", "estado_id", "prioridad", "slaObjetivo", "idSolicitud"),
+        Index("ix_solicitudes_bandeja_area", "estado_id", "areaDestino", "prioridad", "slaObjetivo", "idSolicitud"),
+        Index("ix_solicitudes_historial", "estado_id", "fechaUltimaDecision", "idSolicitud"),
+        Index("ix_solicitudes_sla", "estado_id", "slaObjetivo"),
+        Index("ix_solicitudes_lote_carga", "loteCarga", "posicionLote"),
+        # Búsqueda de texto completo (/approvals/search); solo existe en MySQL
+        Index("ix_solicitudes_texto", "solicitante", "tipoSolicitud", "descripcion",
+              mysql_prefix="FULLTEXT", info={"dialectos": DIALECTOS_FULLTEXT}).ddl_if(dialect=DIALECTOS_FULLTEXT),
+    )
+    __mapper_args__ = {"version_id_col": version}
 
 
 
@@ -64,6 +106,10 @@ class HistorialDecision(Base):
 
     solicitud = relationship("Solicitud", back_populates="historial_decisiones")
 
+    __table_args__ = (
+        Index("ix_historial_solicitud_fecha", "solicitud_id", "fecha"),
+    )
+
 
 class LogAuditoria(Base):
     """
@@ -75,4 +121,62 @@ class LogAuditoria(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     usuario = Column(String(50), nullable=False, default="Sistema/Admin")
     endpoint = Column(String(255), nullable=False)
-    timestamp = Column(DateTime, default=datetime.now)
\ No newline at end of file
+    timestamp = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_log_auditoria_timestamp", "timestamp"),
+    )
+
+
+# BLOB de MySQL admite 64 KB: el archivo comprimido usa MEDIUMBLOB (16 MB)
+_BLOB_ARCHIVO = LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql", "mariadb")
+
+
+class SolicitudArchivada(Base):
+    """
+    Archivo frío (retención): solicitud cerrada movida desde las tablas vivas
+    junto con su historial. 'contenido' es el detalle consolidado (CU-05) en
+    JSON comprimido con zlib; solo se consulta por id (lectura a través del detalle).
+    """
+    __tablename__ = "solicitudes_archivadas"
+
+    idSolicitud = Column(Integer, primary_key=True, autoincrement=False)
+    estado = Column(String(50), nullable=False)
+    fechaUltimaDecision = Column(DateTime, nullable=True)
+    fechaArchivo = Column(DateTime, nullable=False, default=datetime.now)
+    contenido = Column(_BLOB_ARCHIVO, nullable=False)
+
+    __table_args__ = (
+        Index("ix_solicitudes_archivadas_decision", "fechaUltimaDecision"),
+    )
+
+
+class LoteAuditoriaArchivado(Base):
+    """
+    Archivo frío de la bitácora: un lote de filas de log_auditoria del periodo
+    [desde, hasta], como JSON comprimido con zlib.
+    """
+    __tablename__ = "log_auditoria_archivada"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    desde = Column(DateTime, nullable=False)
+    hasta = Column(DateTime, nullable=False)
+    filas = Column(Integer, nullable=False)
+    fechaArchivo = Column(DateTime, nullable=False, default=datetime.now)
+    contenido = Column(_BLOB_ARCHIVO, nullable=False)
+
+    __table_args__ = (
+        Index("ix_log_auditoria_archivada_periodo", "desde", "hasta"),
+    )
+
+
+def incluir_en_dialecto(nombre_dialecto: str):
+    """
+    Filtro 'include_object' de Alembic: omite de la comparación los índices
+    declarados solo para otros dialectos (info["dialectos"]), como el FULLTEXT
+    de la búsqueda, que no existe en SQLite.
+    """
+    def incluir(objeto, nombre, tipo, reflejado, comparado) -> bool:
+        dialectos = objeto.info.get("dialectos") if tipo == "index" else None
+        return not dialectos or nombre_dialecto in dialectos
+    return incluir
@@ -3,8 +3,11 @@ Capa de Dominio: Esquemas de Validación y DTOs (Data Transfer Objects).
 Desacopla los modelos de persistencia (ORM) de la interfaz de red (JSON).
 Aplica validaciones tempranas usando Pydantic para garantizar las Reglas de Negocio.
 """
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+
+# Tope de solicitudes por operación masiva (dictamen o derivación en lote)
+MAX_IDS_POR_LOTE = 1000
 
 # DTOs (Data Transfer Objects): Definen estrictamente qué datos entran y salen de la API.
 # Actúan como contrato de interfaz y barrera de validación automática.
@@ -20,7 +23,7 @@ class SolicitudDTO(BaseModel):
     tipo_tramite: str    # Mapeado desde 'tipoSolicitud'
     estado: str          # Mapeado desde la relación con 'Estado'
     prioridad: str       # Calculada por la Estrategia (ALTA/NORMAL)
-    semaforo_sla: str    # Indicador visual de urgencia (ROJO/VERDE)
+    semaforo_sla: str    # Indicador visual de urgencia (ROJO/AMBAR/VERDE)
     descripcion: Optional[str] = "Sin descripción" 
     
     class Config:
@@ -42,6 +45,7 @@ class DictamenInput(BaseModel):
     """Payload requerido para que un Aprobador registre su decisión final sobre un trámite."""
     decision: str       # Valores esperados: "APROBADO", "RECHAZADO", "OBSERVADO"
     comentario: str = "" # Por defecto vacío para poder validarlo dinámicamente
+    version: Optional[int] = None # Versión vista en el detalle: si cambió, 409
     
     # Validaciones Automáticas (Reglas de Negocio)
     @validator('comentario')
@@ -62,9 +66,18 @@ class DerivacionInput(BaseModel):
     DTO de Entrada (Secretario): Payload para el primer filtro técnico.
     Separa la responsabilidad del Secretario de la del Aprobador.
     """
-    area_destino: str
+    area_destino: str = Field(..., min_length=1, max_length=50) # Se guarda en solicitudes.areaDestino (String(50))
     checklist_valido: bool # True = Pasa a POR_APROBAR / False = Devuelto como OBSERVADO
     comentario: str = ""   # Obligatorio si checklist_valido es False
+    version: Optional[int] = None # Versión vista en el detalle: si cambió, 409
+
+    @validator('checklist_valido')
+    def validar_area_de_jefatura(cls, v, values):
+        # Un área en blanco crearía un pendiente que ninguna bandeja por área encuentra
+        area = values.get('area_destino')
+        if v and area is not None and not area.strip():
+            raise ValueError("El área de destino es obligatoria al derivar a Jefatura.")
+        return v
 
     @validator('comentario')
     def validar_comentario_secretario(cls, v, values):
@@ -73,4 +86,28 @@ class DerivacionInput(BaseModel):
         if checklist is False:
             if not v or len(v.strip()) < 5:
                 raise ValueError("RN3: El comentario es obligatorio al observar por falta de requisitos.")
-        return v
\ No newline at end of file
+        return v
+
+
+def _rechazar_version_en_lote(v):
+    # El lote valida el estado de origen de cada id, no una versión vista en el detalle
+    if v is not None:
+        raise ValueError("'version' no aplica a operaciones masivas; use el endpoint individual.")
+    return v
+
+
+class DictamenLoteInput(DictamenInput):
+    """
+    Payload de dictamen masivo: la misma decisión y justificación (RN-03)
+    aplicadas a un conjunto de solicitudes similares.
+    """
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_IDS_POR_LOTE)
+
+    _sin_version = validator('version', allow_reuse=True)(_rechazar_version_en_lote)
+
+
+class DerivacionLoteInput(DerivacionInput):
+    """Payload de derivación masiva del Secretario sobre varias solicitudes."""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_IDS_POR_LOTE)
+
+    _sin_version = validator('version', allow_reuse=True)(_rechazar_version_en_lote)
@@ -1,27 +1,96 @@
+from app.services.arranque import medidor_arranque  # Primero: mide también el costo de importar la app
+
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from sqlalchemy.exc import SQLAlchemyError
 from app.controllers.approval_controller import router as approval_router
+from app.controllers.middleware_auditoria import MiddlewareAuditoria
+from app.controllers.monitoring_controller import router as monitoring_router
+from app.config import settings
+from app.config import database
 from app.config.database import engine, SessionLocal
 from app.domain import models
 from app.repositories.estado_repository import inicializar_estados
+from app.services.archivador import archivador
+from app.services.bitacora_auditoria import escritor_auditoria
+from app.services.planificador_sla import planificador_sla
+
+logger = logging.getLogger(__name__)
+
+
+# 1. Ciclo de vida del worker: importar este módulo no toca la base de datos;
+# el esquema, el catálogo y los servicios de fondo se preparan al arrancar.
+def preparar_base_de_datos():
+    """Crea el esquema (solo si DB_CREAR_ESQUEMA), siembra los estados y precarga su catálogo."""
+    if settings.DB_CREAR_ESQUEMA:
+        with medidor_arranque.fase("esquema"):
+            models.Base.metadata.create_all(bind=engine)
+    with medidor_arranque.fase("catalogo"):
+        try:
+            with SessionLocal() as db:
+                inicializar_estados(db)
+        except SQLAlchemyError:
+            # El worker arranca igual: el catálogo se cargará en el primer uso
+            logger.exception("No se pudo precargar el catálogo de estados.")
+
+
+def iniciar_servicios_de_fondo():
+    with medidor_arranque.fase("servicios"):
+        if settings.AUDITORIA_HABILITADA:
+            escritor_auditoria.iniciar(engine)
+        if settings.SLA_PLANIFICADOR_HABILITADO:
+            planificador_sla.iniciar(SessionLocal)
+        if settings.ARCHIVO_HABILITADO:
+            archivador.iniciar(SessionLocal)
 
-# 1. Crea las tablas en MySQL si no existen
-models.Base.metadata.create_all(bind=engine)
 
-# 2. Inicializamos los estados base (Seeder)
-db = SessionLocal()
-try:
-    inicializar_estados(db)
-finally:
-    db.close()
+def detener_servicios_de_fondo():
+    # Orden inverso al arranque; detener() no hace nada si el servicio no corría
+    archivador.detener()
+    planificador_sla.detener()
+    escritor_auditoria.detener()
 
-# 3. Inicializa la API
+
+@asynccontextmanager
+async def ciclo_de_vida(app: FastAPI):
+    preparar_base_de_datos()
+    iniciar_servicios_de_fondo()
+    medidor_arranque.finalizar()
+    try:
+        yield
+    finally:
+        detener_servicios_de_fondo()
+        engine.dispose()
+        if database.async_engine is not None:
+            await database.async_engine.dispose()
+
+
+# 2. Inicializa la API
 app = FastAPI(
     title="Campus360 - Módulo de Aprobaciones",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=ciclo_de_vida
 )
 
+# En modo asíncrono las rutas de alto tráfico se atienden con AsyncSession;
+# al registrarse primero tienen precedencia sobre sus equivalentes síncronas.
+if settings.DB_MODO == "async":
+    from app.controllers.approval_controller_async import router as approval_router_async
+    app.include_router(approval_router_async, prefix="/api/v1")
+
 app.include_router(approval_router, prefix="/api/v1")
+app.include_router(monitoring_router, prefix="/api/v1")
+
+# 3. Bitácora de auditoría: el middleware encola cada petición y el escritor
+# de fondo (iniciado en ciclo_de_vida) la persiste en lotes fuera de las
+# transacciones de negocio.
+if settings.AUDITORIA_HABILITADA:
+    app.add_middleware(MiddlewareAuditoria, escritor=escritor_auditoria)
+
+medidor_arranque.registrar("importacion")
 
 @app.get("/")
 def home():
@@ -33,4 +102,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # Permite todos los métodos (GET, POST, etc.)
     allow_headers=["*"], # Permite todas las cabeceras
+    expose_headers=["X-Siguiente-Cursor", "ETag"], # Cursor de la bandeja y versión (GET condicional)
 )
\ No newline at end of file
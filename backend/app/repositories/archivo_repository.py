@@ -0,0 +1,136 @@
+"""
+Capa de Infraestructura: Repositorio del Archivo Frío (Repository Pattern).
+Mueve por lotes las solicitudes cerradas y la bitácora antigua desde las tablas
+vivas a sus tablas de archivo, en una transacción por lote: el lote se inserta
+comprimido en el archivo y se borra de las tablas vivas en el mismo commit, de
+modo que un corte no deja filas duplicadas ni perdidas. Las solicitudes del
+lote se bloquean al leerlas (FOR UPDATE SKIP LOCKED donde el motor lo admite)
+y el borrado exige la versión leída: una escritura concurrente nunca se pierde.
+"""
+import json
+import zlib
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import Select, delete, insert, select, tuple_
+from sqlalchemy.orm import Session, selectinload, undefer
+
+from app.domain.enums import EstadoSolicitud
+from app.domain.maquina_estados import maquina_estados
+from app.domain.models import HistorialDecision, LogAuditoria, LoteAuditoriaArchivado, Solicitud, SolicitudArchivada
+from app.repositories.estado_repository import obtener_ids_estados
+
+# Solo se archivan estados sin transiciones de salida (APROBADO, RECHAZADO):
+# una solicitud OBSERVADA aún puede volver a la bandeja.
+ESTADOS_ARCHIVABLES = [e for e in EstadoSolicitud if maquina_estados.es_final(e)]
+NIVEL_COMPRESION = 6
+
+
+def comprimir(objeto) -> bytes:
+    return zlib.compress(json.dumps(objeto, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), NIVEL_COMPRESION)
+
+
+def descomprimir(contenido: bytes):
+    return json.loads(zlib.decompress(contenido).decode("utf-8"))
+
+
+def archivar_lote_solicitudes(db: Session, antes_de: datetime, tamano_lote: int,
+                              serializar: Callable[[Solicitud], dict]) -> List[int]:
+    """
+    Archiva hasta 'tamano_lote' solicitudes cerradas cuya última decisión es
+    anterior a 'antes_de' (recorrido de ix_solicitudes_historial). 'serializar'
+    produce el detalle consolidado que se guardará comprimido. Retorna los ids
+    archivados; una lista vacía indica que no quedan pendientes. Una solicitud
+    modificada entre la lectura y el borrado (adjunto, transición) se omite y
+    queda viva: el archivo nunca guarda una copia desactualizada.
+    """
+    ids_estados = obtener_ids_estados(db, ESTADOS_ARCHIVABLES)
+    solicitudes = db.scalars(
+        select(Solicitud)
+        .options(
+            # En consultas aparte: el FOR UPDATE no debe alcanzar al catálogo 'estados'
+            selectinload(Solicitud.estado_actual),
+            selectinload(Solicitud.historial_decisiones),
+            undefer(Solicitud.adjuntos)
+        )
+        .where(Solicitud.estado_id.in_(ids_estados), Solicitud.fechaUltimaDecision < antes_de)
+        .order_by(Solicitud.fechaUltimaDecision, Solicitud.idSolicitud)
+        .limit(tamano_lote)
+        # MySQL: las filas del lote quedan bloqueadas hasta el commit y las que otra
+        # transacción está escribiendo se saltan (SQLite ignora la cláusula)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not solicitudes:
+        return []
+
+    copias = {s.idSolicitud: (s, comprimir(serializar(s))) for s in solicitudes}
+    # Solo se borra lo que sigue en la versión serializada
+    sin_cambios = tuple_(Solicitud.idSolicitud, Solicitud.version).in_([(s.idSolicitud, s.version) for s in solicitudes])
+    sin_sincronizar = {"synchronize_session": False}
+    ahora = datetime.now()
+    try:
+        # Primera escritura del lote: desde aquí ninguna otra transacción puede confirmar
+        # cambios sobre estas filas hasta el commit (bloqueo de fila o de escritura)
+        db.execute(delete(HistorialDecision).where(
+            HistorialDecision.solicitud_id.in_(select(Solicitud.idSolicitud).where(sin_cambios))
+        ), execution_options=sin_sincronizar)
+        vigentes = set(db.scalars(select(Solicitud.idSolicitud).where(sin_cambios)))
+        ids = [id_solicitud for id_solicitud in copias if id_solicitud in vigentes]
+        db.execute(delete(Solicitud).where(sin_cambios), execution_options=sin_sincronizar)
+        if ids:
+            db.execute(insert(SolicitudArchivada), [
+                {
+                    "idSolicitud": id_solicitud,
+                    "estado": copias[id_solicitud][0].estado_actual.tipoEstado,
+                    "fechaUltimaDecision": copias[id_solicitud][0].fechaUltimaDecision,
+                    "fechaArchivo": ahora,
+                    "contenido": copias[id_solicitud][1]
+                }
+                for id_solicitud in ids
+            ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.expunge_all()  # Las entidades borradas no deben quedar en el identity map
+    return ids
+
+
+def archivar_lote_auditoria(db: Session, antes_de: datetime, tamano_lote: int) -> int:
+    """Compacta hasta 'tamano_lote' filas de log_auditoria anteriores a 'antes_de' en un lote comprimido."""
+    filas = db.execute(construir_consulta_lote_auditoria(antes_de, tamano_lote)).all()
+    if not filas:
+        return 0
+
+    registros = [
+        {"id": f.id, "usuario": f.usuario, "endpoint": f.endpoint, "timestamp": f.timestamp.isoformat()}
+        for f in filas
+    ]
+    try:
+        db.execute(insert(LoteAuditoriaArchivado).values(
+            desde=filas[0].timestamp, hasta=filas[-1].timestamp, filas=len(filas),
+            fechaArchivo=datetime.now(), contenido=comprimir(registros)
+        ))
+        db.execute(delete(LogAuditoria).where(LogAuditoria.id.in_([f.id for f in filas])))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(filas)
+
+
+def construir_consulta_lote_auditoria(antes_de: datetime, tamano_lote: int) -> Select:
+    """Filas más antiguas de la bitácora, en el orden del índice ix_log_auditoria_timestamp."""
+    return (
+        select(LogAuditoria.id, LogAuditoria.usuario, LogAuditoria.endpoint, LogAuditoria.timestamp)
+        .where(LogAuditoria.timestamp < antes_de)
+        .order_by(LogAuditoria.timestamp, LogAuditoria.id)
+        .limit(tamano_lote)
+    )
+
+
+def obtener_archivada(db: Session, solicitud_id: int) -> Optional[dict]:
+    """Detalle consolidado de una solicitud archivada (descomprimido), o None si no está en el archivo."""
+    contenido = db.scalar(select(SolicitudArchivada.contenido).where(SolicitudArchivada.idSolicitud == solicitud_id))
+    return descomprimir(contenido) if contenido is not None else None
+
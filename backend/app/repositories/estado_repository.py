@@ -3,9 +3,21 @@ Capa de Infraestructura: Inicializador de Datos (Seeder).
 Automatiza la creación de los registros paramétricos indispensables 
 para el funcionamiento de la Máquina de Estados (RN-06).
 """
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from sqlalchemy.orm import Session
 from app.domain.models import Estado
 
+# Caché en proceso del catálogo 'estados' (tabla paramétrica fija).
+# Se carga una sola vez (arranque o primer uso) y solo se invalida de forma explícita.
+# Los dos mapas (nombre -> id, id -> nombre) viajan juntos en una tupla que nunca
+# se modifica: recargar construye una nueva y la publica con una sola asignación,
+# así un lector concurrente ve el catálogo anterior o el nuevo, nunca uno a medias.
+_CATALOGO_VACIO: Tuple[Dict[str, int], Dict[int, str]] = ({}, {})
+_catalogo = _CATALOGO_VACIO
+_candado_catalogo = threading.Lock()
+
 def inicializar_estados(db: Session):
     """
     Puebla la tabla 'estados' con el catálogo oficial si se encuentra vacía.
@@ -24,6 +36,59 @@ def inicializar_estados(db: Session):
         
         # Confirmamos los cambios en MySQL
         db.commit()
+        invalidar_catalogo_estados()
         print("¡Estados creados exitosamente!")
     else:
-        print("Los estados ya estaban inicializados.")
\ No newline at end of file
+        print("Los estados ya estaban inicializados.")
+
+    cargar_catalogo_estados(db)
+
+
+def cargar_catalogo_estados(db: Session) -> Dict[str, int]:
+    """
+    Lee el catálogo completo en una única consulta y lo publica en la caché.
+    Retorna el mapa EstadoSolicitud -> idEstado vigente.
+    """
+    global _catalogo
+    filas = db.query(Estado.idEstado, Estado.tipoEstado).all()
+    ids_por_estado = {tipo_estado: id_estado for id_estado, tipo_estado in filas}
+    estados_por_id = {id_estado: tipo_estado for id_estado, tipo_estado in filas}
+    with _candado_catalogo:
+        _catalogo = (ids_por_estado, estados_por_id)
+    return dict(ids_por_estado)
+
+
+def invalidar_catalogo_estados():
+    """Hook de invalidación: la próxima lectura recargará el catálogo desde la BD."""
+    global _catalogo
+    with _candado_catalogo:
+        _catalogo = _CATALOGO_VACIO
+
+
+def catalogo_ids_por_estado() -> Dict[str, int]:
+    """Copia del mapa nombre -> idEstado en caché (vacío si aún no se cargó)."""
+    return dict(_catalogo[0])
+
+
+def obtener_id_estado(db: Session, estado) -> Optional[int]:
+    """Resuelve el idEstado de un EstadoSolicitud (o su nombre) sin ir a la BD si ya está en caché."""
+    nombre = getattr(estado, "value", estado)
+    ids_por_estado = _catalogo[0]
+    if not ids_por_estado:
+        ids_por_estado = cargar_catalogo_estados(db)
+    return ids_por_estado.get(nombre)
+
+
+def obtener_ids_estados(db: Session, estados: Iterable) -> List[int]:
+    """Resuelve varios estados a la vez, omitiendo los que no existan en el catálogo."""
+    ids = (obtener_id_estado(db, estado) for estado in estados)
+    return [id_estado for id_estado in ids if id_estado is not None]
+
+
+def obtener_nombre_estado(db: Session, id_estado: int) -> Optional[str]:
+    """Operación inversa: idEstado -> tipoEstado, útil para respuestas sin cargar la relación ORM."""
+    estados_por_id = _catalogo[1]
+    if not estados_por_id:
+        cargar_catalogo_estados(db)
+        estados_por_id = _catalogo[1]
+    return estados_por_id.get(id_estado)
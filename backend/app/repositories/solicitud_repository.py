@@ -3,71 +3,317 @@ Capa de Infraestructura: Repositorios (Repository Pattern).
 Abstrae las consultas SQL y la persistencia del ORM. Centraliza las operaciones
 de la base de datos y garantiza la Integridad Transaccional (propiedades ACID).
 """
-from sqlalchemy.orm import Session
+import heapq
+import itertools
+import uuid
+
+from sqlalchemy import Select, insert, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import datetime
-from app.domain.schemas import DerivacionInput
+from typing import Iterator, List, Optional, Tuple
+from app.domain.schemas import DerivacionInput, SolicitudCreateInput
 
-from app.domain.models import Solicitud, Estado, HistorialDecision, LogAuditoria
-from app.domain.enums import EstadoSolicitud
+from app.domain.excepciones import ConflictoTransicion
+from app.domain.models import Solicitud, HistorialDecision
+from app.domain.enums import EstadoSolicitud, RolFlujo
+from app.domain.maquina_estados import maquina_estados
+from app.repositories import archivo_repository
+from app.repositories.estado_repository import obtener_id_estado, obtener_ids_estados, obtener_nombre_estado
+from app.services.busqueda import motor_para_dialecto
+from app.services.eventos import (
+    ADJUNTO_AGREGADO, ORIGEN_DERIVACION, ORIGEN_DICTAMEN, SOLICITUDES_CREADAS, SOLICITUDES_TRANSICIONADAS, bus_eventos
+)
 from app.services.solicitud_factory import SolicitudFactory
 
+# Estados visibles en la bandeja general y en el historial
+ESTADOS_BANDEJA = [EstadoSolicitud.PENDIENTE, EstadoSolicitud.POR_APROBAR, EstadoSolicitud.OBSERVADO]
+ESTADOS_HISTORIAL = [EstadoSolicitud.APROBADO, EstadoSolicitud.RECHAZADO, EstadoSolicitud.OBSERVADO]
+
+# Porción de la bandeja que atiende cada rol (bandejas particionadas)
+BANDEJAS_POR_ROL = {
+    RolFlujo.SECRETARIO: [EstadoSolicitud.PENDIENTE, EstadoSolicitud.OBSERVADO],
+    RolFlujo.APROBADOR: [EstadoSolicitud.POR_APROBAR],
+}
+
+# Orden de negocio de la bandeja: ALTA = 1, NORMAL = 2, BAJA = 3
+PRIORIDAD_RANGO = {"ALTA": 1, "NORMAL": 2, "BAJA": 3}
+RANGO_SIN_PRIORIDAD = 99
+
+# Filas por sentencia INSERT multi-fila (y por transacción) en la carga masiva
+TAMANO_LOTE_INSERCION = 500
+
+# Filas por bloque keyset en la exportación del historial
+TAMANO_BLOQUE_EXPORTACION = 1000
+
+# Reintentos al registrar un adjunto si otra escritura cambia la versión de la fila
+INTENTOS_ADJUNTO = 3
+
 def crear_solicitud(db: Session, tipo_tramite: str, solicitante: str, descripcion: str): 
     """
     Persiste una nueva solicitud integrando Inversión de Dependencias (DIP).
     Recibe la estrategia resuelta para no violar el principio Abierto/Cerrado (OCP).
     """
-    estado_inicial = db.query(Estado).filter(Estado.tipoEstado == EstadoSolicitud.PENDIENTE).first()
+    estado_inicial_id = obtener_id_estado(db, EstadoSolicitud.PENDIENTE)
     
-    if not estado_inicial:
+    if estado_inicial_id is None:
         raise Exception("Estados no inicializados en BD.")
 
     nueva_solicitud = SolicitudFactory.crear_solicitud(
         tipo_tramite=tipo_tramite,
         solicitante=solicitante,
         descripcion=descripcion,
-        estado_inicial_id=estado_inicial.idEstado
+        estado_inicial_id=estado_inicial_id
     )
     
     db.add(nueva_solicitud)
     db.commit()
     db.refresh(nueva_solicitud)
-    
+
+    bus_eventos.publicar(SOLICITUDES_CREADAS, solicitudes=[(nueva_solicitud.idSolicitud, nueva_solicitud.slaObjetivo)],
+                         filas=[fila_creada(nueva_solicitud.idSolicitud, {
+                             "solicitante": nueva_solicitud.solicitante, "tipoSolicitud": nueva_solicitud.tipoSolicitud,
+                             "prioridad": nueva_solicitud.prioridad, "slaObjetivo": nueva_solicitud.slaObjetivo,
+                             "descripcion": nueva_solicitud.descripcion
+                         })])
     return nueva_solicitud
 
 
-def listar_solicitudes_por_aprobar(db: Session):
-    """Obtiene solicitudes para la bandeja general (Pendientes, Por Aprobar y Observados)."""
-    
-    estados_requeridos = [
-        "PENDIENTE", 
-        "POR_APROBAR", 
-        "OBSERVADO"
+def crear_solicitudes_masivo(db: Session, items: List[SolicitudCreateInput], indices: Optional[List[int]] = None, tamano_lote: int = TAMANO_LOTE_INSERCION) -> List[dict]:
+    """
+    Carga masiva de trámites (inicio de semestre). Ensambla todas las solicitudes
+    con la Factory/Strategy en una sola pasada e inserta en sentencias multi-fila,
+    con una transacción por lote: un lote fallido se revierte sin afectar a los demás.
+    Retorna un resultado por ítem: {"indice", "id", "error"}; 'indices' permite
+    conservar la posición original de cada ítem (por defecto 0..n-1).
+    """
+    if indices is None:
+        indices = list(range(len(items)))
+
+    estado_inicial_id = obtener_id_estado(db, EstadoSolicitud.PENDIENTE)
+    if estado_inicial_id is None:
+        raise Exception("Estados no inicializados en BD.")
+
+    resultados = []
+    for desde in range(0, len(items), tamano_lote):
+        registros, indices_lote = [], []
+        for indice, item in zip(indices[desde:desde + tamano_lote], items[desde:desde + tamano_lote]):
+            registro = SolicitudFactory.construir_registro(
+                tipo_tramite=item.tipo_tramite,
+                solicitante=item.solicitante,
+                descripcion=item.descripcion,
+                estado_inicial_id=estado_inicial_id
+            )
+            error = _validar_longitudes(registro)
+            if error:
+                resultados.append({"indice": indice, "id": None, "error": error})
+                continue
+            registros.append(registro)
+            indices_lote.append(indice)
+
+        if not registros:
+            continue
+
+        try:
+            ids = _insertar_lote(db, registros)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            detalle = f"Lote revertido: {e.__class__.__name__}"
+            resultados.extend({"indice": i, "id": None, "error": detalle} for i in indices_lote)
+            continue
+
+        resultados.extend({"indice": i, "id": id_generado, "error": None} for i, id_generado in zip(indices_lote, ids))
+        bus_eventos.publicar(SOLICITUDES_CREADAS, solicitudes=[
+            (id_generado, registro["slaObjetivo"]) for id_generado, registro in zip(ids, registros)
+        ], filas=[fila_creada(id_generado, registro) for id_generado, registro in zip(ids, registros)])
+
+    resultados.sort(key=lambda r: r["indice"])
+    return resultados
+
+
+def fila_creada(id_solicitud: int, registro: dict) -> dict:
+    """Fila de bandeja de una solicitud recién creada (siempre PENDIENTE), para los suscriptores del bus."""
+    return {
+        "id": id_solicitud,
+        "alumno": registro["solicitante"],
+        "tipo_tramite": registro["tipoSolicitud"],
+        "estado": EstadoSolicitud.PENDIENTE.value,
+        "prioridad": registro["prioridad"],
+        "sla_objetivo": registro["slaObjetivo"],
+        "descripcion": registro["descripcion"]
+    }
+
+
+def _validar_longitudes(registro: dict) -> Optional[str]:
+    """Rechaza por ítem los valores que exceden el tamaño de columna, para no abortar el lote completo."""
+    for columna in ("tipoSolicitud", "solicitante", "descripcion"):
+        limite = Solicitud.__table__.c[columna].type.length
+        valor = registro.get(columna)
+        if valor is not None and len(valor) > limite:
+            return f"'{columna}' excede {limite} caracteres."
+    return None
+
+
+def _insertar_lote(db: Session, registros: List[dict]) -> List[int]:
+    """
+    Un único INSERT multi-fila por lote, devolviendo los ids en el orden de entrada.
+    Cada fila lleva la clave de correlación del lote (loteCarga, posicionLote) y
+    los ids generados se leen en la misma transacción con un SELECT sobre
+    ix_solicitudes_lote_carga. No se supone que el motor asigne ids consecutivos:
+    InnoDB con innodb_autoinc_lock_mode = 2 los intercala entre cargas concurrentes.
+    """
+    lote = uuid.uuid4().hex
+    db.execute(insert(Solicitud.__table__).values([
+        {**registro, "loteCarga": lote, "posicionLote": posicion} for posicion, registro in enumerate(registros)
+    ]))
+    return list(db.scalars(
+        select(Solicitud.idSolicitud).where(Solicitud.loteCarga == lote).order_by(Solicitud.posicionLote)
+    ))
+
+
+def listar_solicitudes_por_aprobar(db: Session, limite: int = 50, despues_de: Optional[Tuple[int, datetime, int]] = None,
+                                   rango_sla: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None,
+                                   estados=ESTADOS_BANDEJA, area: Optional[str] = None):
+    """
+    Obtiene una página de la bandeja general (Pendientes, Por Aprobar y Observados)
+    ordenada en MySQL por (rango de prioridad, slaObjetivo, idSolicitud).
+
+    Paginación por cursor (keyset): 'despues_de' es la última clave entregada
+    al cliente. Cada tramo de prioridad se resuelve con una consulta acotada por
+    LIMIT, por lo que el costo de una página no depende del tamaño del backlog.
+    'rango_sla' = (desde, hasta) restringe la bandeja a un rango semiabierto de
+    slaObjetivo (filtros de urgencia), servido por el mismo índice.
+    'estados' y 'area' acotan la consulta a la porción de un rol (BANDEJAS_POR_ROL)
+    y, para Jefatura, a su área (índice ix_solicitudes_bandeja_area).
+    Retorna la página y un indicador de si existen más registros.
+    """
+    ids_validos = obtener_ids_estados(db, estados)
+
+    pagina = []
+    for rango, prioridad in tramos_prioridad():
+        if despues_de and rango < despues_de[0]:
+            continue
+
+        # Pedimos un registro extra para saber si existe una página siguiente
+        faltantes = limite + 1 - len(pagina)
+        consultas = construir_consultas_tramo_bandeja(ids_validos, rango, prioridad, despues_de, faltantes, rango_sla, area)
+        pagina.extend(combinar_tramo([db.scalars(consulta).all() for consulta in consultas], faltantes))
+        if len(pagina) > limite:
+            break
+
+    return pagina[:limite], len(pagina) > limite
+
+
+def construir_consultas_tramo_bandeja(ids_validos, rango: int, prioridad: Optional[str], despues_de, limite: int,
+                                      rango_sla=None, area: Optional[str] = None) -> List[Select]:
+    """
+    Sentencias SELECT de un tramo de prioridad de la bandeja, una por estado,
+    compartidas por el repositorio síncrono y el asíncrono. Con estado_id y
+    prioridad fijados por igualdad, cada una es un único recorrido de rango de
+    ix_solicitudes_bandeja (o ix_solicitudes_bandeja_area) que ya entrega las
+    filas ordenadas por (slaObjetivo, idSolicitud): el LIMIT corta el recorrido
+    sin ordenar el tramo completo. combinar_tramo intercala los resultados.
+    """
+    return [
+        construir_consulta_tramo_bandeja(id_estado, rango, prioridad, despues_de, limite, rango_sla, area)
+        for id_estado in ids_validos
     ]
 
-    objetos_estado = db.query(Estado).filter(Estado.tipoEstado.in_(estados_requeridos)).all()
-    ids_validos = [e.idEstado for e in objetos_estado]
-    
-    return db.query(Solicitud).filter(Solicitud.estado_id.in_(ids_validos)).all()
+
+def construir_consulta_tramo_bandeja(id_estado: int, rango: int, prioridad: Optional[str], despues_de, limite: int,
+                                     rango_sla=None, area: Optional[str] = None) -> Select:
+    """Recorrido de un (estado, tramo de prioridad) de la bandeja en orden de índice."""
+    consulta = (
+        select(Solicitud)
+        .options(joinedload(Solicitud.estado_actual))
+        .where(Solicitud.estado_id == id_estado)
+    )
+    if area is not None:
+        consulta = consulta.where(Solicitud.areaDestino == area)
+    if prioridad is None:
+        # Tramo residual: prioridades fuera del catálogo (se listan al final). No
+        # es un rango del índice, pero solo contiene datos anómalos o heredados.
+        consulta = consulta.where(or_(
+            Solicitud.prioridad.is_(None),
+            Solicitud.prioridad.notin_(list(PRIORIDAD_RANGO))
+        ))
+    else:
+        consulta = consulta.where(Solicitud.prioridad == prioridad)
+
+    if despues_de and rango == despues_de[0]:
+        _, sla_cursor, id_cursor = despues_de
+        # 'slaObjetivo >= cursor' acota el rango del índice; el OR solo filtra el empate
+        consulta = consulta.where(
+            Solicitud.slaObjetivo >= sla_cursor,
+            or_(Solicitud.slaObjetivo > sla_cursor, Solicitud.idSolicitud > id_cursor)
+        )
+
+    if rango_sla:
+        sla_desde, sla_hasta = rango_sla
+        if sla_desde is not None:
+            consulta = consulta.where(Solicitud.slaObjetivo >= sla_desde)
+        if sla_hasta is not None:
+            consulta = consulta.where(Solicitud.slaObjetivo < sla_hasta)
+
+    return consulta.order_by(Solicitud.slaObjetivo, Solicitud.idSolicitud).limit(limite)
+
+
+def combinar_tramo(resultados: List[List[Solicitud]], limite: int) -> List[Solicitud]:
+    """Intercala las listas ya ordenadas de cada estado y conserva las 'limite' primeras."""
+    combinadas = heapq.merge(*resultados, key=lambda s: (s.slaObjetivo, s.idSolicitud))
+    return list(itertools.islice(combinadas, limite))
 
 
-def actualizar_estado(db: Session, solicitud_id: int, nuevo_estado_str: str, comentario: str):
+def listar_vencimientos(db: Session, desde: datetime, hasta: datetime) -> List[Tuple[int, datetime]]:
+    """
+    (idSolicitud, slaObjetivo) de las solicitudes abiertas que vencen en el rango
+    (desde, hasta]. Un único recorrido de rango sobre ix_solicitudes_sla.
+    """
+    ids_validos = obtener_ids_estados(db, ESTADOS_BANDEJA)
+    consulta = (
+        select(Solicitud.idSolicitud, Solicitud.slaObjetivo)
+        .where(
+            Solicitud.estado_id.in_(ids_validos),
+            Solicitud.slaObjetivo > desde,
+            Solicitud.slaObjetivo <= hasta
+        )
+    )
+    return [tuple(fila) for fila in db.execute(consulta).all()]
+
+
+def tramos_prioridad():
+    """Recorre los tramos de prioridad en orden de negocio, cerrando con el tramo residual."""
+    for prioridad, rango in sorted(PRIORIDAD_RANGO.items(), key=lambda item: item[1]):
+        yield rango, prioridad
+    yield RANGO_SIN_PRIORIDAD, None
+
+
+def actualizar_estado(db: Session, solicitud_id: int, nuevo_estado_str: str, comentario: str,
+                      version_esperada: Optional[int] = None):
     """
     Ejecuta el dictamen final. Garantiza la Integridad Transaccional al actualizar 
-    la entidad, el historial y la auditoría en una única transacción atómica.
+    la entidad y el historial en una única transacción atómica (la bitácora de
+    auditoría se registra fuera de ella, ver services/bitacora_auditoria).
+    Concurrencia optimista: si otro dictamen confirmó antes, lanza ConflictoTransicion.
     """
     
     # 1. Buscamos la solicitud en MySQL
     solicitud = db.query(Solicitud).filter(Solicitud.idSolicitud == solicitud_id).first()
     if not solicitud:
         return None # No se encontró
+    _validar_version(solicitud, version_esperada)
 
-    # 2. Buscamos el ID del nuevo estado ("APROBADO", "RECHAZADO", etc.)
-    nuevo_estado = db.query(Estado).filter(Estado.tipoEstado == nuevo_estado_str).first()
-    if not nuevo_estado:
+    # 2. Validamos la transición contra la tabla compilada y resolvemos el ID del
+    #    nuevo estado ("APROBADO", "RECHAZADO", etc.), ambos en memoria
+    maquina_estados.validar(obtener_nombre_estado(db, solicitud.estado_id), nuevo_estado_str, RolFlujo.APROBADOR)
+    nuevo_estado_id = obtener_id_estado(db, nuevo_estado_str)
+    if nuevo_estado_id is None:
         raise Exception("El estado proporcionado no existe en el catálogo.")
 
     # 3. Actualizamos la llave foránea de la solicitud
-    solicitud.estado_id = nuevo_estado.idEstado
+    solicitud.estado_id = nuevo_estado_id
 
     # 4. Insertamos en la tabla HistorialDecision (Relación 1 a N)
     nuevo_historial = HistorialDecision(
@@ -78,19 +324,16 @@ def actualizar_estado(db: Session, solicitud_id: int, nuevo_estado_str: str, com
         fecha=datetime.now()
     )
     db.add(nuevo_historial)
+    _proyectar_ultima_decision(solicitud, nuevo_historial)
 
-    # 5. Insertamos en la tabla LogAuditoria (Bitácora independiente)
-    nuevo_log = LogAuditoria(
-        usuario="Aprobador_Logueado", # Dato simulado para el MVP
-        endpoint=f"POST /api/v1/approvals/{solicitud_id}/verdict",
-        timestamp=datetime.now()
-    )
-    db.add(nuevo_log)
-
-    # 6. Guardamos los cambios físicos en la base de datos de manera transaccional
-    db.commit()
+    # 5. Guardamos los cambios físicos en la base de datos de manera transaccional
+    #    (UPDATE ... WHERE version = :leida)
+    _confirmar_transicion(db)
     db.refresh(solicitud)
-    
+
+    # 6. Notificamos el cambio ya confirmado a los suscriptores (Observer)
+    bus_eventos.publicar(SOLICITUDES_TRANSICIONADAS, ids=[solicitud_id], estado=obtener_nombre_estado(db, nuevo_estado_id),
+                         origen=ORIGEN_DICTAMEN)
     return solicitud
 
 def derivar_solicitud(db: Session, solicitud_id: int, payload: DerivacionInput):
@@ -102,32 +345,17 @@ def derivar_solicitud(db: Session, solicitud_id: int, payload: DerivacionInput):
     solicitud = db.query(Solicitud).filter(Solicitud.idSolicitud == solicitud_id).first()
     if not solicitud:
         return None
-
-    estado_pendiente = db.query(Estado).filter(Estado.tipoEstado == EstadoSolicitud.PENDIENTE).first()
-    estado_observado = db.query(Estado).filter(Estado.tipoEstado == EstadoSolicitud.OBSERVADO).first()
-    
-    # 2. CREAMOS LA LISTA DE PERMITIDOS
-    estados_validos = [estado_pendiente.idEstado, estado_observado.idEstado]
-    
-    # 3. CAMBIO CLAVE: Ahora permitimos PENDIENTE u OBSERVADO
-    if solicitud.estado_id not in estados_validos:
-        raise Exception("Conflicto: Solo se pueden evaluar solicitudes en estado PENDIENTE u OBSERVADO.")
+    _validar_version(solicitud, payload.version)
 
     # --- BIFURCACIÓN DEL FLUJO DEL SECRETARIO ---
-    if payload.checklist_valido:
-        # Camino Feliz: Todo conforme, pasa al Jefe
-        nuevo_estado_str = EstadoSolicitud.POR_APROBAR
-        accion_log = "Derivación a Jefatura"
-        comentario_final = "Revisión técnica conforme."
-    else:
-        # Camino Alterno: Faltan requisitos, se devuelve al alumno
-        nuevo_estado_str = EstadoSolicitud.OBSERVADO
-        accion_log = "Observación en Revisión Técnica"
-        comentario_final = payload.comentario
+    nuevo_estado_str, accion_log, comentario_final = _resolver_derivacion(payload)
+
+    # Solo desde PENDIENTE u OBSERVADO (tabla de transiciones, sin consultas)
+    maquina_estados.validar(obtener_nombre_estado(db, solicitud.estado_id), nuevo_estado_str, RolFlujo.SECRETARIO)
 
-    # Buscamos el ID del nuevo estado decidido
-    nuevo_estado = db.query(Estado).filter(Estado.tipoEstado == nuevo_estado_str).first()
-    solicitud.estado_id = nuevo_estado.idEstado
+    # Buscamos el ID del nuevo estado decidido y registramos el área (bandeja de Jefatura)
+    solicitud.estado_id = obtener_id_estado(db, nuevo_estado_str)
+    solicitud.areaDestino = _area_destino(payload)
 
     # Registramos la acción en el historial
     nuevo_historial = HistorialDecision(
@@ -138,29 +366,325 @@ def derivar_solicitud(db: Session, solicitud_id: int, payload: DerivacionInput):
         fecha=datetime.now()
     )
     db.add(nuevo_historial)
-    
-    # Registramos en Auditoría
-    nuevo_log = LogAuditoria(
+    _proyectar_ultima_decision(solicitud, nuevo_historial)
+
+    _confirmar_transicion(db)
+    db.refresh(solicitud)
+
+    bus_eventos.publicar(SOLICITUDES_TRANSICIONADAS, ids=[solicitud_id], estado=obtener_nombre_estado(db, solicitud.estado_id),
+                         origen=ORIGEN_DERIVACION)
+    return solicitud
+
+
+def _resolver_derivacion(payload: DerivacionInput) -> Tuple[EstadoSolicitud, str, str]:
+    """Destino, acción y comentario de la revisión técnica según el checklist."""
+    if payload.checklist_valido:
+        # Camino Feliz: Todo conforme, pasa al Jefe
+        return EstadoSolicitud.POR_APROBAR, "Derivación a Jefatura", "Revisión técnica conforme."
+    # Camino Alterno: Faltan requisitos, se devuelve al alumno
+    return EstadoSolicitud.OBSERVADO, "Observación en Revisión Técnica", payload.comentario
+
+
+def _area_destino(payload: DerivacionInput) -> Optional[str]:
+    """Área de la Jefatura que recibe la derivación; una observación vuelve a Secretaría (sin área)."""
+    return payload.area_destino.strip() if payload.checklist_valido else None
+
+
+def _validar_version(solicitud: Solicitud, version_esperada: Optional[int]):
+    """El cliente puede enviar la versión que vio en el detalle (compare-and-swap de extremo a extremo)."""
+    if version_esperada is not None and solicitud.version != version_esperada:
+        raise ConflictoTransicion(
+            f"Conflicto: la solicitud cambió desde que fue consultada (versión {solicitud.version}, "
+            f"se esperaba {version_esperada})."
+        )
+
+
+def _confirmar_transicion(db: Session):
+    """Commit de una transición versionada: si otra escritura ganó la carrera, no se pierde ninguna."""
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise ConflictoTransicion("Conflicto: otra decisión modificó la solicitud al mismo tiempo.")
+
+
+def _proyectar_ultima_decision(solicitud: Solicitud, decision: HistorialDecision):
+    """
+    Mantiene la proyección desnormalizada de la última decisión en la propia
+    solicitud, dentro de la misma transacción que inserta el historial.
+    """
+    solicitud.fechaUltimaDecision = decision.fecha
+    solicitud.actorUltimaDecision = decision.usuario_id
+    solicitud.accionUltimaDecision = decision.accion
+
+
+def actualizar_estado_lote(db: Session, solicitud_ids: List[int], nuevo_estado_str: str, comentario: str) -> List[dict]:
+    """
+    Dictamen masivo. Bloquea todas las solicitudes con un único SELECT ... FOR UPDATE,
+    valida cada transición contra la máquina de estados y registra el cambio y el
+    historial con sentencias masivas en una sola transacción. Retorna un resultado por id.
+    """
+    if obtener_id_estado(db, nuevo_estado_str) is None:
+        raise Exception("El estado proporcionado no existe en el catálogo.")
+
+    return _transicionar_lote(
+        db,
+        solicitud_ids,
+        nuevo_estado=nuevo_estado_str,
+        rol=RolFlujo.APROBADOR,
+        origen=ORIGEN_DICTAMEN,
+        usuario="Aprobador_Logueado", # Dato simulado para el MVP
+        accion=f"Dictamen: {nuevo_estado_str}",
+        comentario=comentario
+    )
+
+
+def derivar_solicitud_lote(db: Session, solicitud_ids: List[int], payload: DerivacionInput) -> List[dict]:
+    """Derivación masiva del Secretario (RN-06) con las mismas garantías que el dictamen masivo."""
+    nuevo_estado, accion_log, comentario_final = _resolver_derivacion(payload)
+
+    return _transicionar_lote(
+        db,
+        solicitud_ids,
+        nuevo_estado=nuevo_estado,
+        rol=RolFlujo.SECRETARIO,
+        origen=ORIGEN_DERIVACION,
         usuario="Secretario_Logueado",
-        endpoint=f"POST /api/v1/workflow/{solicitud_id}/escalate",
-        timestamp=datetime.now()
+        accion=accion_log,
+        comentario=comentario_final,
+        valores={"areaDestino": _area_destino(payload)}
     )
-    db.add(nuevo_log)
 
+
+def _transicionar_lote(db: Session, solicitud_ids: List[int], nuevo_estado, rol: RolFlujo, origen: str,
+                       usuario: str, accion: str, comentario: str, valores: Optional[dict] = None) -> List[dict]:
+    ids_unicos = list(dict.fromkeys(solicitud_ids))
+    nuevo_estado_id = obtener_id_estado(db, nuevo_estado)
+    nombre_destino = obtener_nombre_estado(db, nuevo_estado_id)
+    ids_origen = obtener_ids_estados(db, maquina_estados.origenes(nombre_destino, rol))
+
+    # 1. Un único SELECT ... FOR UPDATE para leer y bloquear todo el lote
+    estados_actuales = dict(db.execute(
+        select(Solicitud.idSolicitud, Solicitud.estado_id)
+        .where(Solicitud.idSolicitud.in_(ids_unicos))
+        .with_for_update()
+    ).all())
+
+    # 2. Validación de transiciones del lote en una pasada por la tabla compilada
+    validos, rechazados = maquina_estados.validar_lote(
+        {id_solicitud: obtener_nombre_estado(db, id_estado) for id_solicitud, id_estado in estados_actuales.items()},
+        nombre_destino,
+        rol
+    )
+    resultados = []
+    for id_solicitud in ids_unicos:
+        if id_solicitud not in estados_actuales:
+            resultados.append({"id": id_solicitud, "nuevo_estado": None, "error": "Solicitud no encontrada."})
+        elif id_solicitud in rechazados:
+            resultados.append({"id": id_solicitud, "nuevo_estado": None, "error": rechazados[id_solicitud]})
+        else:
+            resultados.append({"id": id_solicitud, "nuevo_estado": nombre_destino, "error": None})
+
+    # 3. Escrituras masivas: UPDATE ... WHERE IN + INSERT multi-fila del historial.
+    #    El UPDATE repite la condición de estado y avanza la versión: donde no hay
+    #    bloqueo de filas (SQLite) una escritura concurrente se detecta por el conteo.
+    if validos:
+        ahora = datetime.now()
+        tabla = Solicitud.__table__
+        actualizadas = db.execute(
+            update(tabla)
+            .where(tabla.c.idSolicitud.in_(validos), tabla.c.estado_id.in_(ids_origen))
+            .values(
+                estado_id=nuevo_estado_id,
+                fechaUltimaDecision=ahora,
+                actorUltimaDecision=usuario,
+                accionUltimaDecision=accion,
+                version=tabla.c.version + 1,
+                **(valores or {})
+            )
+        ).rowcount
+        if actualizadas != len(validos):
+            db.rollback()
+            raise ConflictoTransicion("Conflicto: otra decisión modificó parte del lote al mismo tiempo.")
+        db.execute(insert(HistorialDecision.__table__), [
+            {"solicitud_id": id_solicitud, "usuario_id": usuario, "accion": accion, "comentario": comentario, "fecha": ahora}
+            for id_solicitud in validos
+        ])
+
+    # 4. Un único commit para todo el lote
     db.commit()
-    db.refresh(solicitud)
-    return solicitud
+
+    if validos:
+        bus_eventos.publicar(SOLICITUDES_TRANSICIONADAS, ids=validos, estado=nombre_destino, origen=origen)
+    return resultados
 
 
 def consultar_historial(db: Session):
-    """Obtiene las solicitudes que ya fueron procesadas (Estados Finales)."""
-    estados_finales = [EstadoSolicitud.APROBADO, EstadoSolicitud.RECHAZADO, EstadoSolicitud.OBSERVADO]
-    estados_db = db.query(Estado).filter(Estado.tipoEstado.in_(estados_finales)).all()
-    ids_estados = [e.idEstado for e in estados_db]
-    
-    return db.query(Solicitud).filter(Solicitud.estado_id.in_(ids_estados)).all()
+    """
+    Obtiene las solicitudes que ya fueron procesadas (Estados Finales), de la
+    decisión más reciente a la más antigua. La fecha de decisión se lee de la
+    proyección en 'solicitudes', sin cargar el historial de cada una.
+    """
+    ids_estados = obtener_ids_estados(db, ESTADOS_HISTORIAL)
+    return db.scalars(construir_consulta_historial(ids_estados)).all()
+
+
+def buscar_solicitudes(db: Session, terminos: List[str], estados=None, desde: Optional[datetime] = None,
+                       hasta: Optional[datetime] = None, limite: int = 50, desplazamiento: int = 0) -> Tuple[list, bool]:
+    """
+    Búsqueda de texto completo (alumno, tipo de trámite, descripción) con los
+    términos ya normalizados por services.busqueda. Retorna la página de pares
+    (solicitud, relevancia), de mayor a menor relevancia, y si hay más resultados.
+    'desde'/'hasta' filtran por la fecha de creación.
+    """
+    ids_estados = obtener_ids_estados(db, estados) if estados else None
+    consulta = construir_consulta_busqueda(db.get_bind().dialect.name, terminos, ids_estados, desde, hasta,
+                                           limite + 1, desplazamiento)
+    filas = db.execute(consulta).all()
+    return filas[:limite], len(filas) > limite
+
+
+def iterar_historial(db: Session, estados=None, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                     tamano_bloque: int = TAMANO_BLOQUE_EXPORTACION) -> Iterator[List[dict]]:
+    """
+    Recorre el historial por bloques keyset sobre idSolicitud para exportaciones
+    masivas: cada bloque es una consulta acotada que devuelve filas planas (sin
+    entidades en el identity map), por lo que la memoria no crece con el volumen.
+    'desde'/'hasta' filtran por la fecha de la última decisión.
+    """
+    ids_estados = obtener_ids_estados(db, estados or ESTADOS_HISTORIAL)
+    ultimo_id = 0
+
+    while True:
+        consulta = (
+            select(
+                Solicitud.idSolicitud, Solicitud.tipoSolicitud, Solicitud.estado_id,
+                Solicitud.solicitante, Solicitud.fechaUltimaDecision
+            )
+            .where(Solicitud.estado_id.in_(ids_estados), Solicitud.idSolicitud > ultimo_id)
+            .order_by(Solicitud.idSolicitud)
+            .limit(tamano_bloque)
+        )
+        if desde:
+            consulta = consulta.where(Solicitud.fechaUltimaDecision >= desde)
+        if hasta:
+            consulta = consulta.where(Solicitud.fechaUltimaDecision <= hasta)
+
+        filas = db.execute(consulta).all()
+        if not filas:
+            return
+
+        yield [
+            {
+                "id": fila.idSolicitud,
+                "tramite": fila.tipoSolicitud,
+                "estado_final": obtener_nombre_estado(db, fila.estado_id),
+                "alumno": fila.solicitante,
+                "fecha_decision": fila.fechaUltimaDecision
+            }
+            for fila in filas
+        ]
+        ultimo_id = filas[-1].idSolicitud
+
+
+def existe_solicitud(db: Session, solicitud_id: int) -> bool:
+    return db.scalar(select(Solicitud.idSolicitud).where(Solicitud.idSolicitud == solicitud_id)) is not None
+
+
+def agregar_adjunto(db: Session, solicitud_id: int, referencia: dict) -> Optional[dict]:
+    """
+    Registra la referencia de un adjunto ya almacenado (sha256, nombre, tipo,
+    tamaño) en solicitudes.adjuntos; el contenido nunca pasa por la fila.
+    Idempotente por sha256: si ya estaba adjunto retorna la referencia existente.
+    Retorna None si la solicitud no existe.
+    """
+    for _ in range(INTENTOS_ADJUNTO):
+        solicitud = db.get(Solicitud, solicitud_id)
+        if not solicitud:
+            return None
+        adjuntos = list(solicitud.adjuntos or [])
+        existente = next((a for a in adjuntos if a["sha256"] == referencia["sha256"]), None)
+        if existente:
+            return existente
+
+        solicitud.adjuntos = adjuntos + [referencia]  # Lista nueva: la columna JSON no rastrea mutaciones
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()  # Una transición concurrente cambió la versión: releer y reintentar
+            continue
+        bus_eventos.publicar(ADJUNTO_AGREGADO, id=solicitud_id, sha256=referencia["sha256"])
+        return referencia
+    raise ConflictoTransicion("Conflicto: la solicitud cambió mientras se registraba el adjunto.")
+
+
+def obtener_adjunto(db: Session, solicitud_id: int, sha256: str) -> Optional[dict]:
+    """
+    Referencia del adjunto si pertenece a la solicitud; solo lee la columna de
+    adjuntos (o el detalle archivado, si la solicitud ya pasó al archivo frío).
+    """
+    fila = db.execute(select(Solicitud.adjuntos).where(Solicitud.idSolicitud == solicitud_id)).first()
+    if fila is not None:
+        adjuntos = fila.adjuntos
+    else:
+        archivada = archivo_repository.obtener_archivada(db, solicitud_id)
+        adjuntos = archivada.get("adjuntos") if archivada else None
+    return next((a for a in adjuntos or [] if a["sha256"] == sha256), None)
 
 
 def obtener_detalle(db: Session, solicitud_id: int):
-    """Obtiene una solicitud específica por su ID."""
-    return db.query(Solicitud).filter(Solicitud.idSolicitud == solicitud_id).first()
\ No newline at end of file
+    """Obtiene una solicitud específica por su ID, con su estado e historial precargados."""
+    return db.scalars(construir_consulta_detalle(solicitud_id)).first()
+
+
+def construir_consulta_historial(ids_estados) -> Select:
+    """
+    Recorrido del índice ix_solicitudes_historial (estado, última decisión); el
+    estado viaja en el mismo JOIN, sin consultas adicionales por fila.
+    """
+    return (
+        select(Solicitud)
+        .options(joinedload(Solicitud.estado_actual))
+        .where(Solicitud.estado_id.in_(ids_estados))
+        .order_by(Solicitud.fechaUltimaDecision.desc(), Solicitud.idSolicitud.desc())
+    )
+
+
+def construir_consulta_detalle(solicitud_id: int) -> Select:
+    """Solicitud puntual con su estado, historial y referencias de adjuntos precargados."""
+    return (
+        select(Solicitud)
+        .options(
+            joinedload(Solicitud.estado_actual),
+            selectinload(Solicitud.historial_decisiones),
+            undefer(Solicitud.adjuntos)
+        )
+        .where(Solicitud.idSolicitud == solicitud_id)
+    )
+
+
+def construir_consulta_busqueda(dialecto: str, terminos: List[str], ids_estados=None, desde: Optional[datetime] = None,
+                                hasta: Optional[datetime] = None, limite: int = 51, desplazamiento: int = 0) -> Select:
+    """
+    En MySQL la condición MATCH ... AGAINST se resuelve con el índice FULLTEXT
+    ix_solicitudes_texto; estado y fechas se aplican sobre esos candidatos.
+    """
+    motor = motor_para_dialecto(dialecto)
+    relevancia = motor.relevancia(terminos).label("relevancia")
+    consulta = (
+        select(Solicitud, relevancia)
+        .options(joinedload(Solicitud.estado_actual))
+        .where(motor.condicion(terminos))
+    )
+    if ids_estados is not None:
+        consulta = consulta.where(Solicitud.estado_id.in_(ids_estados))
+    if desde:
+        consulta = consulta.where(Solicitud.fechaCreacion >= desde)
+    if hasta:
+        consulta = consulta.where(Solicitud.fechaCreacion <= hasta)
+    return (
+        consulta
+        .order_by(relevancia.desc(), Solicitud.idSolicitud.desc())
+        .limit(limite)
+        .offset(desplazamiento)
+    )
@@ -0,0 +1,75 @@
+"""
+Capa de Infraestructura: Repositorio Asíncrono (Repository Pattern).
+Equivalente no bloqueante de solicitud_repository para el modo DB_MODO=async.
+Reutiliza las mismas sentencias SELECT del repositorio síncrono y delega las
+escrituras transaccionales a su lógica mediante AsyncSession.run_sync, de modo
+que las reglas de negocio viven en un solo lugar.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+from app.repositories.estado_repository import obtener_ids_estados, obtener_nombre_estado
+
+
+async def listar_solicitudes_por_aprobar(db: AsyncSession, limite: int = 50, despues_de: Optional[Tuple[int, datetime, int]] = None,
+                                         rango_sla=None, estados=solicitud_repository.ESTADOS_BANDEJA,
+                                         area: Optional[str] = None):
+    """Página keyset de la bandeja general o de un rol (ver solicitud_repository.listar_solicitudes_por_aprobar)."""
+    ids_validos = await db.run_sync(obtener_ids_estados, estados)
+
+    pagina = []
+    for rango, prioridad in solicitud_repository.tramos_prioridad():
+        if despues_de and rango < despues_de[0]:
+            continue
+
+        faltantes = limite + 1 - len(pagina)
+        consultas = solicitud_repository.construir_consultas_tramo_bandeja(ids_validos, rango, prioridad, despues_de,
+                                                                          faltantes, rango_sla, area)
+        resultados = [(await db.scalars(consulta)).all() for consulta in consultas]
+        pagina.extend(solicitud_repository.combinar_tramo(resultados, faltantes))
+        if len(pagina) > limite:
+            break
+
+    return pagina[:limite], len(pagina) > limite
+
+
+async def consultar_historial(db: AsyncSession):
+    """Obtiene las solicitudes que ya fueron procesadas (Estados Finales)."""
+    ids_estados = await db.run_sync(obtener_ids_estados, solicitud_repository.ESTADOS_HISTORIAL)
+    return (await db.scalars(solicitud_repository.construir_consulta_historial(ids_estados))).all()
+
+
+async def buscar_solicitudes(db: AsyncSession, terminos, estados=None, desde: Optional[datetime] = None,
+                             hasta: Optional[datetime] = None, limite: int = 50, desplazamiento: int = 0):
+    """Búsqueda de texto completo (ver solicitud_repository.buscar_solicitudes)."""
+    ids_estados = await db.run_sync(obtener_ids_estados, estados) if estados else None
+    consulta = solicitud_repository.construir_consulta_busqueda(db.get_bind().dialect.name, terminos, ids_estados,
+                                                                desde, hasta, limite + 1, desplazamiento)
+    filas = (await db.execute(consulta)).all()
+    return filas[:limite], len(filas) > limite
+
+
+async def obtener_detalle(db: AsyncSession, solicitud_id: int):
+    """Obtiene una solicitud específica por su ID, con su estado e historial precargados."""
+    return (await db.scalars(solicitud_repository.construir_consulta_detalle(solicitud_id))).first()
+
+
+async def actualizar_estado(db: AsyncSession, solicitud_id: int, nuevo_estado_str: str, comentario: str,
+                            version_esperada: Optional[int] = None):
+    """Dictamen final: misma transacción atómica (y control de versión) que la versión síncrona."""
+    return await db.run_sync(solicitud_repository.actualizar_estado, solicitud_id, nuevo_estado_str, comentario,
+                             version_esperada)
+
+
+async def derivar_solicitud(db: AsyncSession, solicitud_id: int, payload: DerivacionInput):
+    """Transición técnica del Secretario (RN-06)."""
+    return await db.run_sync(solicitud_repository.derivar_solicitud, solicitud_id, payload)
+
+
+async def nombre_estado(db: AsyncSession, id_estado: int) -> Optional[str]:
+    """Resuelve el nombre del estado desde el catálogo en caché."""
+    return await db.run_sync(obtener_nombre_estado, id_estado)
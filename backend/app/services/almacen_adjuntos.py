@@ -0,0 +1,80 @@
+"""
+Capa de Servicios: Almacén de Adjuntos Direccionado por Contenido.
+Cada archivo se guarda una sola vez bajo su SHA-256 (raiz/ab/cd/<sha256>): el
+mismo PDF subido a varias solicitudes comparte un único blob. La subida se
+recibe por bloques y se escribe a un temporal mientras se calcula el hash, con
+memoria constante; al terminar se mueve de forma atómica a su ruta definitiva.
+La fila de la solicitud solo guarda la referencia (ver solicitud_repository).
+"""
+import hashlib
+import os
+import re
+import tempfile
+from typing import AsyncIterator, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.domain.excepciones import AdjuntoDemasiadoGrande
+
+_SHA256_VALIDO = re.compile(r"^[0-9a-f]{64}$")
+
+
+class AlmacenAdjuntos:
+
+    def __init__(self, raiz: str = settings.ADJUNTOS_RUTA, max_bytes: int = settings.ADJUNTOS_MAX_MB * 1024 * 1024):
+        self.raiz = os.path.abspath(raiz)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def ruta_relativa(sha256: str) -> str:
+        """Dos niveles de subdirectorios: evita carpetas con millones de entradas."""
+        if not _SHA256_VALIDO.match(sha256):
+            raise ValueError("Identificador de adjunto inválido.")
+        return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def ruta(self, sha256: str) -> str:
+        return os.path.join(self.raiz, *self.ruta_relativa(sha256).split("/"))
+
+    def existe(self, sha256: str) -> bool:
+        return os.path.isfile(self.ruta(sha256))
+
+    async def guardar_flujo(self, flujo: AsyncIterator[bytes]) -> Tuple[str, int]:
+        """
+        Consume el flujo de bytes y retorna (sha256, tamaño). Lanza
+        AdjuntoDemasiadoGrande al superar max_bytes y ValueError si está vacío;
+        en ambos casos (o si el cliente corta la subida) no deja residuos.
+        """
+        temporales = os.path.join(self.raiz, "tmp")
+        os.makedirs(temporales, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=temporales)
+        resumen, tamano = hashlib.sha256(), 0
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                async for bloque in flujo:
+                    tamano += len(bloque)
+                    if tamano > self.max_bytes:
+                        raise AdjuntoDemasiadoGrande(f"El adjunto supera el máximo de {self.max_bytes // (1024 * 1024)} MB.")
+                    resumen.update(bloque)
+                    await run_in_threadpool(archivo.write, bloque)
+            if tamano == 0:
+                raise ValueError("El adjunto está vacío.")
+            sha256 = resumen.hexdigest()
+            await run_in_threadpool(self._consolidar, temporal, sha256)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        return sha256, tamano
+
+    def _consolidar(self, temporal: str, sha256: str):
+        destino = self.ruta(sha256)
+        if os.path.exists(destino):
+            os.remove(temporal)  # Contenido ya almacenado: deduplicado
+            return
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(temporal, destino)
+
+
+# Instancia única del proceso
+almacen_adjuntos = AlmacenAdjuntos()
@@ -0,0 +1,129 @@
+"""
+Capa de Servicios: Archivador de Fondo (Retención Caliente/Fría).
+Un hilo de fondo mueve periódicamente al archivo frío, por lotes acotados:
+- las solicitudes APROBADAS/RECHAZADAS con más de ARCHIVO_RETENCION_MESES
+  desde su última decisión (detalle e historial en JSON comprimido), y
+- la bitácora de auditoría con más de ARCHIVO_AUDITORIA_RETENCION_MESES.
+Así solicitudes, historial_decisiones y log_auditoria solo conservan los datos
+recientes. El detalle de una solicitud archivada se sigue sirviendo desde el
+archivo (DetalleSolicitudFacade); los cambios se publican en el bus (Observer).
+"""
+import calendar
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.config import settings
+from app.repositories import archivo_repository
+from app.services.detalle_facade import formatear_detalle
+from app.services.eventos import SOLICITUDES_ARCHIVADAS, BusEventos, bus_eventos
+
+logger = logging.getLogger(__name__)
+
+
+def restar_meses(fecha: datetime, meses: int) -> datetime:
+    """Misma fecha 'meses' atrás; el día se ajusta al último del mes si no existe (31/03 - 1 = 28/02)."""
+    total = fecha.year * 12 + fecha.month - 1 - meses
+    anio, mes = divmod(total, 12)
+    dia = min(fecha.day, calendar.monthrange(anio, mes + 1)[1])
+    return fecha.replace(year=anio, month=mes + 1, day=dia)
+
+
+class Archivador:
+
+    def __init__(self, bus: BusEventos = bus_eventos,
+                 retencion_meses: int = settings.ARCHIVO_RETENCION_MESES,
+                 retencion_auditoria_meses: int = settings.ARCHIVO_AUDITORIA_RETENCION_MESES,
+                 tamano_lote: int = settings.ARCHIVO_TAMANO_LOTE,
+                 intervalo_min: int = settings.ARCHIVO_INTERVALO_MIN,
+                 reloj: Callable[[], datetime] = datetime.now):
+        self.bus = bus
+        self.retencion_meses = retencion_meses
+        self.retencion_auditoria_meses = retencion_auditoria_meses
+        self.tamano_lote = tamano_lote
+        self.intervalo_seg = intervalo_min * 60
+        self.reloj = reloj
+        self.solicitudes_archivadas = 0
+        self.auditoria_archivada = 0
+        self.ultima_ejecucion: Optional[datetime] = None
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._fabrica_sesion = None
+
+    # --- Ciclo de vida -------------------------------------------------------
+
+    def iniciar(self, fabrica_sesion):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._fabrica_sesion = fabrica_sesion
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="archivador", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0):
+        if self._hilo is None:
+            return
+        self._detener.set()
+        self._hilo.join(timeout)
+        self._hilo = None
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            try:
+                with self._fabrica_sesion() as db:
+                    self.ejecutar(db)
+            except Exception:
+                logger.exception("Error en el archivador; se reintenta en el siguiente ciclo.")
+            self._detener.wait(self.intervalo_seg)
+
+    # --- Archivo -------------------------------------------------------------
+
+    def ejecutar(self, db) -> dict:
+        """
+        Archiva lote por lote hasta agotar lo pendiente (o hasta que se pida
+        detener). Cada lote es una transacción corta: no bloquea la bandeja.
+        """
+        ahora = self.reloj()
+        limite_solicitudes = restar_meses(ahora, self.retencion_meses)
+        limite_auditoria = restar_meses(ahora, self.retencion_auditoria_meses)
+        resultado = {"solicitudes": 0, "auditoria": 0}
+
+        while not self._detener.is_set():
+            ids = archivo_repository.archivar_lote_solicitudes(db, limite_solicitudes, self.tamano_lote, formatear_archivada)
+            if not ids:
+                break
+            resultado["solicitudes"] += len(ids)
+            self.solicitudes_archivadas += len(ids)
+            self.bus.publicar(SOLICITUDES_ARCHIVADAS, ids=ids)
+
+        while not self._detener.is_set():
+            filas = archivo_repository.archivar_lote_auditoria(db, limite_auditoria, self.tamano_lote)
+            if not filas:
+                break
+            resultado["auditoria"] += filas
+            self.auditoria_archivada += filas
+
+        self.ultima_ejecucion = ahora
+        if any(resultado.values()):
+            logger.info("Archivo frío: %(solicitudes)s solicitudes y %(auditoria)s registros de auditoría.", resultado)
+        return resultado
+
+    def instantanea(self) -> dict:
+        return {
+            "activo": self._hilo is not None and self._hilo.is_alive(),
+            "retencion_meses": self.retencion_meses,
+            "retencion_auditoria_meses": self.retencion_auditoria_meses,
+            "solicitudes_archivadas": self.solicitudes_archivadas,
+            "auditoria_archivada": self.auditoria_archivada,
+            "ultima_ejecucion": self.ultima_ejecucion,
+        }
+
+
+def formatear_archivada(solicitud) -> dict:
+    """Detalle consolidado (CU-05) marcado como archivado: es lo que verá el cliente al consultarlo."""
+    return {**formatear_detalle(solicitud), "archivada": True}
+
+
+# Instancia única del proceso; main.py la arranca si ARCHIVO_HABILITADO
+archivador = Archivador()
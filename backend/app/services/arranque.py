@@ -0,0 +1,62 @@
+"""
+Capa de Servicios: Medidor del Arranque en Frío.
+Registra cuánto tarda cada fase del arranque de un worker (importación de la
+aplicación, esquema, catálogo de estados, servicios de fondo) y lo compara con
+el presupuesto ARRANQUE_PRESUPUESTO_MS. Cada worker de uvicorn mide el suyo y
+lo expone en /metrics/arranque.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MedidorArranque:
+
+    def __init__(self, presupuesto_ms: int = settings.ARRANQUE_PRESUPUESTO_MS):
+        self.presupuesto_ms = presupuesto_ms
+        self._inicio = time.perf_counter()
+        self._ultima_marca = self._inicio
+        self.fases: Dict[str, float] = {}
+        self.total_ms: Optional[float] = None
+
+    def registrar(self, fase: str):
+        """Cierra una fase: el tiempo transcurrido desde la marca anterior."""
+        ahora = time.perf_counter()
+        self.fases[fase] = round((ahora - self._ultima_marca) * 1000, 2)
+        self._ultima_marca = ahora
+
+    @contextmanager
+    def fase(self, nombre: str):
+        self._ultima_marca = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre)
+
+    def finalizar(self) -> float:
+        """Total desde la importación hasta que el worker acepta peticiones."""
+        self.total_ms = round((time.perf_counter() - self._inicio) * 1000, 2)
+        if self.total_ms > self.presupuesto_ms:
+            logger.warning("Arranque en frío de %.0f ms supera el presupuesto de %s ms: %s",
+                           self.total_ms, self.presupuesto_ms, self.fases)
+        else:
+            logger.info("Arranque en frío en %.0f ms: %s", self.total_ms, self.fases)
+        return self.total_ms
+
+    def instantanea(self) -> dict:
+        return {
+            "presupuesto_ms": self.presupuesto_ms,
+            "total_ms": self.total_ms,
+            "dentro_del_presupuesto": None if self.total_ms is None else self.total_ms <= self.presupuesto_ms,
+            "fases_ms": dict(self.fases),
+        }
+
+
+# Instancia única del proceso; se crea al importar app.main (primera línea) para
+# que la fase 'importacion' incluya la carga de controladores, modelos y servicios
+medidor_arranque = MedidorArranque()
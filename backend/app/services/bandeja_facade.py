@@ -5,8 +5,12 @@ liberando a los controladores (Capa API) de responsabilidades de transformación
 """
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app.repositories import solicitud_repository
+from typing import Optional, Tuple
+from app.repositories import solicitud_repository, solicitud_repository_async
+from app.domain.enums import RolFlujo
 from app.domain.schemas import SolicitudDTO
+from app.services.paginacion import LIMITE_POR_DEFECTO, codificar_cursor, decodificar_cursor
+from app.services.planificador_sla import clasificar_semaforo, rango_filtro_sla
 
 class BandejaAprobacionFacade:
     """
@@ -16,18 +20,55 @@ class BandejaAprobacionFacade:
     def __init__(self, db: Session):
         self.db = db
 
-    def obtener_bandeja_ordenada(self) -> list[SolicitudDTO]:
-        # 1. Obtener datos crudos del repositorio
+    def obtener_bandeja_ordenada(self, limite: int = LIMITE_POR_DEFECTO, cursor: Optional[str] = None,
+                                 filtro_sla: Optional[str] = None, horas: Optional[int] = None,
+                                 rol: Optional[RolFlujo] = None, area: Optional[str] = None) -> Tuple[list[SolicitudDTO], Optional[str]]:
         """
         Orquesta la construcción de la bandeja. Aplica reglas de ordenamiento 
         del negocio: Prioridad estricta y control de vencimiento de SLA (Semáforo).
+        El ordenamiento se resuelve en la base de datos; aquí solo se mapea la
+        página solicitada y se emite el cursor de la siguiente.
+        'filtro_sla' ('vencidas' | 'por_vencer' en las próximas 'horas') se
+        traduce a un rango de slaObjetivo, sin recorrer toda la bandeja.
+        'rol' (y 'area' para Jefatura) limita la consulta a la porción de la
+        bandeja que atiende ese rol; sin rol se lista la bandeja general.
         """
-        solicitudes_db = solicitud_repository.listar_solicitudes_por_aprobar(self.db)
-        
-        # 2. Mapear a DTOs y calcular Semáforo
+        # 1. Obtener la página ya ordenada desde el repositorio (keyset)
+        ahora = datetime.now()
+        despues_de = decodificar_cursor(cursor) if cursor else None
+        solicitudes_db, hay_mas = solicitud_repository.listar_solicitudes_por_aprobar(
+            self.db, limite=limite, despues_de=despues_de, rango_sla=self._rango_sla(filtro_sla, horas, ahora),
+            estados=self._estados(rol), area=area
+        )
+        return self._construir_pagina(solicitudes_db, hay_mas, ahora)
+
+    async def obtener_bandeja_ordenada_async(self, limite: int = LIMITE_POR_DEFECTO, cursor: Optional[str] = None,
+                                             filtro_sla: Optional[str] = None, horas: Optional[int] = None,
+                                             rol: Optional[RolFlujo] = None, area: Optional[str] = None) -> Tuple[list[SolicitudDTO], Optional[str]]:
+        """Variante no bloqueante para el modo DB_MODO=async (self.db es una AsyncSession)."""
+        ahora = datetime.now()
+        despues_de = decodificar_cursor(cursor) if cursor else None
+        solicitudes_db, hay_mas = await solicitud_repository_async.listar_solicitudes_por_aprobar(
+            self.db, limite=limite, despues_de=despues_de, rango_sla=self._rango_sla(filtro_sla, horas, ahora),
+            estados=self._estados(rol), area=area
+        )
+        return self._construir_pagina(solicitudes_db, hay_mas, ahora)
+
+    @staticmethod
+    def _estados(rol: Optional[RolFlujo]):
+        return solicitud_repository.BANDEJAS_POR_ROL[rol] if rol else solicitud_repository.ESTADOS_BANDEJA
+
+    @staticmethod
+    def _rango_sla(filtro_sla: Optional[str], horas: Optional[int], ahora: datetime):
+        if not filtro_sla:
+            return None
+        return rango_filtro_sla(filtro_sla, ahora, horas) if horas else rango_filtro_sla(filtro_sla, ahora)
+
+    def _construir_pagina(self, solicitudes_db, hay_mas: bool, ahora: datetime) -> Tuple[list[SolicitudDTO], Optional[str]]:
+        # 2. Mapear a DTOs con el Semáforo (VERDE/AMBAR/ROJO) derivado de slaObjetivo
         dto_list = []
         for sol in solicitudes_db:
-            semaforo = "ROJO" if sol.slaObjetivo < datetime.now() else "VERDE"
+            semaforo = clasificar_semaforo(sol.slaObjetivo, ahora)
             
             dto = SolicitudDTO(
                 id=sol.idSolicitud,
@@ -40,11 +81,14 @@ class BandejaAprobacionFacade:
             )
             dto_list.append(dto)
 
-        # 3. Lógica de Ordenamiento del Negocio (Primero Urgentes, luego por fecha de SLA)
-        # Priority mapping: ALTA = 1, NORMAL = 2, BAJA = 3
-        priority_order = {"ALTA": 1, "NORMAL": 2, "BAJA": 3}
-        
-        # Ordenamos la lista DTO antes de enviarla
-        dto_list.sort(key=lambda x: (priority_order.get(x.prioridad, 99), x.semaforo_sla == "VERDE"))
+        # 3. Cursor de la siguiente página: clave keyset del último elemento entregado
+        siguiente_cursor = None
+        if hay_mas and solicitudes_db:
+            ultima = solicitudes_db[-1]
+            siguiente_cursor = codificar_cursor(
+                solicitud_repository.PRIORIDAD_RANGO.get(ultima.prioridad, solicitud_repository.RANGO_SIN_PRIORIDAD),
+                ultima.slaObjetivo,
+                ultima.idSolicitud
+            )
 
-        return dto_list
\ No newline at end of file
+        return dto_list, siguiente_cursor
@@ -0,0 +1,273 @@
+"""
+Capa de Servicios: Escritor Asíncrono de la Bitácora de Auditoría.
+Desacopla el registro en 'log_auditoria' de las transacciones de negocio: las
+peticiones solo encolan el evento en memoria (cola acotada) y un hilo de fondo
+lo persiste con INSERT multi-fila cada N eventos o cada T milisegundos.
+Si la cola se llena, el evento pasa a un desborde en memoria que el hilo de
+fondo vuelca al spool local (NDJSON con fsync); si la base de datos falla, el
+lote va al mismo spool. El spool se reprocesa en el siguiente vaciado exitoso,
+de modo que la auditoría no se pierde y ninguna petición hace E/S de archivos.
+El desborde está acotado: si también se llena, el evento se descarta y se
+cuenta. Las líneas ilegibles del spool (ej. la última, truncada por un corte)
+se apartan a un archivo de cuarentena en lugar de bloquear el reproceso.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.domain.models import LogAuditoria
+
+logger = logging.getLogger(__name__)
+
+USUARIO_POR_DEFECTO = "Sistema/Admin"
+
+# Longitudes de las columnas de log_auditoria
+_MAX_USUARIO = LogAuditoria.__table__.c.usuario.type.length
+_MAX_ENDPOINT = LogAuditoria.__table__.c.endpoint.type.length
+
+
+class EscritorAuditoria:
+    """Cola acotada + desborde en memoria + hilo vaciador por lotes + spool durable como respaldo."""
+
+    def __init__(self, tamano_lote: int = settings.AUDITORIA_TAMANO_LOTE,
+                 intervalo_ms: int = settings.AUDITORIA_INTERVALO_MS,
+                 capacidad: int = settings.AUDITORIA_CAPACIDAD_COLA,
+                 ruta_spool: str = settings.AUDITORIA_SPOOL_RUTA,
+                 capacidad_desborde: int = settings.AUDITORIA_CAPACIDAD_DESBORDE):
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo_ms / 1000
+        self.ruta_spool = ruta_spool
+        self.ruta_cuarentena = ruta_spool + ".corrupto"
+        self._cola = queue.Queue(maxsize=capacidad)
+        # append() es O(1) y sin E/S; solo el hilo de fondo lo vuelca al spool
+        self._desborde = deque(maxlen=capacidad_desborde)
+        self._motor: Optional[Engine] = None
+        self._hilo: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+        self._candado_spool = threading.Lock()
+        self._candado_metricas = threading.Lock()
+        self.encolados = 0
+        self.escritos = 0
+        self.enviados_a_spool = 0
+        self.reprocesados = 0
+        self.fallos = 0
+        self.descartados = 0
+        self.en_cuarentena = 0
+        self._descartados_avisados = 0
+
+    # --- Ciclo de vida -------------------------------------------------------
+
+    def iniciar(self, motor: Engine):
+        """Vincula el motor de base de datos y arranca el hilo vaciador."""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._motor = motor
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="escritor-auditoria", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0):
+        """Detiene el hilo tras persistir los eventos pendientes en la cola."""
+        if self._hilo is None:
+            return
+        self._detener.set()
+        self._hilo.join(timeout)
+        self._hilo = None
+        self.vaciar()
+
+    # --- Productores ---------------------------------------------------------
+
+    def registrar(self, endpoint: str, usuario: Optional[str] = None, timestamp: Optional[datetime] = None):
+        """
+        Encola un evento de auditoría sin tocar la base de datos ni el disco: el
+        middleware lo llama desde el event loop. Nunca bloquea: si la cola está
+        llena el evento queda en el desborde y el hilo de fondo lo lleva al spool;
+        si el desborde también está lleno, el evento se descarta y se cuenta.
+        """
+        evento = {
+            "usuario": (usuario or USUARIO_POR_DEFECTO)[:_MAX_USUARIO],
+            "endpoint": endpoint[:_MAX_ENDPOINT],
+            "timestamp": timestamp or datetime.now()
+        }
+        try:
+            self._cola.put_nowait(evento)
+        except queue.Full:
+            if len(self._desborde) < self._desborde.maxlen:
+                self._desborde.append(evento)
+            else:
+                with self._candado_metricas:
+                    self.descartados += 1
+            return
+        with self._candado_metricas:
+            self.encolados += 1
+
+    # --- Consumidor ----------------------------------------------------------
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            try:
+                lote = self._tomar_lote(bloquear=True)
+                self._volcar_desborde()
+                if lote:
+                    self._persistir(lote)
+            except Exception:
+                logger.exception("Error en el escritor de auditoría; se reintenta en el siguiente ciclo.")
+                self._detener.wait(self.intervalo)
+
+    def _tomar_lote(self, bloquear: bool) -> List[dict]:
+        """Extrae hasta 'tamano_lote' eventos; espera como máximo un intervalo por el primero."""
+        lote = []
+        try:
+            lote.append(self._cola.get(timeout=self.intervalo) if bloquear else self._cola.get_nowait())
+            while len(lote) < self.tamano_lote:
+                lote.append(self._cola.get_nowait())
+        except queue.Empty:
+            pass
+        return lote
+
+    def vaciar(self):
+        """Persiste de forma síncrona todo lo encolado (cierre del servicio y pruebas)."""
+        self._volcar_desborde()
+        while True:
+            lote = self._tomar_lote(bloquear=False)
+            if not lote:
+                break
+            self._persistir(lote)
+
+    def _persistir(self, lote: List[dict]):
+        try:
+            self._insertar(lote)
+        except SQLAlchemyError:
+            logger.exception("No se pudo escribir la bitácora; %s eventos enviados al spool.", len(lote))
+            with self._candado_metricas:
+                self.fallos += 1
+            self._escribir_spool(lote)
+            return
+        with self._candado_metricas:
+            self.escritos += len(lote)
+        self._reprocesar_spool()
+
+    def _insertar(self, lote: List[dict]):
+        if self._motor is None:
+            raise SQLAlchemyError("Escritor de auditoría sin motor de base de datos.")
+        with self._motor.begin() as conn:
+            conn.execute(insert(LogAuditoria.__table__), lote)
+
+    # --- Spool durable -------------------------------------------------------
+
+    def _escribir_spool(self, eventos: List[dict]):
+        lineas = "".join(
+            json.dumps({**e, "timestamp": e["timestamp"].isoformat()}, ensure_ascii=False) + "\n"
+            for e in eventos
+        )
+        with self._candado_spool:
+            with open(self.ruta_spool, "a", encoding="utf-8") as archivo:
+                archivo.write(lineas)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+        with self._candado_metricas:
+            self.enviados_a_spool += len(eventos)
+
+    def _volcar_desborde(self):
+        """Lleva al spool los eventos que no cupieron en la cola (solo desde el hilo de fondo o el cierre)."""
+        eventos = []
+        while True:
+            try:
+                eventos.append(self._desborde.popleft())
+            except IndexError:
+                break
+        if eventos:
+            self._escribir_spool(eventos)
+        with self._candado_metricas:
+            nuevos, self._descartados_avisados = self.descartados - self._descartados_avisados, self.descartados
+        if nuevos:
+            logger.warning("Desborde de auditoría lleno: %s eventos descartados.", nuevos)
+
+    def _leer_spool(self, archivo, corruptas: List[str]) -> Iterator[List[dict]]:
+        """
+        Recorre el spool línea a línea y lo entrega en bloques de 'tamano_lote'
+        eventos. Las líneas ilegibles se acumulan en 'corruptas' y se omiten.
+        """
+        bloque = []
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            try:
+                evento = json.loads(linea)
+                evento = {
+                    "usuario": evento["usuario"],
+                    "endpoint": evento["endpoint"],
+                    "timestamp": datetime.fromisoformat(evento["timestamp"])
+                }
+            except (ValueError, KeyError, TypeError):
+                corruptas.append(linea if linea.endswith("\n") else linea + "\n")
+                continue
+            bloque.append(evento)
+            if len(bloque) == self.tamano_lote:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
+
+    def _reprocesar_spool(self):
+        """
+        Reinserta el spool por bloques dentro de una única transacción: o se
+        confirma completo y se borra el archivo, o no se confirma nada y el
+        archivo se conserva intacto para el siguiente intento (sin duplicados).
+        Las líneas ilegibles pasan al archivo de cuarentena al confirmar.
+        """
+        total = 0
+        corruptas = []
+        with self._candado_spool:
+            if not os.path.exists(self.ruta_spool):
+                return
+            try:
+                with open(self.ruta_spool, encoding="utf-8", errors="replace") as archivo, self._motor.begin() as conn:
+                    for bloque in self._leer_spool(archivo, corruptas):
+                        conn.execute(insert(LogAuditoria.__table__), bloque)
+                        total += len(bloque)
+            except SQLAlchemyError:
+                logger.warning("Spool de auditoría pendiente: la base de datos sigue sin responder.")
+                return
+            if corruptas:
+                with open(self.ruta_cuarentena, "a", encoding="utf-8") as cuarentena:
+                    cuarentena.writelines(corruptas)
+                logger.warning("%s líneas ilegibles del spool de auditoría apartadas en %s.",
+                               len(corruptas), self.ruta_cuarentena)
+            os.remove(self.ruta_spool)
+        with self._candado_metricas:
+            self.reprocesados += total
+            self.en_cuarentena += len(corruptas)
+
+    # --- Monitoreo -----------------------------------------------------------
+
+    def instantanea(self) -> dict:
+        with self._candado_metricas:
+            return {
+                "en_cola": self._cola.qsize(),
+                "capacidad": self._cola.maxsize,
+                "en_desborde": len(self._desborde),
+                "capacidad_desborde": self._desborde.maxlen,
+                "descartados_por_desborde": self.descartados,
+                "encolados": self.encolados,
+                "escritos": self.escritos,
+                "enviados_a_spool": self.enviados_a_spool,
+                "reprocesados_desde_spool": self.reprocesados,
+                "fallos_de_escritura": self.fallos,
+                "lineas_en_cuarentena": self.en_cuarentena,
+                "activo": self._hilo is not None and self._hilo.is_alive()
+            }
+
+
+# Instancia única del proceso; main.py la arranca con el motor de la aplicación
+escritor_auditoria = EscritorAuditoria()
@@ -0,0 +1,96 @@
+"""
+Capa de Servicios: Búsqueda de Texto Completo (Strategy Pattern).
+Normaliza la consulta del aprobador en términos y la traduce a la condición y
+al puntaje de relevancia del motor disponible:
+- MySQL: índice FULLTEXT ix_solicitudes_texto con MATCH ... AGAINST en modo
+  booleano (todos los términos requeridos, coincidencia por prefijo 'term*').
+- Otros dialectos (SQLite en desarrollo y pruebas): LIKE por inicio de
+  palabra. Mismo resultado, pero recorre la tabla; no apto para producción.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import List
+
+from sqlalchemy import and_, case, or_
+from sqlalchemy.dialects.mysql import match
+
+from app.domain.models import Solicitud
+
+# Mínimo de caracteres por término (innodb_ft_min_token_size por defecto en MySQL)
+LONGITUD_MINIMA_TERMINO = 3
+MAX_TERMINOS = 8
+# Tope del desplazamiento: la búsqueda rankeada sirve para encontrar, no para recorrer
+MAX_DESPLAZAMIENTO = 1000
+
+_PALABRA = re.compile(r"\w+", re.UNICODE)
+
+
+def normalizar_terminos(texto: str) -> List[str]:
+    """
+    Extrae las palabras de la consulta (sin operadores ni comodines del
+    usuario), en minúsculas y sin repetir. Lanza ValueError si no queda
+    ningún término con la longitud mínima.
+    """
+    terminos = []
+    for palabra in _PALABRA.findall(texto.lower()):
+        palabra = palabra.strip("_")
+        if len(palabra) >= LONGITUD_MINIMA_TERMINO and palabra not in terminos:
+            terminos.append(palabra)
+    if not terminos:
+        raise ValueError(f"La búsqueda requiere al menos un término de {LONGITUD_MINIMA_TERMINO} caracteres.")
+    return terminos[:MAX_TERMINOS]
+
+
+class MotorBusqueda(ABC):
+    """Contrato: condición WHERE y expresión de relevancia para unos términos ya normalizados."""
+
+    columnas = (Solicitud.solicitante, Solicitud.tipoSolicitud, Solicitud.descripcion)
+
+    @abstractmethod
+    def condicion(self, terminos: List[str]):
+        pass
+
+    @abstractmethod
+    def relevancia(self, terminos: List[str]):
+        pass
+
+
+class MotorFulltextMySQL(MotorBusqueda):
+    """MATCH ... AGAINST ('+term1* +term2*' IN BOOLEAN MODE) sobre ix_solicitudes_texto."""
+
+    def _coincidencia(self, terminos: List[str]):
+        consulta = " ".join(f"+{termino}*" for termino in terminos)
+        return match(*self.columnas, against=consulta).in_boolean_mode()
+
+    def condicion(self, terminos: List[str]):
+        return self._coincidencia(terminos)
+
+    def relevancia(self, terminos: List[str]):
+        return self._coincidencia(terminos)
+
+
+class MotorPatronLike(MotorBusqueda):
+    """
+    Respaldo portable: cada término debe aparecer al inicio de alguna palabra
+    de alguna columna; la relevancia cuenta las columnas en que aparece.
+    """
+
+    @staticmethod
+    def _en_columna(columna, termino: str):
+        return or_(
+            columna.istartswith(termino, autoescape=True),
+            columna.icontains(f" {termino}", autoescape=True)
+        )
+
+    def condicion(self, terminos: List[str]):
+        return and_(*(or_(*(self._en_columna(c, t) for c in self.columnas)) for t in terminos))
+
+    def relevancia(self, terminos: List[str]):
+        return sum(case((self._en_columna(c, t), 1), else_=0) for t in terminos for c in self.columnas)
+
+
+def motor_para_dialecto(nombre_dialecto: str) -> MotorBusqueda:
+    """Factory: FULLTEXT nativo en MySQL/MariaDB, LIKE en el resto."""
+    if nombre_dialecto in ("mysql", "mariadb"):
+        return MotorFulltextMySQL()
+    return MotorPatronLike()
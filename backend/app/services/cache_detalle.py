@@ -0,0 +1,210 @@
+"""
+Capa de Servicios: Caché de Lectura del Detalle Consolidado (Read-Through).
+Guarda el detalle ya serializado (CU-05) indexado por id y versión, para que
+reabrir la misma solicitud no repita las consultas de estado e historial.
+
+La invalidación es exacta: cada transición publicada por solicitud_repository
+(bus de eventos) avanza la versión de las solicitudes afectadas, por lo que una
+lectura que compita con la escritura nunca deja visible un detalle obsoleto (se
+guarda bajo la versión anterior, que ya nadie consulta). El TTL es solo una red
+de seguridad para cambios hechos fuera de la API.
+
+Backends intercambiables (CACHE_DETALLE_BACKEND):
+- 'memoria': LRU + TTL por proceso; la versión es la del ETag de detalle.
+- 'redis': compartida entre workers; la versión es un contador en Redis.
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.config import settings
+from app.services.eventos import (
+    ADJUNTO_AGREGADO, SOLICITUDES_ARCHIVADAS, SOLICITUDES_TRANSICIONADAS, BusEventos, bus_eventos
+)
+from app.services.versiones_bandeja import VersionesBandeja, versiones_bandeja
+
+
+class BackendCacheDetalle(ABC):
+    """Contrato de almacenamiento: versión por solicitud y payload por (id, versión)."""
+
+    @abstractmethod
+    def version(self, id_solicitud: int) -> str:
+        pass
+
+    @abstractmethod
+    def leer(self, id_solicitud: int, version: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    def guardar(self, id_solicitud: int, version: str, payload: dict):
+        pass
+
+    @abstractmethod
+    def invalidar(self, id_solicitud: int):
+        pass
+
+    @abstractmethod
+    def entradas(self) -> Optional[int]:
+        """Entradas guardadas, o None si el backend no puede contarlas sin recorrerlas."""
+
+
+class CacheMemoriaLRU(BackendCacheDetalle):
+    """Una entrada por solicitud (versión, payload, expiración) en orden LRU."""
+
+    def __init__(self, capacidad: int = settings.CACHE_DETALLE_CAPACIDAD,
+                 ttl_seg: int = settings.CACHE_DETALLE_TTL_SEG,
+                 versiones: VersionesBandeja = versiones_bandeja):
+        self.capacidad = capacidad
+        self.ttl_seg = ttl_seg
+        self.versiones = versiones
+        self.expulsiones = 0
+        self._candado = threading.Lock()
+        self._entradas: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def version(self, id_solicitud: int) -> str:
+        return self.versiones.version_detalle(id_solicitud)
+
+    def leer(self, id_solicitud: int, version: str) -> Optional[dict]:
+        with self._candado:
+            entrada = self._entradas.get(id_solicitud)
+            if entrada is None:
+                return None
+            version_guardada, payload, expira = entrada
+            if version_guardada != version or expira <= time.monotonic():
+                del self._entradas[id_solicitud]
+                return None
+            self._entradas.move_to_end(id_solicitud)
+            return payload
+
+    def guardar(self, id_solicitud: int, version: str, payload: dict):
+        with self._candado:
+            self._entradas[id_solicitud] = (version, payload, time.monotonic() + self.ttl_seg)
+            self._entradas.move_to_end(id_solicitud)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+
+    def invalidar(self, id_solicitud: int):
+        # La versión ya avanzó en versiones_bandeja: aquí solo se libera memoria
+        with self._candado:
+            self._entradas.pop(id_solicitud, None)
+
+    def entradas(self) -> int:
+        return len(self._entradas)
+
+
+class CacheRedis(BackendCacheDetalle):
+    """Claves 'detalle:v:{id}' (contador) y 'detalle:{id}:{version}' (JSON con TTL)."""
+
+    def __init__(self, url: str = settings.CACHE_DETALLE_URL, ttl_seg: int = settings.CACHE_DETALLE_TTL_SEG):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_DETALLE_BACKEND=redis requiere 'pip install redis'.") from e
+        self.ttl_seg = ttl_seg
+        self._cliente = redis.Redis.from_url(url)
+
+    def version(self, id_solicitud: int) -> str:
+        valor = self._cliente.get(f"detalle:v:{id_solicitud}")
+        return valor.decode() if valor else "0"
+
+    def leer(self, id_solicitud: int, version: str) -> Optional[dict]:
+        valor = self._cliente.get(f"detalle:{id_solicitud}:{version}")
+        return json.loads(valor) if valor else None
+
+    def guardar(self, id_solicitud: int, version: str, payload: dict):
+        self._cliente.setex(f"detalle:{id_solicitud}:{version}", self.ttl_seg, json.dumps(payload))
+
+    def invalidar(self, id_solicitud: int):
+        # El contador es compartido: la escritura de un worker invalida a todos
+        self._cliente.incr(f"detalle:v:{id_solicitud}")
+
+    def entradas(self) -> Optional[int]:
+        # Contarlas exige recorrer el keyspace (SCAN) y un contador propio se
+        # desviaría con cada expiración por TTL: Redis expone su propio INFO keyspace
+        return None
+
+
+class CacheDetalle:
+    """Read-through sobre el backend elegido, con métricas de aciertos y fallos."""
+
+    def __init__(self, backend: Optional[BackendCacheDetalle], bus: BusEventos = bus_eventos):
+        self.backend = backend
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        if backend is not None:
+            bus.suscribir(SOLICITUDES_TRANSICIONADAS, self._al_transicionar)
+            bus.suscribir(ADJUNTO_AGREGADO, self._al_agregar_adjunto)
+            bus.suscribir(SOLICITUDES_ARCHIVADAS, self._al_archivar)
+
+    def version(self, id_solicitud: int) -> Optional[str]:
+        """Se toma antes de consultar la base: una transición concurrente deja la carga obsoleta bajo esta versión."""
+        return self.backend.version(id_solicitud) if self.backend is not None else None
+
+    def leer(self, id_solicitud: int, version: Optional[str]) -> Optional[dict]:
+        if self.backend is None:
+            return None
+        payload = self.backend.leer(id_solicitud, version)
+        if payload is None:
+            self.fallos += 1
+        else:
+            self.aciertos += 1
+        return payload
+
+    def guardar(self, id_solicitud: int, version: Optional[str], payload: dict):
+        if self.backend is not None:
+            self.backend.guardar(id_solicitud, version, payload)
+
+    def obtener(self, id_solicitud: int, cargar: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """Devuelve el payload en caché o lo carga y guarda; None (no encontrada) no se guarda."""
+        version = self.version(id_solicitud)
+        payload = self.leer(id_solicitud, version)
+        if payload is None:
+            payload = cargar()
+            if payload is not None:
+                self.guardar(id_solicitud, version, payload)
+        return payload
+
+    def _al_transicionar(self, ids, estado, origen=None):
+        for id_solicitud in ids:
+            self.backend.invalidar(id_solicitud)
+        self.invalidaciones += len(ids)
+
+    def _al_agregar_adjunto(self, id, sha256):
+        self.backend.invalidar(id)
+        self.invalidaciones += 1
+
+    def _al_archivar(self, ids):
+        for id_solicitud in ids:
+            self.backend.invalidar(id_solicitud)
+        self.invalidaciones += len(ids)
+
+    def instantanea(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else None,
+            "invalidaciones": self.invalidaciones,
+            "expulsiones": getattr(self.backend, "expulsiones", None),
+            "entradas": self.backend.entradas() if self.backend is not None else 0,
+        }
+
+
+def crear_backend(tipo: str = settings.CACHE_DETALLE_BACKEND) -> Optional[BackendCacheDetalle]:
+    if tipo == "memoria":
+        return CacheMemoriaLRU()
+    if tipo == "redis":
+        return CacheRedis()
+    if tipo == "ninguna":
+        return None
+    raise ValueError(f"Backend de caché de detalle desconocido: {tipo}")
+
+
+# Instancia única del proceso
+cache_detalle = CacheDetalle(crear_backend())
@@ -0,0 +1,170 @@
+"""
+Capa de Servicios: Calendario Laboral para el cálculo de SLA.
+Modela la jornada de atención (días laborables, tramos horarios y feriados) y
+suma horas hábiles a un instante. Por cada año se precalcula una tabla con los
+tramos laborables y sus segundos hábiles acumulados; sumar horas se reduce a
+dos búsquedas binarias (bisect), O(log n) por solicitud aun en cargas masivas.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+# Feriados nacionales de fecha fija del Perú (mes, día)
+FERIADOS_FIJOS = (
+    (1, 1),    # Año Nuevo
+    (5, 1),    # Día del Trabajo
+    (6, 7),    # Batalla de Arica y Día de la Bandera
+    (6, 29),   # San Pedro y San Pablo
+    (7, 23),   # Día de la Fuerza Aérea del Perú
+    (7, 28),   # Fiestas Patrias
+    (7, 29),   # Fiestas Patrias
+    (8, 6),    # Batalla de Junín
+    (8, 30),   # Santa Rosa de Lima
+    (10, 8),   # Combate de Angamos
+    (11, 1),   # Todos los Santos
+    (12, 8),   # Inmaculada Concepción
+    (12, 9),   # Batalla de Ayacucho
+    (12, 25),  # Navidad
+)
+
+
+def domingo_de_pascua(anio: int) -> date:
+    """Algoritmo anónimo gregoriano (Meeus/Jones/Butcher)."""
+    a, b, c = anio % 19, anio // 100, anio % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes = (h + l - 7 * m + 114) // 31
+    dia = (h + l - 7 * m + 114) % 31 + 1
+    return date(anio, mes, dia)
+
+
+def feriados_nacionales(anio: int) -> set:
+    """Feriados fijos más Jueves y Viernes Santo del año indicado."""
+    pascua = domingo_de_pascua(anio)
+    return {date(anio, mes, dia) for mes, dia in FERIADOS_FIJOS} | {
+        pascua - timedelta(days=3),
+        pascua - timedelta(days=2)
+    }
+
+
+def _leer_jornada(texto: str) -> List[Tuple[time, time]]:
+    """'08:00-13:00,14:00-17:00' -> [(08:00, 13:00), (14:00, 17:00)]"""
+    tramos = []
+    for tramo in filter(None, (t.strip() for t in texto.split(","))):
+        inicio, fin = (time.fromisoformat(valor.strip()) for valor in tramo.split("-"))
+        if fin <= inicio:
+            raise ValueError(f"Tramo de jornada inválido: {tramo}")
+        tramos.append((inicio, fin))
+    return sorted(tramos)
+
+
+@dataclass(frozen=True)
+class _TablaAnual:
+    """Tramos laborables de un año con sus segundos hábiles acumulados."""
+    inicios: List[datetime]
+    fines: List[datetime]
+    acumulado: List[float]  # segundos hábiles antes de cada tramo
+    total: float
+
+    def desplazamiento(self, instante: datetime) -> float:
+        """Segundos hábiles transcurridos del año hasta 'instante'."""
+        i = bisect_right(self.inicios, instante) - 1
+        if i < 0:
+            return 0.0
+        return self.acumulado[i] + min((instante - self.inicios[i]).total_seconds(),
+                                       (self.fines[i] - self.inicios[i]).total_seconds())
+
+    def instante(self, desplazamiento: float) -> datetime:
+        """Inverso de desplazamiento: si cae en el borde de un tramo devuelve su cierre."""
+        i = max(bisect_left(self.acumulado, desplazamiento) - 1, 0)
+        return self.inicios[i] + timedelta(seconds=desplazamiento - self.acumulado[i])
+
+
+class CalendarioLaboral:
+    """
+    Jornada de atención configurable. Las tablas anuales se construyen al primer
+    uso de cada año y se conservan en memoria (unos pocos cientos de tramos).
+    """
+
+    def __init__(self, jornada: Iterable[Tuple[time, time]], dias_laborables: Iterable[int] = (0, 1, 2, 3, 4),
+                 feriados_extra: Iterable[date] = (), incluir_feriados_nacionales: bool = True):
+        self.jornada = list(jornada)
+        self.dias_laborables = frozenset(dias_laborables)
+        self.feriados_extra = frozenset(feriados_extra)
+        self.incluir_feriados_nacionales = incluir_feriados_nacionales
+        if not self.jornada or not self.dias_laborables:
+            raise ValueError("El calendario laboral necesita al menos un día y un tramo de atención.")
+        self.horas_jornada = sum(
+            (datetime.combine(date.min, fin) - datetime.combine(date.min, inicio)).total_seconds()
+            for inicio, fin in self.jornada
+        ) / 3600
+        self._tablas: Dict[int, _TablaAnual] = {}
+        self._candado = threading.Lock()
+
+    @classmethod
+    def desde_configuracion(cls) -> "CalendarioLaboral":
+        return cls(
+            jornada=_leer_jornada(settings.CALENDARIO_JORNADA),
+            dias_laborables=[int(d) for d in settings.CALENDARIO_DIAS_LABORABLES.split(",") if d.strip()],
+            feriados_extra=[date.fromisoformat(f.strip()) for f in settings.CALENDARIO_FERIADOS_EXTRA.split(",") if f.strip()]
+        )
+
+    def es_feriado(self, dia: date) -> bool:
+        return dia in self.feriados_extra or (self.incluir_feriados_nacionales and dia in feriados_nacionales(dia.year))
+
+    def tabla(self, anio: int) -> _TablaAnual:
+        tabla = self._tablas.get(anio)
+        if tabla is None:
+            with self._candado:
+                tabla = self._tablas.get(anio)
+                if tabla is None:
+                    tabla = self._tablas[anio] = self._construir_tabla(anio)
+        return tabla
+
+    def _construir_tabla(self, anio: int) -> _TablaAnual:
+        feriados = self.feriados_extra | (feriados_nacionales(anio) if self.incluir_feriados_nacionales else set())
+        inicios, fines, acumulado, total = [], [], [], 0.0
+        dia = date(anio, 1, 1)
+        while dia.year == anio:
+            if dia.weekday() in self.dias_laborables and dia not in feriados:
+                for inicio, fin in self.jornada:
+                    inicios.append(datetime.combine(dia, inicio))
+                    fines.append(datetime.combine(dia, fin))
+                    acumulado.append(total)
+                    total += (fines[-1] - inicios[-1]).total_seconds()
+            dia += timedelta(days=1)
+        return _TablaAnual(inicios, fines, acumulado, total)
+
+    def sumar_horas_laborables(self, desde: datetime, horas: float) -> datetime:
+        """
+        Instante en que se cumplen 'horas' hábiles contadas desde 'desde'. Si
+        'desde' cae fuera de la jornada, el conteo empieza en el siguiente tramo.
+        """
+        anio = desde.year
+        tabla = self.tabla(anio)
+        objetivo = tabla.desplazamiento(desde) + horas * 3600
+        while objetivo > tabla.total:
+            objetivo -= tabla.total
+            anio += 1
+            tabla = self.tabla(anio)
+        return tabla.instante(objetivo)
+
+
+_calendario: Optional[CalendarioLaboral] = None
+
+
+def obtener_calendario() -> CalendarioLaboral:
+    """Calendario del proceso, construido una vez desde la configuración."""
+    global _calendario
+    if _calendario is None:
+        _calendario = CalendarioLaboral.desde_configuracion()
+    return _calendario
@@ -0,0 +1,64 @@
+"""
+Capa de Servicios: Fachada del Detalle Consolidado (CU-05).
+Aplica el Patrón Facade sobre el repositorio y la caché de lectura: el
+controlador pide el detalle ya serializado y no sabe si salió de la caché o de
+las consultas de estado e historial. Una solicitud que ya pasó al archivo frío
+se lee (descomprimida) desde solicitudes_archivadas con el mismo formato.
+"""
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.repositories import archivo_repository, solicitud_repository, solicitud_repository_async
+from app.services.cache_detalle import CacheDetalle, cache_detalle
+
+
+def formatear_detalle(solicitud) -> dict:
+    """Formato de salida de CU-05 (serializable a JSON, apto para la caché)."""
+    return jsonable_encoder({
+        "id": solicitud.idSolicitud,
+        "alumno": solicitud.solicitante,
+        "tramite": solicitud.tipoSolicitud,
+        "estado_actual": solicitud.estado_actual.tipoEstado,
+        "prioridad": solicitud.prioridad,
+        "fecha_creacion": solicitud.fechaCreacion,
+        "sla_objetivo": solicitud.slaObjetivo,
+        "version": solicitud.version,  # Se reenvía en el dictamen/derivación (concurrencia optimista)
+        "adjuntos": solicitud.adjuntos or [],
+        # Mostramos el historial extrayéndolo de las tablas relacionales
+        "auditoria_decisiones": [
+            {"accion": h.accion, "comentario": h.comentario, "fecha": h.fecha, "actor": h.usuario_id}
+            for h in solicitud.historial_decisiones
+        ]
+    })
+
+
+class DetalleSolicitudFacade:
+
+    def __init__(self, db: Session, cache: CacheDetalle = cache_detalle):
+        self.db = db
+        self.cache = cache
+
+    def obtener_detalle(self, id_solicitud: int) -> Optional[dict]:
+        def cargar():
+            solicitud = solicitud_repository.obtener_detalle(self.db, id_solicitud)
+            if solicitud:
+                return formatear_detalle(solicitud)
+            return archivo_repository.obtener_archivada(self.db, id_solicitud)
+        return self.cache.obtener(id_solicitud, cargar)
+
+    async def obtener_detalle_async(self, id_solicitud: int) -> Optional[dict]:
+        """Variante para DB_MODO=async (self.db es una AsyncSession)."""
+        version = self.cache.version(id_solicitud)
+        payload = self.cache.leer(id_solicitud, version)
+        if payload is None:
+            solicitud = await solicitud_repository_async.obtener_detalle(self.db, id_solicitud)
+            if solicitud is not None:
+                payload = formatear_detalle(solicitud)
+            else:
+                payload = await self.db.run_sync(archivo_repository.obtener_archivada, id_solicitud)
+                if payload is None:
+                    return None
+            self.cache.guardar(id_solicitud, version, payload)
+        return payload
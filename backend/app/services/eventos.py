@@ -0,0 +1,55 @@
+"""
+Capa de Servicios: Bus de Eventos de Dominio (Patrón Observer).
+El repositorio publica los cambios ya confirmados (commit) y los servicios
+interesados (planificador de SLA, cachés, notificaciones) se suscriben sin que
+la capa de persistencia los conozca. La entrega es síncrona y en proceso; un
+suscriptor que falla se registra en el log sin afectar a la petición.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento publicados por solicitud_repository
+SOLICITUDES_CREADAS = "solicitudes_creadas"             # solicitudes=[(id, slaObjetivo), ...], filas=[{...}]
+SOLICITUDES_TRANSICIONADAS = "solicitudes_transicionadas" # ids=[...], estado="APROBADO", origen=ORIGEN_*
+ADJUNTO_AGREGADO = "adjunto_agregado"                   # id=..., sha256="..."
+# Publicado por el archivador: las solicitudes pasaron al archivo frío
+SOLICITUDES_ARCHIVADAS = "solicitudes_archivadas"       # ids=[...]
+
+# Origen de una transición: dictamen del Aprobador o derivación del Secretario
+ORIGEN_DICTAMEN = "dictamen"
+ORIGEN_DERIVACION = "derivacion"
+# Publicado por el planificador de SLA
+SEMAFORO_SLA_CAMBIADO = "semaforo_sla_cambiado"         # id=..., semaforo="AMBAR"|"ROJO"
+
+
+class BusEventos:
+    """Sujeto del Observer: registro de suscriptores por tipo de evento."""
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self._suscriptores: Dict[str, Tuple[Callable, ...]] = {}
+
+    def suscribir(self, tipo: str, callback: Callable):
+        with self._candado:
+            actuales = self._suscriptores.get(tipo, ())
+            if callback not in actuales:
+                self._suscriptores[tipo] = actuales + (callback,)
+
+    def desuscribir(self, tipo: str, callback: Callable):
+        with self._candado:
+            self._suscriptores[tipo] = tuple(c for c in self._suscriptores.get(tipo, ()) if c != callback)
+
+    def publicar(self, tipo: str, **datos):
+        # La tupla es inmutable: se recorre sin bloquear a quien se suscribe en paralelo
+        for callback in self._suscriptores.get(tipo, ()):
+            try:
+                callback(**datos)
+            except Exception:
+                logger.exception("Suscriptor de '%s' falló.", tipo)
+
+
+# Instancia única del proceso
+bus_eventos = BusEventos()
@@ -0,0 +1,60 @@
+"""
+Capa de Servicios: Exportación en Streaming del Historial.
+Serializa los bloques keyset del repositorio como NDJSON o CSV a medida que se
+leen, para alimentar un StreamingResponse sin materializar el historial completo.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+from sqlalchemy.orm import Session
+
+from app.repositories import solicitud_repository
+
+COLUMNAS = ["id", "tramite", "estado_final", "alumno", "fecha_decision"]
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _serializar_valor(valor):
+    return valor.isoformat() if isinstance(valor, datetime) else valor
+
+
+def _como_ndjson(bloques: Iterable[List[dict]]) -> Iterator[str]:
+    for bloque in bloques:
+        yield "".join(
+            json.dumps({k: _serializar_valor(v) for k, v in fila.items()}, ensure_ascii=False) + "\n"
+            for fila in bloque
+        )
+
+
+def _como_csv(bloques: Iterable[List[dict]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=COLUMNAS)
+    escritor.writeheader()
+    for bloque in bloques:
+        escritor.writerows({k: _serializar_valor(v) for k, v in fila.items()} for fila in bloque)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def exportar_historial(db: Session, formato: str, estados=None, desde=None, hasta=None) -> Iterator[str]:
+    """
+    Generador del cuerpo de la exportación. Usa una sesión propia sobre el mismo
+    motor, ya que el stream se consume después de que el endpoint retorna.
+    """
+    sesion = Session(bind=db.get_bind())
+    try:
+        bloques = solicitud_repository.iterar_historial(sesion, estados=estados, desde=desde, hasta=hasta)
+        serializador = _como_csv if formato == "csv" else _como_ndjson
+        yield from serializador(bloques)
+    finally:
+        sesion.close()
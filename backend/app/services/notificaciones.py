@@ -0,0 +1,242 @@
+"""
+Capa de Servicios: Notificaciones en Vivo de la Bandeja (Pub/Sub).
+Traduce los eventos de dominio del bus (altas, derivaciones, dictámenes y
+cambios de semáforo) a cambios incrementales para los clientes suscritos al
+stream SSE, de modo que la bandeja deje de sondear la base de datos.
+
+El broker es intercambiable (BROKER_NOTIFICACIONES):
+- 'memoria': pub/sub en proceso, con un historial corto para reanudar un
+  stream cortado (Last-Event-ID). Suficiente con un solo worker. Los ids
+  parten del instante de arranque, así un id de un proceso anterior nunca
+  coincide con uno vigente y el cliente se resincroniza tras un reinicio.
+- 'redis': canal Pub/Sub compartido entre workers (requiere 'pip install redis').
+  La publicación corre en un hilo propio: nunca bloquea el event loop.
+Un cliente que pierde eventos (cola llena o historial agotado) recibe
+'resincronizar' y debe volver a descargar la bandeja. Las altas viajan con su
+fila de bandeja (hasta FILAS_POR_EVENTO) para que el cliente la inserte sin
+recargar; una carga masiva mayor solo envía los ids.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from app.config import settings
+from app.domain.enums import EstadoSolicitud
+from app.services.eventos import (
+    SEMAFORO_SLA_CAMBIADO, SOLICITUDES_CREADAS, SOLICITUDES_TRANSICIONADAS, BusEventos, bus_eventos
+)
+from app.services.planificador_sla import clasificar_semaforo
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento del stream
+EVENTO_CREADA = "creada"
+EVENTO_RESINCRONIZAR = "resincronizar"
+EVENTOS_SEMAFORO = {"AMBAR": "sla_por_vencer", "ROJO": "sla_vencido"}
+
+TAMANO_COLA_CLIENTE = 1000
+TAMANO_HISTORIAL = 1000
+RECONEXION_MS = 3000
+FILAS_POR_EVENTO = 50
+
+
+class BrokerNotificaciones(ABC):
+    """Contrato del broker: publicar desde cualquier hilo y suscribirse desde el event loop."""
+
+    @abstractmethod
+    def publicar(self, tipo: str, datos: dict):
+        pass
+
+    @abstractmethod
+    def suscribir(self, ultimo_id: Optional[int] = None) -> AsyncIterator[dict]:
+        pass
+
+
+class _Suscriptor:
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=TAMANO_COLA_CLIENTE)
+
+    def entregar(self, evento: dict):
+        """Se ejecuta en el event loop del cliente. Un cliente lento se resincroniza."""
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            while not self.cola.empty():
+                self.cola.get_nowait()
+            self.cola.put_nowait({"id": evento["id"], "tipo": EVENTO_RESINCRONIZAR, "datos": {}})
+
+
+class BrokerMemoria(BrokerNotificaciones):
+
+    def __init__(self, tamano_historial: int = TAMANO_HISTORIAL, primer_id: Optional[int] = None):
+        self._candado = threading.Lock()
+        # Microsegundos desde epoch al arrancar: mayor que cualquier id emitido
+        # por el proceso anterior (salvo más de un evento por µs de vida)
+        self._siguiente_id = primer_id if primer_id is not None else time.time_ns() // 1000
+        self._historial = deque(maxlen=tamano_historial)
+        self._suscriptores = set()
+
+    def publicar(self, tipo: str, datos: dict):
+        with self._candado:
+            evento = {"id": self._siguiente_id, "tipo": tipo, "datos": datos}
+            self._siguiente_id += 1
+            self._historial.append(evento)
+            suscriptores = list(self._suscriptores)
+        for suscriptor in suscriptores:
+            try:
+                # Thread-safe: los escritores corren en el threadpool o en el propio loop
+                suscriptor.loop.call_soon_threadsafe(suscriptor.entregar, evento)
+            except RuntimeError:
+                pass  # Loop cerrado: el suscriptor se retira al salir de suscribir()
+
+    async def suscribir(self, ultimo_id: Optional[int] = None) -> AsyncIterator[dict]:
+        suscriptor = _Suscriptor(asyncio.get_running_loop())
+        with self._candado:
+            self._suscriptores.add(suscriptor)
+            pendientes = self._reanudar(ultimo_id)
+        try:
+            for evento in pendientes:
+                yield evento
+            while True:
+                yield await suscriptor.cola.get()
+        finally:
+            with self._candado:
+                self._suscriptores.discard(suscriptor)
+
+    def _reanudar(self, ultimo_id: Optional[int]) -> list:
+        """
+        Eventos posteriores a 'ultimo_id' si siguen en el historial. Se pide
+        resincronizar si el historial ya no los alcanza o si el id no pertenece
+        a este proceso (emitido por un proceso anterior o adelantado a la
+        secuencia): el cliente pudo perder cambios durante el corte.
+        """
+        if ultimo_id is None:
+            return []
+        primero = self._historial[0]["id"] if self._historial else self._siguiente_id
+        if ultimo_id + 1 < primero or ultimo_id >= self._siguiente_id:
+            return [{"id": self._siguiente_id - 1, "tipo": EVENTO_RESINCRONIZAR, "datos": {}}]
+        return [evento for evento in self._historial if evento["id"] > ultimo_id]
+
+
+class BrokerRedis(BrokerNotificaciones):
+    """Pub/Sub de Redis: todos los workers publican y escuchan el mismo canal."""
+
+    CANAL = "campus360:bandeja"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+            import redis.asyncio as redis_async
+        except ImportError as e:
+            raise RuntimeError("BROKER_NOTIFICACIONES=redis requiere 'pip install redis'.") from e
+        self._url = url
+        self._cliente = redis.Redis.from_url(url)
+        self._redis_async = redis_async
+        # Un único hilo: las llamadas a Redis no bloquean al publicador (que puede
+        # ser el event loop en modo async) y los eventos salen en orden de publicación
+        self._publicador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broker-redis")
+
+    def publicar(self, tipo: str, datos: dict):
+        self._publicador.submit(self._enviar, tipo, datos)
+
+    def _enviar(self, tipo: str, datos: dict):
+        try:
+            # La secuencia global (INCR) permite a los clientes detectar huecos
+            evento = {"id": self._cliente.incr(f"{self.CANAL}:secuencia"), "tipo": tipo, "datos": datos}
+            self._cliente.publish(self.CANAL, json.dumps(evento))
+        except Exception:
+            logger.exception("No se pudo publicar '%s' en Redis.", tipo)
+
+    async def suscribir(self, ultimo_id: Optional[int] = None) -> AsyncIterator[dict]:
+        cliente = self._redis_async.Redis.from_url(self._url)
+        canal = cliente.pubsub()
+        await canal.subscribe(self.CANAL)
+        try:
+            if ultimo_id is not None:
+                # Sin historial en Pub/Sub: el cliente debe recargar lo perdido
+                yield {"id": ultimo_id, "tipo": EVENTO_RESINCRONIZAR, "datos": {}}
+            async for mensaje in canal.listen():
+                if mensaje["type"] == "message":
+                    yield json.loads(mensaje["data"])
+        finally:
+            await canal.unsubscribe(self.CANAL)
+            await cliente.aclose()
+
+
+def crear_broker(tipo: str = settings.BROKER_NOTIFICACIONES) -> BrokerNotificaciones:
+    if tipo == "memoria":
+        return BrokerMemoria()
+    if tipo == "redis":
+        return BrokerRedis(settings.BROKER_URL)
+    raise ValueError(f"Broker de notificaciones desconocido: {tipo}")
+
+
+class PuenteNotificaciones:
+    """Adaptador del bus de dominio (Observer) hacia el broker del stream."""
+
+    def __init__(self, broker: BrokerNotificaciones, bus: BusEventos = bus_eventos):
+        self.broker = broker
+        bus.suscribir(SOLICITUDES_CREADAS, self._al_crear)
+        bus.suscribir(SOLICITUDES_TRANSICIONADAS, self._al_transicionar)
+        bus.suscribir(SEMAFORO_SLA_CAMBIADO, self._al_cambiar_semaforo)
+
+    def _al_crear(self, solicitudes, filas: Optional[List[dict]] = None):
+        datos = {"ids": [id_solicitud for id_solicitud, _ in solicitudes], "estado": EstadoSolicitud.PENDIENTE.value}
+        if filas and len(filas) <= FILAS_POR_EVENTO:
+            ahora = datetime.now()
+            # Misma forma que SolicitudDTO, con el semáforo calculado al publicar
+            datos["filas"] = [
+                {**{k: v for k, v in fila.items() if k != "sla_objetivo"},
+                 "semaforo_sla": clasificar_semaforo(fila["sla_objetivo"], ahora)}
+                for fila in filas
+            ]
+        self.broker.publicar(EVENTO_CREADA, datos)
+
+    def _al_transicionar(self, ids, estado, origen=None):
+        # origen: 'dictamen' (Aprobador) o 'derivacion' (Secretario)
+        self.broker.publicar(origen or "transicion", {"ids": list(ids), "estado": estado})
+
+    def _al_cambiar_semaforo(self, id, semaforo):
+        self.broker.publicar(EVENTOS_SEMAFORO.get(semaforo, "sla"), {"id": id, "semaforo": semaforo})
+
+
+async def flujo_sse(broker: BrokerNotificaciones, ultimo_id: Optional[int] = None,
+                    latido_seg: float = settings.STREAM_LATIDO_SEG) -> AsyncIterator[str]:
+    """
+    Serializa la suscripción en formato text/event-stream ('id', 'event', 'data').
+    Sin eventos durante 'latido_seg' se envía un comentario para que los proxies
+    no corten la conexión; el navegador reenvía el último id como Last-Event-ID.
+    """
+    yield f"retry: {RECONEXION_MS}\n\n"
+    eventos = broker.suscribir(ultimo_id).__aiter__()
+    siguiente = asyncio.ensure_future(eventos.__anext__())
+    try:
+        while True:
+            listos, _ = await asyncio.wait({siguiente}, timeout=latido_seg)
+            if not listos:
+                yield ": latido\n\n"
+                continue
+            evento = siguiente.result()
+            siguiente = asyncio.ensure_future(eventos.__anext__())
+            yield f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {json.dumps(evento['datos'])}\n\n"
+    finally:
+        # El generador no admite aclose() mientras __anext__ siga en curso
+        siguiente.cancel()
+        with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+            await siguiente
+        await eventos.aclose()
+
+
+# Instancias únicas del proceso
+broker_notificaciones = crear_broker()
+puente_notificaciones = PuenteNotificaciones(broker_notificaciones)
@@ -0,0 +1,31 @@
+"""
+Capa de Servicios: Paginación por Cursor (Keyset Pagination).
+Codifica la última clave entregada al cliente en un token opaco, de modo que
+la siguiente página se resuelva con un rango indexado en lugar de un OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+LIMITE_POR_DEFECTO = 50
+LIMITE_MAXIMO = 200
+
+
+def codificar_cursor(rango: int, sla: datetime, id_solicitud: int) -> str:
+    """Serializa la clave (rango de prioridad, slaObjetivo, idSolicitud) como token URL-safe."""
+    crudo = json.dumps([rango, sla.isoformat(), id_solicitud], separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[int, datetime, int]:
+    """
+    Reconstruye la clave keyset a partir del token recibido.
+    Lanza ValueError si el cursor fue manipulado o no tiene el formato esperado.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        rango, sla, id_solicitud = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return int(rango), datetime.fromisoformat(sla), int(id_solicitud)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Cursor de paginación inválido.") from e
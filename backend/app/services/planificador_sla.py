@@ -0,0 +1,203 @@
+"""
+Capa de Servicios: Planificador del Semáforo de SLA.
+Mantiene un min-heap con los próximos cambios de semáforo (VERDE -> AMBAR ->
+ROJO) de las solicitudes abiertas y, en un hilo de fondo, publica cada
+transición en el bus de eventos cuando llega su instante, sin recorrer la
+bandeja. Para acotar la memoria, solo se cargan los vencimientos de la ventana
+siguiente (índice ix_solicitudes_sla) y la ventana avanza con el reloj; las
+altas y cierres posteriores llegan por el bus (Observer).
+
+El semáforo de cada fila y los filtros de la bandeja se derivan de slaObjetivo
+con las mismas reglas (clasificar_semaforo / rango_filtro_sla), por lo que
+cualquier worker obtiene el mismo resultado sin estado compartido.
+"""
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.domain.enums import SemaforoSla
+from app.repositories import solicitud_repository
+from app.services.eventos import (
+    SEMAFORO_SLA_CAMBIADO, SOLICITUDES_CREADAS, SOLICITUDES_TRANSICIONADAS, BusEventos, bus_eventos
+)
+
+logger = logging.getLogger(__name__)
+
+# Filtros de la bandeja por urgencia
+FILTRO_VENCIDAS = "vencidas"
+FILTRO_POR_VENCER = "por_vencer"
+FILTROS_SLA = (FILTRO_VENCIDAS, FILTRO_POR_VENCER)
+
+_ESTADOS_ABIERTOS = {e.value for e in solicitud_repository.ESTADOS_BANDEJA}
+
+
+def clasificar_semaforo(sla_objetivo: datetime, ahora: datetime,
+                        umbral_horas: int = settings.SLA_UMBRAL_AMBAR_HORAS) -> str:
+    """ROJO si el SLA venció, AMBAR si vence dentro del umbral, VERDE en otro caso."""
+    if sla_objetivo < ahora:
+        return SemaforoSla.ROJO.value
+    if sla_objetivo < ahora + timedelta(hours=umbral_horas):
+        return SemaforoSla.AMBAR.value
+    return SemaforoSla.VERDE.value
+
+
+def rango_filtro_sla(filtro: str, ahora: datetime,
+                     horas: int = settings.SLA_UMBRAL_AMBAR_HORAS) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Traduce el filtro de urgencia a un rango semiabierto [desde, hasta) sobre
+    slaObjetivo, resoluble con el índice de la bandeja:
+    - 'vencidas': slaObjetivo < ahora
+    - 'por_vencer': ahora <= slaObjetivo < ahora + horas
+    """
+    if filtro == FILTRO_VENCIDAS:
+        return None, ahora
+    if filtro == FILTRO_POR_VENCER:
+        return ahora, ahora + timedelta(hours=horas)
+    raise ValueError(f"Filtro de SLA inválido: {filtro}. Use {' o '.join(FILTROS_SLA)}.")
+
+
+class PlanificadorSla:
+    """Índice de vencimientos en memoria (min-heap por instante de transición)."""
+
+    def __init__(self, bus: BusEventos = bus_eventos,
+                 umbral_horas: int = settings.SLA_UMBRAL_AMBAR_HORAS,
+                 ventana_min: int = settings.SLA_VENTANA_MIN,
+                 reloj: Callable[[], datetime] = datetime.now):
+        self.bus = bus
+        self.umbral = timedelta(hours=umbral_horas)
+        self.ventana = timedelta(minutes=ventana_min)
+        self.reloj = reloj
+        # Entradas: (instante, id, semáforo destino, slaObjetivo). El slaObjetivo
+        # permite descartar entradas obsoletas sin borrarlas del heap.
+        self._heap: List[Tuple[datetime, int, str, datetime]] = []
+        self._seguidas: Dict[int, datetime] = {}
+        self._limite_ventana: Optional[datetime] = None
+        self._proxima_carga: Optional[datetime] = None
+        self._condicion = threading.Condition()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._fabrica_sesion = None
+
+    # --- Ciclo de vida -------------------------------------------------------
+
+    def iniciar(self, fabrica_sesion):
+        """Se suscribe al bus, carga la primera ventana y arranca el hilo."""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._fabrica_sesion = fabrica_sesion
+        self.bus.suscribir(SOLICITUDES_CREADAS, self._al_crear)
+        self.bus.suscribir(SOLICITUDES_TRANSICIONADAS, self._al_transicionar)
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="planificador-sla", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 5.0):
+        self.bus.desuscribir(SOLICITUDES_CREADAS, self._al_crear)
+        self.bus.desuscribir(SOLICITUDES_TRANSICIONADAS, self._al_transicionar)
+        if self._hilo is None:
+            return
+        self._detener.set()
+        with self._condicion:
+            self._condicion.notify()
+        self._hilo.join(timeout)
+        self._hilo = None
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            try:
+                if self._proxima_carga is None or self.reloj() >= self._proxima_carga:
+                    self.cargar_ventana()
+                self.procesar_vencidos()
+            except Exception:
+                logger.exception("Error en el planificador de SLA; se reintenta en el siguiente ciclo.")
+            with self._condicion:
+                proximo = min(self._heap[0][0], self._proxima_carga) if self._heap else self._proxima_carga
+                espera = (proximo - self.reloj()).total_seconds() if proximo else self.ventana.total_seconds()
+                # Tope de un minuto: tolera ajustes del reloj del sistema
+                self._condicion.wait(timeout=min(max(espera, 0.0), 60.0))
+
+    # --- Índice de vencimientos ----------------------------------------------
+
+    def cargar_ventana(self):
+        """
+        Avanza la ventana: carga las solicitudes abiertas cuyo SLA cae entre el
+        límite anterior y ahora + umbral AMBAR + ventana (una consulta por rango).
+        """
+        ahora = self.reloj()
+        nuevo_limite = ahora + self.umbral + self.ventana
+        with self._condicion:
+            desde = self._limite_ventana or ahora
+            # El límite se fija antes de consultar: las altas concurrentes dentro
+            # de la nueva ventana se aceptan por el bus (programar es idempotente)
+            self._limite_ventana = nuevo_limite
+            self._proxima_carga = ahora + self.ventana
+
+        with self._fabrica_sesion() as db:
+            vencimientos = solicitud_repository.listar_vencimientos(db, desde, nuevo_limite)
+        for id_solicitud, sla in vencimientos:
+            self.programar(id_solicitud, sla)
+
+    def programar(self, id_solicitud: int, sla_objetivo: datetime):
+        """Registra los próximos cambios de semáforo de una solicitud abierta."""
+        with self._condicion:
+            if self._limite_ventana is None or sla_objetivo > self._limite_ventana:
+                return  # Fuera de la ventana: se cargará cuando esta avance
+            if self._seguidas.get(id_solicitud) == sla_objetivo:
+                return
+            self._seguidas[id_solicitud] = sla_objetivo
+            alerta = sla_objetivo - self.umbral
+            if alerta > self.reloj():
+                heapq.heappush(self._heap, (alerta, id_solicitud, SemaforoSla.AMBAR.value, sla_objetivo))
+            heapq.heappush(self._heap, (sla_objetivo, id_solicitud, SemaforoSla.ROJO.value, sla_objetivo))
+            self._condicion.notify()
+
+    def descartar(self, ids: List[int]):
+        """Deja de seguir solicitudes cerradas (sus entradas del heap se ignoran al salir)."""
+        with self._condicion:
+            for id_solicitud in ids:
+                self._seguidas.pop(id_solicitud, None)
+
+    def procesar_vencidos(self, ahora: Optional[datetime] = None) -> List[Tuple[int, str]]:
+        """Extrae las transiciones cuyo instante ya llegó y las publica en el bus."""
+        ahora = ahora or self.reloj()
+        transiciones = []
+        with self._condicion:
+            while self._heap and self._heap[0][0] <= ahora:
+                _, id_solicitud, semaforo, sla = heapq.heappop(self._heap)
+                if self._seguidas.get(id_solicitud) != sla:
+                    continue  # Cerrada o reprogramada
+                if semaforo == SemaforoSla.AMBAR.value and sla <= ahora:
+                    continue  # Se pasa directo a ROJO en la misma ronda
+                if semaforo == SemaforoSla.ROJO.value:
+                    del self._seguidas[id_solicitud]
+                transiciones.append((id_solicitud, semaforo))
+
+        for id_solicitud, semaforo in transiciones:
+            self.bus.publicar(SEMAFORO_SLA_CAMBIADO, id=id_solicitud, semaforo=semaforo)
+        return transiciones
+
+    # --- Suscriptores del bus ------------------------------------------------
+
+    def _al_crear(self, solicitudes, filas=None):
+        for id_solicitud, sla in solicitudes:
+            self.programar(id_solicitud, sla)
+
+    def _al_transicionar(self, ids, estado, origen=None):
+        if estado not in _ESTADOS_ABIERTOS:
+            self.descartar(ids)
+
+    def instantanea(self) -> dict:
+        with self._condicion:
+            return {
+                "seguidas": len(self._seguidas),
+                "entradas_heap": len(self._heap),
+                "limite_ventana": self._limite_ventana,
+                "proximo_cambio": self._heap[0][0] if self._heap else None
+            }
+
+
+# Instancia única del proceso; main.py la arranca con la fábrica de sesiones
+planificador_sla = PlanificadorSla()
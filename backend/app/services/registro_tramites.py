@@ -0,0 +1,133 @@
+"""
+Capa de Servicios: Registro de Tipos de Trámite (Registry + Strategy).
+Asocia cada tipo de trámite normalizado a una estrategia de SLA compartida
+(las estrategias no tienen estado, por lo que hay una instancia por proceso).
+La resolución es O(1): búsqueda exacta en un diccionario, luego un único
+patrón precompilado de palabras clave para nombres libres, y memo por texto.
+La configuración se lee de un archivo JSON (TRAMITES_REGISTRO_RUTA) y se puede
+recargar en caliente: la nueva tabla se construye aparte y se publica con una
+sola asignación, sin bloquear a las peticiones en curso.
+"""
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.sla_strategy import (
+    SlaStrategy, TramiteRegularCalendarioStrategy, TramiteRegularStrategy,
+    TramiteUrgenteCalendarioStrategy, TramiteUrgenteStrategy
+)
+
+# Familias de estrategia disponibles: (plazo fijo, plazo en días hábiles)
+FAMILIAS_ESTRATEGIA = {
+    "REGULAR": (TramiteRegularStrategy, TramiteRegularCalendarioStrategy),
+    "URGENTE": (TramiteUrgenteStrategy, TramiteUrgenteCalendarioStrategy),
+}
+
+# Configuración por defecto: equivale a la regla histórica por subcadena
+CONFIGURACION_POR_DEFECTO = {
+    "por_defecto": "REGULAR",
+    "tipos": {},
+    "palabras_clave": {"extemporanea": "URGENTE", "urgente": "URGENTE"},
+}
+
+MAX_MEMO = 4096
+
+
+def normalizar_tipo(texto: str) -> str:
+    """Minúsculas, sin tildes y con espacios colapsados: 'Matrícula  Extemporánea' -> 'matricula extemporanea'."""
+    sin_tildes = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sin_tildes.lower().split())
+
+
+@dataclass
+class _TablaTramites:
+    """Instantánea inmutable del registro (se reemplaza completa al recargar)."""
+    exactos: Dict[str, str]
+    patron: Optional[re.Pattern]
+    familia_por_grupo: Dict[str, str]
+    por_defecto: str
+    memo: Dict[str, tuple] = field(default_factory=dict)
+
+
+class RegistroTramites:
+
+    def __init__(self, configuracion: Optional[dict] = None):
+        self._estrategias = {
+            familia: (fija(), calendario()) for familia, (fija, calendario) in FAMILIAS_ESTRATEGIA.items()
+        }
+        self._tabla = self._compilar(CONFIGURACION_POR_DEFECTO if configuracion is None else configuracion)
+
+    @staticmethod
+    def _validar_forma(configuracion):
+        """El JSON puede ser cualquier valor: se exige la forma esperada antes de compilar."""
+        if not isinstance(configuracion, dict):
+            raise ValueError("La configuración debe ser un objeto JSON.")
+        for seccion in ("tipos", "palabras_clave"):
+            valor = configuracion.get(seccion, {})
+            if not isinstance(valor, dict):
+                raise ValueError(f"'{seccion}' debe ser un objeto JSON.")
+            if not all(isinstance(clave, str) and clave.strip() for clave in valor):
+                raise ValueError(f"'{seccion}' solo admite nombres de texto no vacíos.")
+        if not isinstance(configuracion.get("por_defecto", "REGULAR"), str):
+            raise ValueError("'por_defecto' debe ser el nombre de una familia.")
+
+    def _compilar(self, configuracion: dict) -> _TablaTramites:
+        self._validar_forma(configuracion)
+        familias = [configuracion.get("por_defecto", "REGULAR"),
+                    *configuracion.get("tipos", {}).values(),
+                    *configuracion.get("palabras_clave", {}).values()]
+        desconocidas = {str(f) for f in familias if not isinstance(f, str) or f not in FAMILIAS_ESTRATEGIA}
+        if desconocidas:
+            raise ValueError(f"Familias de estrategia desconocidas: {sorted(desconocidas)}")
+
+        exactos = {normalizar_tipo(tipo): familia for tipo, familia in configuracion.get("tipos", {}).items()}
+
+        # Una sola alternancia con un grupo nombrado por palabra clave (las más largas primero)
+        claves = sorted(configuracion.get("palabras_clave", {}).items(), key=lambda kv: -len(kv[0]))
+        familia_por_grupo = {f"k{i}": familia for i, (_, familia) in enumerate(claves)}
+        patron = re.compile("|".join(
+            f"(?P<k{i}>{re.escape(normalizar_tipo(clave))})" for i, (clave, _) in enumerate(claves)
+        )) if claves else None
+
+        return _TablaTramites(exactos, patron, familia_por_grupo, configuracion.get("por_defecto", "REGULAR"))
+
+    def recargar(self, configuracion: Optional[dict] = None):
+        """Compila la nueva configuración (o la del archivo si no se indica) y la publica de forma atómica."""
+        self._tabla = self._compilar(cargar_configuracion() if configuracion is None else configuracion)
+
+    def familia(self, tipo_tramite: str) -> str:
+        normalizado = normalizar_tipo(tipo_tramite)
+        tabla = self._tabla
+        familia = tabla.exactos.get(normalizado)
+        if familia is None:
+            coincidencia = tabla.patron.search(normalizado) if tabla.patron else None
+            familia = tabla.familia_por_grupo[coincidencia.lastgroup] if coincidencia else tabla.por_defecto
+        return familia
+
+    def resolver(self, tipo_tramite: str) -> SlaStrategy:
+        """Estrategia compartida del trámite según el modo de SLA vigente."""
+        memo = self._tabla.memo
+        par = memo.get(tipo_tramite)
+        if par is None:
+            par = self._estrategias[self.familia(tipo_tramite)]
+            if len(memo) >= MAX_MEMO:
+                memo.clear()
+            memo[tipo_tramite] = par
+        # (plazo fijo, días hábiles): el booleano indexa la tupla
+        return par[settings.SLA_CALENDARIO_LABORAL]
+
+
+def cargar_configuracion(ruta: Optional[str] = None) -> dict:
+    """Lee el JSON de TRAMITES_REGISTRO_RUTA; sin archivo se usa la configuración por defecto."""
+    ruta = ruta if ruta is not None else settings.TRAMITES_REGISTRO_RUTA
+    if not ruta:
+        return CONFIGURACION_POR_DEFECTO
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+# Instancia única del proceso
+registro_tramites = RegistroTramites(cargar_configuracion())
@@ -5,15 +5,19 @@ de Servicio (SLA) y prioridades. Garantiza el principio Abierto/Cerrado (OCP).
 """
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.services.calendario_laboral import CalendarioLaboral, obtener_calendario
 
 # 1. La Interfaz (Clase Base)
 class SlaStrategy(ABC):
     """
     Contrato base (Interfaz). Define la familia de algoritmos 
     intercambiables para el cálculo de SLAs operativos.
+    'desde' es el instante de ingreso (por defecto, ahora).
     """
     @abstractmethod
-    def calcular_sla(self) -> datetime:
+    def calcular_sla(self, desde: Optional[datetime] = None) -> datetime:
         pass
     
     @abstractmethod
@@ -22,16 +26,44 @@ class SlaStrategy(ABC):
 
 # 2. Estrategia 1: Trámites Regulares (ej. Rectificación de Nota)
 class TramiteRegularStrategy(SlaStrategy):
-    def calcular_sla(self) -> datetime:
-        return datetime.now() + timedelta(hours=72) # 3 días
+    def calcular_sla(self, desde: Optional[datetime] = None) -> datetime:
+        return (desde or datetime.now()) + timedelta(hours=72) # 3 días
     
     def obtener_prioridad(self) -> str:
         return "NORMAL"
 
 # 3. Estrategia 2: Trámites Urgentes (ej. Matrícula Extemporánea)
 class TramiteUrgenteStrategy(SlaStrategy):
-    def calcular_sla(self) -> datetime:
-        return datetime.now() + timedelta(hours=24) # 1 día
+    def calcular_sla(self, desde: Optional[datetime] = None) -> datetime:
+        return (desde or datetime.now()) + timedelta(hours=24) # 1 día
     
     def obtener_prioridad(self) -> str:
-        return "ALTA"
\ No newline at end of file
+        return "ALTA"
+
+# 4. Estrategias sobre el Calendario Laboral (SLA_CALENDARIO_LABORAL=true)
+class SlaCalendarioStrategy(SlaStrategy):
+    """
+    Plazo expresado en días hábiles: se cuentan solo las horas de atención,
+    excluyendo fines de semana y feriados (ver calendario_laboral).
+    """
+    dias_habiles: int
+    prioridad: str
+
+    def __init__(self, calendario: Optional[CalendarioLaboral] = None):
+        self.calendario = calendario or obtener_calendario()
+
+    def calcular_sla(self, desde: Optional[datetime] = None) -> datetime:
+        return self.calendario.sumar_horas_laborables(
+            desde or datetime.now(), self.dias_habiles * self.calendario.horas_jornada
+        )
+
+    def obtener_prioridad(self) -> str:
+        return self.prioridad
+
+class TramiteRegularCalendarioStrategy(SlaCalendarioStrategy):
+    dias_habiles = 3
+    prioridad = "NORMAL"
+
+class TramiteUrgenteCalendarioStrategy(SlaCalendarioStrategy):
+    dias_habiles = 1
+    prioridad = "ALTA"
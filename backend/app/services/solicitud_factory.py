@@ -3,8 +3,12 @@ Capa de Servicios: Lógica Creacional (Factory Pattern).
 Desacopla la instanciación compleja de la entidad principal (Solicitud), 
 centralizando su ensamblaje y asegurando el cumplimiento estricto de SOLID.
 """
+from datetime import datetime
+from typing import Optional
+
 from app.domain.models import Solicitud
-from app.services.sla_strategy import SlaStrategy, TramiteRegularStrategy, TramiteUrgenteStrategy
+from app.services.registro_tramites import registro_tramites
+from app.services.sla_strategy import SlaStrategy
 
 class SolicitudFactory:
     """
@@ -14,24 +18,36 @@ class SolicitudFactory:
     
     @staticmethod
     def crear_solicitud(tipo_tramite: str, solicitante: str, descripcion: str, estado_inicial_id: int) -> Solicitud:
-        # Decidimos qué estrategia usar basándonos en el nombre del trámite
-        estrategia: SlaStrategy
-        if "Extemporánea" in tipo_tramite or "Urgente" in tipo_tramite:
-            estrategia = TramiteUrgenteStrategy()
-        else:
-            estrategia = TramiteRegularStrategy()
-
         """
         Construye el Aggregate Root inyectando la estrategia de SLA resuelta (DIP).
         Asegura que la entidad nazca con su prioridad y tiempos correctamente calculados.
         """
-        nueva_solicitud = Solicitud(
-            tipoSolicitud=tipo_tramite,
-            solicitante=solicitante,
-            descripcion=descripcion,
-            estado_id=estado_inicial_id,
-            slaObjetivo=estrategia.calcular_sla(),
-            prioridad=estrategia.obtener_prioridad(),
-            adjuntos=[] 
-        )
-        return nueva_solicitud
\ No newline at end of file
+        return Solicitud(**SolicitudFactory.construir_registro(
+            tipo_tramite, solicitante, descripcion, estado_inicial_id
+        ))
+
+    @staticmethod
+    def construir_registro(tipo_tramite: str, solicitante: str, descripcion: str, estado_inicial_id: int,
+                           fecha_creacion: Optional[datetime] = None) -> dict:
+        """
+        Variante para carga masiva: devuelve los valores de columna de la nueva
+        solicitud (sin instanciar la entidad ORM) listos para un INSERT multi-fila.
+        'fecha_creacion' permite sembrar datos históricos (por defecto, ahora).
+        """
+        estrategia = SolicitudFactory.resolver_estrategia(tipo_tramite)
+        ahora = fecha_creacion or datetime.now()
+        return {
+            "tipoSolicitud": tipo_tramite,
+            "solicitante": solicitante,
+            "descripcion": descripcion,
+            "estado_id": estado_inicial_id,
+            "fechaCreacion": ahora,
+            "slaObjetivo": estrategia.calcular_sla(ahora),
+            "prioridad": estrategia.obtener_prioridad(),
+            "adjuntos": []
+        }
+
+    @staticmethod
+    def resolver_estrategia(tipo_tramite: str) -> SlaStrategy:
+        # La estrategia (compartida, sin estado) sale del registro de tipos de trámite
+        return registro_tramites.resolver(tipo_tramite)
@@ -0,0 +1,123 @@
+"""
+Capa de Servicios: Versiones de la Bandeja y GET Condicional (ETag).
+Mantiene contadores de versión por vista (bandeja, historial y detalle por
+solicitud) que se incrementan con los eventos de dominio del bus (altas,
+transiciones y cambios de semáforo). Con ellos los controladores emiten ETags
+fuertes y responden 304 a un sondeo sin cambios antes de abrir la consulta,
+es decir, sin tocar la base de datos.
+
+Los contadores viven en el proceso: el ETag incluye un identificador de
+arranque para que un reinicio nunca reutilice una versión. Con varios workers
+cada uno ve solo sus propias escrituras, por lo que en ese despliegue debe
+desactivarse con ETAG_HABILITADO=false.
+"""
+import secrets
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.services.eventos import (
+    ADJUNTO_AGREGADO, SEMAFORO_SLA_CAMBIADO, SOLICITUDES_ARCHIVADAS, SOLICITUDES_CREADAS, SOLICITUDES_TRANSICIONADAS,
+    BusEventos, bus_eventos
+)
+
+CACHE_CONTROL = "no-cache"  # El cliente puede guardar la respuesta pero debe revalidarla
+MAX_DETALLES = 100_000
+
+
+class VersionesBandeja:
+
+    def __init__(self, bus: BusEventos = bus_eventos, max_detalles: int = MAX_DETALLES):
+        self.arranque = secrets.token_hex(4)
+        self.max_detalles = max_detalles
+        self._candado = threading.Lock()
+        self.bandeja = 0
+        self.historial = 0
+        self._detalles: Dict[int, int] = {}
+        self._epoca_detalles = 0
+        bus.suscribir(SOLICITUDES_CREADAS, self._al_crear)
+        bus.suscribir(SOLICITUDES_TRANSICIONADAS, self._al_transicionar)
+        bus.suscribir(SEMAFORO_SLA_CAMBIADO, self._al_cambiar_semaforo)
+        bus.suscribir(ADJUNTO_AGREGADO, self._al_agregar_adjunto)
+        bus.suscribir(SOLICITUDES_ARCHIVADAS, self._al_archivar)
+
+    # --- Suscriptores del bus ------------------------------------------------
+
+    def _al_crear(self, solicitudes, filas=None):
+        with self._candado:
+            self.bandeja += 1
+
+    def _al_transicionar(self, ids, estado, origen=None):
+        with self._candado:
+            self.bandeja += 1
+            self.historial += 1
+            self._incrementar_detalles(ids)
+
+    def _al_cambiar_semaforo(self, id, semaforo):
+        with self._candado:
+            self.bandeja += 1
+
+    def _al_agregar_adjunto(self, id, sha256):
+        # Solo cambia el detalle: la bandeja y el historial no muestran adjuntos
+        with self._candado:
+            self._incrementar_detalles([id])
+
+    def _al_archivar(self, ids):
+        # Salen del historial vivo; su detalle pasa a servirse desde el archivo
+        with self._candado:
+            self.historial += 1
+            self._incrementar_detalles(ids)
+
+    def _incrementar_detalles(self, ids):
+        if len(self._detalles) + len(ids) > self.max_detalles:
+            # Acota la memoria: una nueva época invalida todos los ETag de detalle
+            self._detalles.clear()
+            self._epoca_detalles += 1
+        for id_solicitud in ids:
+            self._detalles[id_solicitud] = self._detalles.get(id_solicitud, 0) + 1
+
+    # --- ETags ---------------------------------------------------------------
+
+    def etag_bandeja(self, consulta: str = "", por_minuto: bool = False) -> str:
+        """
+        La representación depende de los parámetros (cursor, límite, filtros).
+        'por_minuto' agrega el minuto actual cuando el resultado depende del
+        reloj sin que exista un evento que lo notifique (ej. horas a medida).
+        """
+        sufijo = f"-{int(time.time() // 60)}" if por_minuto else ""
+        return f'"b{self.arranque}-{self.bandeja}-{zlib.crc32(consulta.encode()):x}{sufijo}"'
+
+    def etag_historial(self) -> str:
+        return f'"h{self.arranque}-{self.historial}"'
+
+    def version_detalle(self, id_solicitud: int) -> str:
+        """Versión vigente del detalle; también versiona la caché de detalle en memoria."""
+        return f"{self._epoca_detalles}-{self._detalles.get(id_solicitud, 0)}"
+
+    def etag_detalle(self, id_solicitud: int) -> str:
+        return f'"d{self.arranque}-{id_solicitud}-{self.version_detalle(id_solicitud)}"'
+
+
+def no_modificado(request: Request, etag: str) -> Optional[Response]:
+    """Respuesta 304 si el cliente ya tiene la versión vigente (If-None-Match); si no, None."""
+    if not settings.ETAG_HABILITADO:
+        return None
+    cabecera = request.headers.get("if-none-match")
+    if cabecera and (cabecera.strip() == "*" or etag in (e.strip() for e in cabecera.split(","))):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def marcar_version(response: Response, etag: str):
+    """Publica el ETag de la representación entregada."""
+    if settings.ETAG_HABILITADO:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+# Instancia única del proceso (suscrita al bus desde su creación)
+versiones_bandeja = VersionesBandeja()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark de calcular_sla: throughput de cada estrategia de SLA con
+instantes de ingreso repartidos en varios años (como en una carga masiva).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_calcular_sla --llamadas 200000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.services.calendario_laboral import CalendarioLaboral
+from app.services.sla_strategy import (
+    TramiteRegularCalendarioStrategy, TramiteRegularStrategy,
+    TramiteUrgenteCalendarioStrategy, TramiteUrgenteStrategy
+)
+
+
+def instantes_de_ingreso(cantidad: int, semilla: int = 13) -> list:
+    aleatorio = random.Random(semilla)
+    base = datetime(2025, 1, 1)
+    return [base + timedelta(seconds=aleatorio.randint(0, 3 * 365 * 24 * 3600)) for _ in range(cantidad)]
+
+
+def medir(estrategia, instantes: list) -> float:
+    """Llamadas por segundo sobre la lista de instantes."""
+    inicio = time.perf_counter()
+    for instante in instantes:
+        estrategia.calcular_sla(instante)
+    return len(instantes) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llamadas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    instantes = instantes_de_ingreso(args.llamadas)
+    calendario = CalendarioLaboral.desde_configuracion()
+
+    inicio = time.perf_counter()
+    for anio in range(2025, 2029):
+        calendario.tabla(anio)
+    print(f"Tablas anuales 2025-2028 construidas en {(time.perf_counter() - inicio) * 1000:.1f} ms\n")
+
+    estrategias = {
+        "regular (72 h)": TramiteRegularStrategy(),
+        "urgente (24 h)": TramiteUrgenteStrategy(),
+        "regular calendario (3 d.h.)": TramiteRegularCalendarioStrategy(calendario),
+        "urgente calendario (1 d.h.)": TramiteUrgenteCalendarioStrategy(calendario),
+    }
+    print(f"{'estrategia':<30} {'llamadas/s':>14} {'µs/llamada':>12}")
+    for nombre, estrategia in estrategias.items():
+        por_segundo = medir(estrategia, instantes)
+        print(f"{nombre:<30} {por_segundo:>14,.0f} {1e6 / por_segundo:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Benchmark de carga de la API de aprobaciones: escenarios con clientes
+concurrentes y reporte de latencias p50/p95/p99 y throughput por endpoint.
+
+Escenarios:
+- carga_bandeja: /approvals/pending sin If-None-Match; cada petición lee y
+  serializa la primera página (siempre 200).
+- sondeo_bandeja: cada cliente sondea /approvals/pending revalidando con su
+  último ETag, como la bandeja abierta en el navegador. Las respuestas 200 y
+  304 se reportan en filas separadas: sus latencias no son comparables.
+- detalle: aperturas repetidas de /approvals/{id}/detail sobre ids calientes.
+- tormenta_dictamenes: POST /approvals/{id}/verdict en paralelo; cada id lo
+  dictaminan dos clientes a la vez, por lo que la mitad debe responder 409.
+- exportacion_historial: descarga completa de /approvals/history/export.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_carga --filas 20000 --clientes 16
+    python -m benchmarks.bench_carga --url mysql+pymysql://root:@127.0.0.1:3306/campus360_bench
+    python -m benchmarks.bench_carga --base-url http://127.0.0.1:8000 --sin-sembrar
+
+Por defecto la API corre en proceso (TestClient) sobre un SQLite que se
+recrea en cada ejecución. Con --url se siembra una base MySQL vacía (por
+ejemplo un mysqld o MariaDB local sin contenedores); con --base-url se mide
+un servidor ya levantado (uvicorn con varios workers).
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+RAIZ_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API = "/api/v1"
+# Respuestas esperadas que no cuentan como error
+CODIGOS_ESPERADOS = {200, 304, 409}
+
+
+class Registro:
+    """Latencias (ms) y códigos HTTP por endpoint, seguro entre hilos."""
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.codigos: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.duracion: Dict[str, float] = {}
+
+    def medir(self, endpoint: str, peticion: Callable, por_codigo: bool = False):
+        """Con 'por_codigo' cada código HTTP se registra como un endpoint aparte ('... [304]')."""
+        inicio = time.perf_counter()
+        respuesta = peticion()
+        transcurrido = (time.perf_counter() - inicio) * 1000
+        if por_codigo:
+            endpoint = f"{endpoint} [{respuesta.status_code}]"
+        with self._candado:
+            self.latencias[endpoint].append(transcurrido)
+            self.codigos[endpoint][respuesta.status_code] += 1
+        return respuesta
+
+    def resumen(self) -> List[dict]:
+        filas = []
+        for endpoint, latencias in self.latencias.items():
+            ordenadas = sorted(latencias)
+            codigos = self.codigos[endpoint]
+            filas.append({
+                "endpoint": endpoint,
+                "peticiones": len(ordenadas),
+                "errores": sum(n for codigo, n in codigos.items() if codigo not in CODIGOS_ESPERADOS),
+                "codigos": dict(sorted(codigos.items())),
+                "p50_ms": percentil(ordenadas, 50),
+                "p95_ms": percentil(ordenadas, 95),
+                "p99_ms": percentil(ordenadas, 99),
+                "max_ms": round(ordenadas[-1], 2),
+                "rps": round(len(ordenadas) / self.duracion[endpoint.split(" [")[0]], 1),
+            })
+        return filas
+
+
+def percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    indice = max(0, min(len(ordenadas) - 1, round(p / 100 * len(ordenadas) + 0.5) - 1))
+    return round(ordenadas[indice], 2)
+
+
+def en_paralelo(registro: Registro, endpoint: str, clientes: int, tareas: list, trabajo: Callable):
+    """Reparte 'tareas' entre 'clientes' hilos y registra la duración total del escenario."""
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as ejecutor:
+        list(ejecutor.map(trabajo, tareas))
+    registro.duracion[endpoint] = time.perf_counter() - inicio
+
+
+# --- Escenarios ---------------------------------------------------------------
+
+def carga_bandeja(cliente, registro: Registro, clientes: int, peticiones: int):
+    endpoint = "GET /approvals/pending"
+    en_paralelo(registro, endpoint, clientes, range(peticiones),
+                lambda _: registro.medir(endpoint, lambda: cliente.get(f"{API}/approvals/pending")))
+
+
+def sondeo_bandeja(cliente, registro: Registro, clientes: int, peticiones: int):
+    endpoint = "GET /approvals/pending (If-None-Match)"
+    etags = threading.local()
+
+    def sondear(_):
+        cabeceras = {"If-None-Match": etags.valor} if getattr(etags, "valor", None) else {}
+        respuesta = registro.medir(endpoint, lambda: cliente.get(f"{API}/approvals/pending", headers=cabeceras),
+                                   por_codigo=True)
+        etags.valor = respuesta.headers.get("ETag")
+
+    en_paralelo(registro, endpoint, clientes, range(peticiones), sondear)
+
+
+def detalle(cliente, registro: Registro, clientes: int, peticiones: int, ids: List[int]):
+    endpoint = "GET /approvals/{id}/detail"
+    calientes = ids[:50]  # Los aprobadores reabren las mismas solicitudes
+    aleatorio = random.Random(7)
+    elegidos = [aleatorio.choice(calientes) for _ in range(peticiones)]
+    en_paralelo(registro, endpoint, clientes, elegidos,
+                lambda id_solicitud: registro.medir(endpoint, lambda: cliente.get(f"{API}/approvals/{id_solicitud}/detail")))
+
+
+def tormenta_dictamenes(cliente, registro: Registro, clientes: int, ids: List[int]):
+    endpoint = "POST /approvals/{id}/verdict"
+    # Cada id aparece dos veces seguidas: dos aprobadores compiten por la misma solicitud
+    duplicados = [id_solicitud for id_solicitud in ids for _ in range(2)]
+    cuerpo = {"decision": "APROBADO", "comentario": "Conforme (benchmark)"}
+    en_paralelo(registro, endpoint, clientes, duplicados,
+                lambda id_solicitud: registro.medir(
+                    endpoint, lambda: cliente.post(f"{API}/approvals/{id_solicitud}/verdict", json=cuerpo)))
+
+
+def exportacion_historial(cliente, registro: Registro, clientes: int, descargas: int):
+    endpoint = "GET /approvals/history/export"
+
+    def descargar(_):
+        # El tiempo medido llega hasta el último byte del stream
+        def peticion():
+            respuesta = cliente.get(f"{API}/approvals/history/export", params={"formato": "ndjson"})
+            respuesta.read()
+            return respuesta
+        registro.medir(endpoint, peticion)
+
+    en_paralelo(registro, endpoint, min(clientes, descargas), range(descargas), descargar)
+
+
+def ids_abiertos(cliente, cantidad: int) -> List[int]:
+    """Recorre la bandeja por cursor hasta juntar 'cantidad' ids abiertos."""
+    ids, cursor = [], None
+    while len(ids) < cantidad:
+        respuesta = cliente.get(f"{API}/approvals/pending", params={"limite": 200, **({"cursor": cursor} if cursor else {})})
+        ids.extend(s["id"] for s in respuesta.json())
+        cursor = respuesta.headers.get("X-Siguiente-Cursor")
+        if not cursor:
+            break
+    return ids[:cantidad]
+
+
+# --- Preparación ----------------------------------------------------------------
+
+def preparar_base(url: str, filas: int):
+    """Esquema vía Alembic (head) y dataset sembrado con SolicitudFactory."""
+    from alembic import command
+    from sqlalchemy import create_engine
+
+    from benchmarks.bench_indices import configuracion_alembic
+    from benchmarks.dataset import sembrar_dataset
+
+    command.upgrade(configuracion_alembic(url), "head")
+    engine = create_engine(url)
+    print(f"Sembrando {filas:,} solicitudes...")
+    sembrar_dataset(engine, filas, progreso=lambda _: None)
+    engine.dispose()
+
+
+@contextmanager
+def abrir_cliente(args):
+    if args.base_url:
+        import httpx
+        with httpx.Client(base_url=args.base_url, timeout=60) as cliente:
+            yield cliente
+        return
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as cliente:  # Ejecuta el ciclo de vida (catálogo, bitácora, planificador)
+        yield cliente
+
+
+def imprimir(filas: List[dict]):
+    encabezado = f"{'endpoint':<44}{'n':>7}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'req/s':>9}  códigos"
+    print(encabezado)
+    print("-" * len(encabezado))
+    for f in filas:
+        print(f"{f['endpoint']:<44}{f['peticiones']:>7}{f['errores']:>5}{f['p50_ms']:>9.2f}{f['p95_ms']:>9.2f}"
+              f"{f['p99_ms']:>9.2f}{f['max_ms']:>9.2f}{f['rps']:>9.1f}  {f['codigos']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=20_000, help="solicitudes a sembrar")
+    parser.add_argument("--url", default=f"sqlite:///{os.path.join(RAIZ_BACKEND, 'bench_carga.db')}",
+                        help="base de datos del benchmark (debe estar vacía; SQLite se recrea)")
+    parser.add_argument("--base-url", help="medir un servidor ya levantado en lugar de la API en proceso")
+    parser.add_argument("--sin-sembrar", action="store_true", help="usar los datos existentes")
+    parser.add_argument("--clientes", type=int, default=16)
+    parser.add_argument("--peticiones", type=int, default=2000, help="peticiones por escenario de lectura")
+    parser.add_argument("--dictamenes", type=int, default=300, help="solicitudes abiertas a dictaminar")
+    parser.add_argument("--exportaciones", type=int, default=4)
+    parser.add_argument("--json", help="guardar el resumen en este archivo (comparación entre ejecuciones)")
+    args = parser.parse_args()
+    # La configuración se lee al importar app.*: la API en proceso usa la base del benchmark
+    os.environ["DATABASE_URL"] = args.url
+
+    if not args.sin_sembrar:
+        if args.url.startswith("sqlite:///"):
+            archivo = args.url[len("sqlite:///"):]
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        preparar_base(args.url, args.filas)
+
+    registro = Registro()
+    with abrir_cliente(args) as cliente:
+        ids = ids_abiertos(cliente, max(args.dictamenes, 50))
+        print(f"Escenarios con {args.clientes} clientes concurrentes ({len(ids)} solicitudes abiertas)...\n")
+        carga_bandeja(cliente, registro, args.clientes, args.peticiones)
+        sondeo_bandeja(cliente, registro, args.clientes, args.peticiones)
+        detalle(cliente, registro, args.clientes, args.peticiones, ids)
+        tormenta_dictamenes(cliente, registro, args.clientes, ids[:args.dictamenes])
+        exportacion_historial(cliente, registro, args.clientes, args.exportaciones)
+
+    resumen = registro.resumen()
+    imprimir(resumen)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(resumen, archivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
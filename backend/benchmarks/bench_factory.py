@@ -0,0 +1,62 @@
+"""
+Benchmark de SolicitudFactory: resolución de estrategia y ensamblaje de
+registros para una carga masiva, comparando la regla histórica (subcadena +
+nueva estrategia por ítem) con el registro de tipos de trámite.
+
+Uso (desde backend/):
+    python -m benchmarks.bench_factory --items 100000
+"""
+import argparse
+import random
+import time
+
+from app.services.registro_tramites import registro_tramites
+from app.services.sla_strategy import TramiteRegularStrategy, TramiteUrgenteStrategy
+from app.services.solicitud_factory import SolicitudFactory
+
+TIPOS = [
+    "Rectificación de Nota", "Matricula Extemporánea", "MATRICULA EXTEMPORANEA",
+    "Constancia de Estudios", "Retiro de Curso", "Reserva Urgente de Matrícula",
+]
+
+
+def resolver_por_subcadena(tipo_tramite: str):
+    """Regla anterior al registro, como referencia."""
+    if "Extemporánea" in tipo_tramite or "Urgente" in tipo_tramite:
+        return TramiteUrgenteStrategy()
+    return TramiteRegularStrategy()
+
+
+def medir(funcion, tipos: list) -> float:
+    """Ítems por segundo."""
+    inicio = time.perf_counter()
+    for tipo in tipos:
+        funcion(tipo)
+    return len(tipos) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(14)
+    # Mezcla de tipos del catálogo y nombres libres únicos (peor caso para el memo)
+    tipos = [
+        aleatorio.choice(TIPOS) if aleatorio.random() < 0.9 else f"Trámite libre {i}"
+        for i in range(args.items)
+    ]
+
+    casos = {
+        "resolver (subcadena + instancia)": resolver_por_subcadena,
+        "resolver (registro)": registro_tramites.resolver,
+        "construir_registro (factory)": lambda tipo: SolicitudFactory.construir_registro(tipo, "Alumno", "Sustento", 1),
+    }
+    print(f"{args.items:,} ítems\n{'caso':<36} {'ítems/s':>12} {'µs/ítem':>10}")
+    for nombre, funcion in casos.items():
+        por_segundo = medir(funcion, tipos)
+        print(f"{nombre:<36} {por_segundo:>12,.0f} {1e6 / por_segundo:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark de índices: planes de ejecución y latencias con los índices de la
+revisión 0001 frente a los de head, sobre un dataset sembrado y con las
+consultas que construye el repositorio (bandeja por tramos, bandeja de
+Jefatura, historial, detalle y lote de archivo de la bitácora).
+
+La línea base se obtiene migrando una base real a 0001 y reflejando sus
+índices; luego se migra a head y se retiran todos los índices posteriores a
+0001 (0002, 0003, 0004, 0006, 0007...). Las columnas agregadas después se
+conservan porque las consultas vigentes las leen y el sembrado las escribe;
+solo cambian los caminos de acceso. ANALYZE se ejecuta antes de ambas mediciones.
+
+Uso (desde backend/, contra una base VACÍA dedicada al benchmark):
+    python -m benchmarks.bench_indices --filas 1000000
+    python -m benchmarks.bench_indices --url mysql+pymysql://root:@localhost:3306/campus360_bench
+
+Con SQLite (valor por defecto) el archivo se recrea en cada ejecución.
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import MetaData, create_engine, event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.domain.enums import EstadoSolicitud
+from app.domain.models import Solicitud
+from app.repositories import archivo_repository, estado_repository, solicitud_repository
+from app.repositories.estado_repository import obtener_ids_estados
+from benchmarks.dataset import AREA_JEFATURA, sembrar_dataset
+
+RAIZ_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REVISION_BASE = "0001"
+FILAS_HISTORIAL = 500
+LOTE_AUDITORIA = 1_000
+
+
+def configuracion_alembic(url: str) -> Config:
+    cfg = Config(os.path.join(RAIZ_BACKEND, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(RAIZ_BACKEND, "migrations"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+def indices_existentes(engine) -> dict:
+    """Tabla -> nombres de sus índices, para todas las tablas presentes en la base."""
+    inspector = inspect(engine)
+    return {tabla: {indice["name"] for indice in inspector.get_indexes(tabla)} for tabla in inspector.get_table_names()}
+
+
+def retirar_indices_posteriores(engine, base: dict) -> list:
+    """
+    Elimina los índices de head que no existían en la revisión base (sobre las
+    tablas que ya existían en ella) y retorna sus definiciones reflejadas.
+    """
+    metadata = MetaData()
+    metadata.reflect(bind=engine, only=sorted(base))
+    retirados = []
+    with engine.begin() as conn:
+        for tabla in metadata.sorted_tables:
+            for indice in sorted(tabla.indexes, key=lambda i: i.name):
+                if indice.name not in base[tabla.name]:
+                    indice.drop(conn)
+                    retirados.append(indice)
+    return retirados
+
+
+def recrear_indices(engine, indices: list):
+    with engine.begin() as conn:
+        for indice in indices:
+            indice.create(conn)
+
+
+def actualizar_estadisticas(engine):
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+        else:
+            conn.exec_driver_sql("ANALYZE TABLE solicitudes, historial_decisiones, log_auditoria")
+
+
+def consultas_del_repositorio(db: Session) -> dict:
+    """Cada escenario ejecuta las sentencias del repositorio tal como las emite la API."""
+    ids_historial = obtener_ids_estados(db, solicitud_repository.ESTADOS_HISTORIAL)
+    maximo = db.scalar(select(func.max(Solicitud.idSolicitud)))
+    cursor_normal = (solicitud_repository.PRIORIDAD_RANGO["NORMAL"], datetime.now() - timedelta(days=365), maximo // 2)
+    consulta_historial = solicitud_repository.construir_consulta_historial(ids_historial).limit(FILAS_HISTORIAL)
+    consulta_auditoria = archivo_repository.construir_consulta_lote_auditoria(datetime.now() - timedelta(days=90),
+                                                                              LOTE_AUDITORIA)
+    return {
+        "bandeja_primera_pagina": lambda: solicitud_repository.listar_solicitudes_por_aprobar(db, limite=50),
+        "bandeja_pagina_keyset": lambda: solicitud_repository.listar_solicitudes_por_aprobar(
+            db, limite=50, despues_de=cursor_normal),
+        "bandeja_jefatura": lambda: solicitud_repository.listar_solicitudes_por_aprobar(
+            db, limite=50, estados=[EstadoSolicitud.POR_APROBAR], area=AREA_JEFATURA),
+        "historial_primera_pagina": lambda: db.scalars(consulta_historial).all(),
+        "detalle_con_historial": lambda: solicitud_repository.obtener_detalle(db, maximo // 3),
+        "lote_archivo_auditoria": lambda: db.execute(consulta_auditoria).all(),
+    }
+
+
+def capturar_sentencias(engine, escenario) -> list:
+    """Sentencias SQL (con sus parámetros) que emite un escenario, incluidas las de carga de relaciones."""
+    sentencias = []
+
+    def registrar(conn, cursor, sql, parametros, contexto, multiples):
+        sentencias.append((sql, parametros))
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        escenario()
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    return sentencias
+
+
+def plan_de_ejecucion(engine, sentencias: list) -> str:
+    prefijo = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    lineas = []
+    with engine.connect() as conn:
+        for sql, parametros in sentencias:
+            lineas.append("      > " + " ".join(sql.split())[:110])
+            for fila in conn.exec_driver_sql(prefijo + sql, parametros).all():
+                lineas.append("      " + " | ".join(str(c) for c in fila))
+    return "\n".join(lineas)
+
+
+def medir(engine, repeticiones: int) -> dict:
+    resultados = {}
+    estado_repository.invalidar_catalogo_estados()
+    with Session(engine) as db:
+        for nombre, escenario in consultas_del_repositorio(db).items():
+            sentencias = capturar_sentencias(engine, escenario)  # también calienta la caché
+            db.expunge_all()
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                escenario()
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                db.expunge_all()  # Cada repetición materializa sus entidades desde la base
+            resultados[nombre] = (statistics.median(tiempos), plan_de_ejecucion(engine, sentencias))
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///bench_indices.db", help="Base de datos vacía para el benchmark")
+    parser.add_argument("--filas", type=int, default=1_000_000, help="Solicitudes a sembrar")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.url.startswith("sqlite:///") and os.path.exists(args.url[len("sqlite:///"):]):
+        os.remove(args.url[len("sqlite:///"):])
+
+    cfg = configuracion_alembic(args.url)
+    engine = create_engine(args.url)
+
+    print(f"1) Índices de la revisión {REVISION_BASE}; esquema en head sin los índices posteriores")
+    command.upgrade(cfg, REVISION_BASE)
+    base = indices_existentes(engine)
+    command.upgrade(cfg, "head")
+    indices = retirar_indices_posteriores(engine, base)
+    print("   Retirados: " + ", ".join(indice.name for indice in indices))
+
+    print(f"2) Sembrando {args.filas:,} solicitudes con historial y bitácora")
+    total = sembrar_dataset(engine, args.filas)
+    print(f"   Total de filas insertadas: {total:,}")
+    actualizar_estadisticas(engine)
+
+    print(f"3) Midiendo consultas con los índices de {REVISION_BASE}")
+    antes = medir(engine, args.repeticiones)
+
+    print("4) Recreando los índices de head")
+    recrear_indices(engine, indices)
+    actualizar_estadisticas(engine)
+
+    print("5) Midiendo consultas con los índices de head\n")
+    despues = medir(engine, args.repeticiones)
+
+    print(f"{'consulta':<26} {REVISION_BASE + ' (ms)':>12} {'head (ms)':>14} {'mejora':>9}")
+    for nombre in antes:
+        ms_antes, ms_despues = antes[nombre][0], despues[nombre][0]
+        print(f"{nombre:<26} {ms_antes:>12.3f} {ms_despues:>14.3f} {ms_antes / max(ms_despues, 1e-6):>8.1f}x")
+
+    print("\nPlanes de ejecución")
+    for nombre in antes:
+        print(f"  {nombre}\n    {REVISION_BASE}:\n{antes[nombre][1]}\n    head:\n{despues[nombre][1]}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Generador de datasets sintéticos para los benchmarks.
+Inserta solicitudes con su historial y bitácora en lotes multi-fila, con una
+distribución similar a producción: la mayoría de trámites ya resueltos y una
+fracción abierta repartida entre PENDIENTE, POR_APROBAR y OBSERVADO.
+Cada fila se ensambla con SolicitudFactory (prioridad y SLA de la estrategia
+registrada para el trámite), igual que las altas reales.
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.domain.models import Estado, HistorialDecision, LogAuditoria, Solicitud
+from app.services.solicitud_factory import SolicitudFactory
+
+ESTADOS = ["PENDIENTE", "POR_APROBAR", "APROBADO", "OBSERVADO", "RECHAZADO"]
+# Peso relativo de cada estado en el dataset (80% resueltos)
+PESOS_ESTADO = [8, 7, 55, 5, 25]
+TRAMITES = ["Rectificación de Nota", "Matricula Extemporánea", "Constancia de Estudios", "Retiro de Curso"]
+TRAMITE_URGENTE = "Matricula Extemporánea"
+AREA_JEFATURA = "Jefatura"
+
+# Última transición real que deja a la solicitud en cada estado: (actor, acción, endpoint).
+# POR_APROBAR solo se alcanza por la derivación del Secretario; los demás, por dictamen.
+TRANSICION_POR_ESTADO = {
+    "POR_APROBAR": ("Secretario_Logueado", "Derivación a Jefatura", "POST /api/v1/workflow/{id}/escalate"),
+    "APROBADO": ("Aprobador_Logueado", "Dictamen: APROBADO", "POST /api/v1/approvals/{id}/verdict"),
+    "OBSERVADO": ("Aprobador_Logueado", "Dictamen: OBSERVADO", "POST /api/v1/approvals/{id}/verdict"),
+    "RECHAZADO": ("Aprobador_Logueado", "Dictamen: RECHAZADO", "POST /api/v1/approvals/{id}/verdict"),
+}
+
+
+def asegurar_estados(conn) -> dict:
+    """Inserta el catálogo si falta y retorna el mapa tipoEstado -> idEstado."""
+    existentes = dict(conn.execute(Estado.__table__.select().with_only_columns(Estado.tipoEstado, Estado.idEstado)).all())
+    faltantes = [{"tipoEstado": nombre} for nombre in ESTADOS if nombre not in existentes]
+    if faltantes:
+        conn.execute(insert(Estado), faltantes)
+        existentes = dict(conn.execute(Estado.__table__.select().with_only_columns(Estado.tipoEstado, Estado.idEstado)).all())
+    return existentes
+
+
+def sembrar_dataset(engine, filas: int, lote: int = 10_000, semilla: int = 360, progreso=print) -> int:
+    """
+    Inserta 'filas' solicitudes (y su historial/bitácora asociados) en lotes.
+    Retorna el total de filas insertadas entre las tres tablas.
+    """
+    aleatorio = random.Random(semilla)
+    ahora = datetime.now()
+    total = 0
+
+    with engine.begin() as conn:
+        ids_estado = asegurar_estados(conn)
+        siguiente_id = (conn.exec_driver_sql("SELECT COALESCE(MAX(idSolicitud), 0) FROM solicitudes").scalar() or 0) + 1
+
+    for inicio in range(0, filas, lote):
+        solicitudes, historial, bitacora = [], [], []
+        for id_solicitud in range(siguiente_id + inicio, siguiente_id + min(inicio + lote, filas)):
+            estado = aleatorio.choices(ESTADOS, PESOS_ESTADO)[0]
+            tramite = TRAMITE_URGENTE if aleatorio.random() < 0.2 else aleatorio.choice(TRAMITES)
+            creada = ahora - timedelta(minutes=aleatorio.randint(0, 60 * 24 * 365 * 3))
+            registro = SolicitudFactory.construir_registro(
+                tramite, f"Alumno {id_solicitud % 50_000}", "Sustento generado para benchmark",
+                ids_estado[estado], fecha_creacion=creada
+            )
+            # Proyección de la última decisión (ver migración 0003); vacía si sigue PENDIENTE.
+            # Solo una derivación conforme deja área de destino (bandeja de Jefatura, migración 0006)
+            registro.update(idSolicitud=id_solicitud, fechaUltimaDecision=None,
+                            actorUltimaDecision=None, accionUltimaDecision=None,
+                            areaDestino=AREA_JEFATURA if estado == "POR_APROBAR" else None)
+            if estado != "PENDIENTE":
+                fecha = creada + timedelta(hours=aleatorio.randint(1, 96))
+                actor, accion, endpoint = TRANSICION_POR_ESTADO[estado]
+                historial.append({
+                    "solicitud_id": id_solicitud,
+                    "usuario_id": actor,
+                    "accion": accion,
+                    "comentario": "Generado para benchmark",
+                    "fecha": fecha,
+                })
+                bitacora.append({
+                    "usuario": actor,
+                    "endpoint": endpoint.format(id=id_solicitud),
+                    "timestamp": fecha,
+                })
+                registro.update(fechaUltimaDecision=fecha, actorUltimaDecision=actor, accionUltimaDecision=accion)
+            solicitudes.append(registro)
+
+        with engine.begin() as conn:
+            conn.execute(insert(Solicitud), solicitudes)
+            if historial:
+                conn.execute(insert(HistorialDecision), historial)
+                conn.execute(insert(LogAuditoria), bitacora)
+
+        total += len(solicitudes) + len(historial) + len(bitacora)
+        progreso(f"  {min(inicio + lote, filas):>10,} / {filas:,} solicitudes sembradas")
+
+    return total
@@ -0,0 +1,74 @@
+"""Esquema inicial: estados, solicitudes, historial_decisiones y log_auditoria.
+
+Corresponde a las tablas que app.main creaba con create_all (incluida la
+columna 'descripcion' que antes se agregaba con un ALTER TABLE manual).
+Para una base existente creada con create_all: alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "estados",
+        sa.Column("idEstado", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("tipoEstado", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("idEstado"),
+        sa.UniqueConstraint("tipoEstado"),
+    )
+    op.create_table(
+        "solicitudes",
+        sa.Column("idSolicitud", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("tipoSolicitud", sa.String(length=100), nullable=False),
+        sa.Column("descripcion", sa.String(length=1000), nullable=True),
+        sa.Column("fechaCreacion", sa.DateTime(), nullable=True),
+        sa.Column("prioridad", sa.String(length=20), nullable=True),
+        sa.Column("slaObjetivo", sa.DateTime(), nullable=False),
+        sa.Column("solicitante", sa.String(length=100), nullable=False),
+        sa.Column("adjuntos", sa.JSON(), nullable=True),
+        sa.Column("estado_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["estado_id"], ["estados.idEstado"]),
+        sa.PrimaryKeyConstraint("idSolicitud"),
+    )
+    op.create_table(
+        "historial_decisiones",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("solicitud_id", sa.Integer(), nullable=False),
+        sa.Column("usuario_id", sa.String(length=50), nullable=False),
+        sa.Column("accion", sa.String(length=100), nullable=False),
+        sa.Column("comentario", sa.String(length=500), nullable=True),
+        sa.Column("fecha", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["solicitud_id"], ["solicitudes.idSolicitud"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "log_auditoria",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("usuario", sa.String(length=50), nullable=False),
+        sa.Column("endpoint", sa.String(length=255), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("log_auditoria")
+    op.drop_table("historial_decisiones")
+    op.drop_table("solicitudes")
+    op.drop_table("estados")
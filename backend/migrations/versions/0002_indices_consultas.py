@@ -0,0 +1,50 @@
+"""Índices compuestos para las consultas calientes (bandeja, historial y detalle).
+
+- ix_solicitudes_bandeja: filtro por estado + tramo de prioridad, recorrido
+  ordenado por (slaObjetivo, idSolicitud) para la paginación keyset de la bandeja
+  y el filtro por estado del historial.
+- ix_historial_solicitud_fecha: carga del historial de una o varias solicitudes
+  (detalle y SELECT ... IN del listado) ya ordenado por fecha.
+- ix_log_auditoria_timestamp: consultas y depuración por rango de fechas.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_solicitudes_bandeja",
+        "solicitudes",
+        ["estado_id", "prioridad", "slaObjetivo", "idSolicitud"],
+    )
+    op.create_index(
+        "ix_historial_solicitud_fecha",
+        "historial_decisiones",
+        ["solicitud_id", "fecha"],
+    )
+    op.create_index(
+        "ix_log_auditoria_timestamp",
+        "log_auditoria",
+        ["timestamp"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_log_auditoria_timestamp", table_name="log_auditoria")
+    op.drop_index("ix_historial_solicitud_fecha", table_name="historial_decisiones")
+    op.drop_index("ix_solicitudes_bandeja", table_name="solicitudes")
@@ -0,0 +1,62 @@
+"""Proyección de la última decisión en 'solicitudes'.
+
+Agrega fechaUltimaDecision, actorUltimaDecision y accionUltimaDecision, las
+completa a partir de historial_decisiones y crea ix_solicitudes_historial
+(estado_id, fechaUltimaDecision, idSolicitud) para listar el historial con un
+único recorrido indexado.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _ultima(columna: str) -> str:
+    return (
+        f"(SELECT h.{columna} FROM historial_decisiones h "
+        "WHERE h.solicitud_id = solicitudes.idSolicitud "
+        "ORDER BY h.fecha DESC, h.id DESC LIMIT 1)"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.add_column(sa.Column("fechaUltimaDecision", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("actorUltimaDecision", sa.String(length=50), nullable=True))
+        batch.add_column(sa.Column("accionUltimaDecision", sa.String(length=100), nullable=True))
+
+    # Backfill desde el historial existente
+    op.execute(
+        "UPDATE solicitudes SET "
+        f"fechaUltimaDecision = {_ultima('fecha')}, "
+        f"actorUltimaDecision = {_ultima('usuario_id')}, "
+        f"accionUltimaDecision = {_ultima('accion')}"
+    )
+
+    op.create_index(
+        "ix_solicitudes_historial",
+        "solicitudes",
+        ["estado_id", "fechaUltimaDecision", "idSolicitud"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_solicitudes_historial", table_name="solicitudes")
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.drop_column("accionUltimaDecision")
+        batch.drop_column("actorUltimaDecision")
+        batch.drop_column("fechaUltimaDecision")
@@ -0,0 +1,31 @@
+"""Índice de vencimientos para el planificador del semáforo de SLA.
+
+ix_solicitudes_sla (estado_id, slaObjetivo): resuelve con un recorrido de rango
+la carga de la ventana de vencimientos de las solicitudes abiertas, sin
+depender de la prioridad (segunda columna de ix_solicitudes_bandeja).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_solicitudes_sla", "solicitudes", ["estado_id", "slaObjetivo"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_solicitudes_sla", table_name="solicitudes")
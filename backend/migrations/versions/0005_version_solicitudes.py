@@ -0,0 +1,34 @@
+"""Columna de versión para el control de concurrencia optimista.
+
+solicitudes.version: el ORM la usa como version_id_col, de modo que cada
+transición actualiza con UPDATE ... WHERE idSolicitud = :id AND version = :leida
+y detecta la escritura concurrente (0 filas) sin bloquear la fila.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.drop_column("version")
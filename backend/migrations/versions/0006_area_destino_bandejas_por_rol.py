@@ -0,0 +1,43 @@
+"""Área de destino persistida e índice de la bandeja por área.
+
+solicitudes.areaDestino guarda el área elegida por el Secretario al derivar
+(antes se recibía en DerivacionInput y se descartaba). El índice
+ix_solicitudes_bandeja_area (estado_id, areaDestino, prioridad, slaObjetivo,
+idSolicitud) sirve la bandeja de cada Jefatura con el mismo recorrido keyset
+que ix_solicitudes_bandeja, sin leer las solicitudes de otras áreas.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.add_column(sa.Column("areaDestino", sa.String(length=50), nullable=True))
+
+    op.create_index(
+        "ix_solicitudes_bandeja_area",
+        "solicitudes",
+        ["estado_id", "areaDestino", "prioridad", "slaObjetivo", "idSolicitud"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_solicitudes_bandeja_area", table_name="solicitudes")
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.drop_column("areaDestino")
@@ -0,0 +1,44 @@
+"""Índice FULLTEXT para la búsqueda de solicitudes.
+
+ix_solicitudes_texto (solicitante, tipoSolicitud, descripcion) sirve a
+/approvals/search con MATCH ... AGAINST en modo booleano: la búsqueda por
+prefijo de alumno, trámite o texto de la descripción se resuelve en el índice
+invertido de InnoDB en lugar de recorrer la tabla. En otros dialectos (SQLite)
+no se crea: el repositorio usa el respaldo LIKE de services.busqueda.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 19:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIALECTOS_FULLTEXT = ("mysql", "mariadb")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name not in DIALECTOS_FULLTEXT:
+        return
+    op.create_index(
+        "ix_solicitudes_texto",
+        "solicitudes",
+        ["solicitante", "tipoSolicitud", "descripcion"],
+        mysql_prefix="FULLTEXT",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name not in DIALECTOS_FULLTEXT:
+        return
+    op.drop_index("ix_solicitudes_texto", table_name="solicitudes")
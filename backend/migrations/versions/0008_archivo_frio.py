@@ -0,0 +1,61 @@
+"""Tablas de archivo frío para solicitudes cerradas y bitácora de auditoría.
+
+solicitudes_archivadas recibe las solicitudes APROBADAS/RECHAZADAS con más de
+ARCHIVO_RETENCION_MESES desde su última decisión (detalle e historial en un
+único JSON comprimido); log_auditoria_archivada recibe la bitácora antigua en
+lotes JSON comprimidos. El archivador de fondo (services.archivador) las
+mueve desde las tablas vivas, que quedan acotadas a los datos recientes.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BLOB_ARCHIVO = sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql", "mariadb")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "solicitudes_archivadas",
+        sa.Column("idSolicitud", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("estado", sa.String(length=50), nullable=False),
+        sa.Column("fechaUltimaDecision", sa.DateTime(), nullable=True),
+        sa.Column("fechaArchivo", sa.DateTime(), nullable=False),
+        sa.Column("contenido", BLOB_ARCHIVO, nullable=False),
+        sa.PrimaryKeyConstraint("idSolicitud"),
+    )
+    op.create_index("ix_solicitudes_archivadas_decision", "solicitudes_archivadas", ["fechaUltimaDecision"])
+
+    op.create_table(
+        "log_auditoria_archivada",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("desde", sa.DateTime(), nullable=False),
+        sa.Column("hasta", sa.DateTime(), nullable=False),
+        sa.Column("filas", sa.Integer(), nullable=False),
+        sa.Column("fechaArchivo", sa.DateTime(), nullable=False),
+        sa.Column("contenido", BLOB_ARCHIVO, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_log_auditoria_archivada_periodo", "log_auditoria_archivada", ["desde", "hasta"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_log_auditoria_archivada_periodo", table_name="log_auditoria_archivada")
+    op.drop_table("log_auditoria_archivada")
+    op.drop_index("ix_solicitudes_archivadas_decision", table_name="solicitudes_archivadas")
+    op.drop_table("solicitudes_archivadas")
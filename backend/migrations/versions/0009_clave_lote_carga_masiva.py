@@ -0,0 +1,41 @@
+"""Clave de correlación de la carga masiva.
+
+solicitudes.loteCarga (UUID del lote) y solicitudes.posicionLote (posición del
+ítem en el lote) se escriben en el mismo INSERT multi-fila de
+/approvals/bulk. El índice ix_solicitudes_lote_carga permite recuperar los
+ids generados, en el orden de entrada, con un único SELECT por lote, sin
+suponer ids consecutivos (innodb_autoinc_lock_mode = 2 los intercala).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.add_column(sa.Column("loteCarga", sa.String(length=32), nullable=True))
+        batch.add_column(sa.Column("posicionLote", sa.Integer(), nullable=True))
+
+    op.create_index("ix_solicitudes_lote_carga", "solicitudes", ["loteCarga", "posicionLote"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_solicitudes_lote_carga", table_name="solicitudes")
+    with op.batch_alter_table("solicitudes") as batch:
+        batch.drop_column("posicionLote")
+        batch.drop_column("loteCarga")
@@ -0,0 +1,81 @@
+"""
+Fixtures compartidas: base de datos SQLite en memoria con el esquema ORM
+y el catálogo de estados inicializado, para probar repositorios y servicios
+sin depender de un servidor MySQL.
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.domain import models
+from app.repositories.estado_repository import inicializar_estados
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    SesionPrueba = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    sesion = SesionPrueba()
+    inicializar_estados(sesion)
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+        engine.dispose()
+
+
+class ContadorConsultas:
+    """Registra cada sentencia SQL emitida por el motor mientras está activo."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sentencias = []
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._registrar)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._registrar)
+
+    @property
+    def total(self) -> int:
+        return len(self.sentencias)
+
+
+@pytest.fixture
+def contar_consultas(db):
+    """Fábrica de contadores sobre el motor de la sesión de prueba."""
+    def _crear():
+        db.expunge_all()  # Evita que el identity map oculte cargas perezosas
+        return ContadorConsultas(db.get_bind())
+    return _crear
+
+
+@pytest.fixture
+def cliente(db, monkeypatch):
+    """TestClient del router de aprobaciones sobre la base SQLite en memoria."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.config.database import get_db
+    from app.controllers.approval_controller import router
+    from app.services.cache_detalle import CacheMemoriaLRU, cache_detalle
+
+    # Cada prueba reutiliza ids desde 1: la caché del detalle no se comparte
+    monkeypatch.setattr(cache_detalle, "backend", CacheMemoriaLRU())
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app)
@@ -0,0 +1,96 @@
+import hashlib
+import os
+
+import pytest
+
+from app.config import settings
+from app.repositories import solicitud_repository
+from app.services.almacen_adjuntos import almacen_adjuntos
+from app.services.bandeja_facade import BandejaAprobacionFacade
+
+API_PREFIX = "/api/v1"
+PDF = b"%PDF-1.7\n" + bytes(range(256)) * 400
+
+
+@pytest.fixture
+def almacen(tmp_path, monkeypatch):
+    monkeypatch.setattr(almacen_adjuntos, "raiz", str(tmp_path / "adjuntos"))
+    return almacen_adjuntos
+
+
+def crear(db) -> int:
+    return solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+
+
+def subir(cliente, id_solicitud: int, contenido: bytes = PDF, nombre: str = "acta.pdf"):
+    return cliente.post(f"{API_PREFIX}/approvals/{id_solicitud}/attachments", params={"nombre": nombre},
+                        content=contenido, headers={"Content-Type": "application/pdf"})
+
+
+def blobs(almacen) -> list:
+    return [archivo for _, _, archivos in os.walk(almacen.raiz) for archivo in archivos]
+
+
+def test_subida_guarda_por_hash_y_deduplica_el_contenido(cliente, db, almacen):
+    primera, segunda = crear(db), crear(db)
+
+    respuesta = subir(cliente, primera, nombre="C:\\Users\\alumno\\acta.pdf")
+    assert respuesta.status_code == 201
+    referencia = respuesta.json()
+    assert referencia["sha256"] == hashlib.sha256(PDF).hexdigest()
+    assert referencia["nombre"] == "acta.pdf" and referencia["tamano"] == len(PDF)
+
+    assert subir(cliente, segunda).json()["sha256"] == referencia["sha256"]
+    assert subir(cliente, primera).status_code == 201  # Repetir la subida no duplica la referencia
+    assert blobs(almacen) == [referencia["sha256"]]
+
+    detalle = cliente.get(f"{API_PREFIX}/approvals/{primera}/detail").json()
+    assert [a["sha256"] for a in detalle["adjuntos"]] == [referencia["sha256"]]
+
+
+def test_descarga_completa_y_por_rangos(cliente, db, almacen):
+    id_solicitud = crear(db)
+    sha256 = subir(cliente, id_solicitud).json()["sha256"]
+    url = f"{API_PREFIX}/approvals/{id_solicitud}/attachments/{sha256}"
+
+    completa = cliente.get(url)
+    assert completa.status_code == 200 and completa.content == PDF
+    assert completa.headers["content-type"] == "application/pdf"
+    assert 'filename="acta.pdf"' in completa.headers["content-disposition"]
+
+    parcial = cliente.get(url, headers={"Range": "bytes=100-199"})
+    assert parcial.status_code == 206
+    assert parcial.content == PDF[100:200]
+    assert parcial.headers["content-range"] == f"bytes 100-199/{len(PDF)}"
+
+    # El hash existe, pero no pertenece a esta solicitud
+    assert cliente.get(f"{API_PREFIX}/approvals/{crear(db)}/attachments/{sha256}").status_code == 404
+
+
+def test_descarga_delegada_a_nginx(cliente, db, almacen, monkeypatch):
+    monkeypatch.setattr(settings, "ADJUNTOS_X_ACCEL_PREFIJO", "/adjuntos-internos/")
+    id_solicitud = crear(db)
+    sha256 = subir(cliente, id_solicitud).json()["sha256"]
+
+    respuesta = cliente.get(f"{API_PREFIX}/approvals/{id_solicitud}/attachments/{sha256}")
+    assert respuesta.content == b""
+    assert respuesta.headers["x-accel-redirect"] == f"/adjuntos-internos/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def test_subidas_rechazadas_no_dejan_residuos(cliente, db, almacen, monkeypatch):
+    id_solicitud = crear(db)
+    monkeypatch.setattr(almacen, "max_bytes", 1024)
+
+    assert subir(cliente, id_solicitud).status_code == 413
+    assert subir(cliente, id_solicitud, contenido=b"").status_code == 400
+    assert subir(cliente, 999999, contenido=b"x").status_code == 404
+    assert blobs(almacen) == []
+    assert solicitud_repository.obtener_detalle(db, id_solicitud).adjuntos == []
+
+
+def test_la_bandeja_no_lee_la_columna_de_adjuntos(db, almacen, contar_consultas):
+    crear(db)
+    with contar_consultas() as contador:
+        BandejaAprobacionFacade(db).obtener_bandeja_ordenada()
+    assert contador.total > 0
+    assert not any("adjuntos" in sentencia for sentencia in contador.sentencias)
@@ -1,10 +1,21 @@
+import pytest
 from fastapi.testclient import TestClient
+from app.config import settings
 from app.main import app
 
 client = TestClient(app)
 API_PREFIX = "/api/v1"
 
 
+@pytest.fixture(scope="module", autouse=True)
+def arranque():
+    """Ejecuta el ciclo de vida de la app (esquema, catálogo y servicios de fondo) para todo el módulo."""
+    with pytest.MonkeyPatch.context() as parche:
+        parche.setattr(settings, "DB_CREAR_ESQUEMA", True)
+        with client:
+            yield
+
+
 def crear_solicitud_prueba(tipo_tramite: str = "Rectificación de Nota", solicitante: str = "Dante") -> int:
     """
     Crea una solicitud usando el endpoint test-seed para no depender de data previa.
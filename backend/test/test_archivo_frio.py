@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text, update
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import models
+from app.domain.models import HistorialDecision, LogAuditoria, LoteAuditoriaArchivado, Solicitud, SolicitudArchivada
+from app.domain.schemas import DerivacionInput
+from app.repositories import archivo_repository, solicitud_repository
+from app.repositories.estado_repository import inicializar_estados
+from app.services.archivador import Archivador, formatear_archivada, restar_meses
+from app.services.eventos import SOLICITUDES_ARCHIVADAS, BusEventos
+
+API_PREFIX = "/api/v1"
+AHORA = datetime(2026, 10, 18, 12, 0)
+
+
+def crear(db) -> int:
+    return solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+
+
+def envejecer(db, ids, meses: int):
+    db.execute(update(Solicitud).where(Solicitud.idSolicitud.in_(ids))
+               .values(fechaUltimaDecision=restar_meses(AHORA, meses)), execution_options={"synchronize_session": False})
+    db.commit()
+
+
+def archivador(bus=None, **opciones) -> Archivador:
+    return Archivador(bus=bus or BusEventos(), retencion_meses=12, retencion_auditoria_meses=6,
+                      reloj=lambda: AHORA, **opciones)
+
+
+def test_restar_meses_ajusta_el_dia_al_fin_de_mes():
+    assert restar_meses(datetime(2026, 3, 31, 8, 30), 1) == datetime(2026, 2, 28, 8, 30)
+    assert restar_meses(datetime(2026, 1, 15), 13) == datetime(2024, 12, 15)
+
+
+def test_archiva_por_lotes_solo_solicitudes_cerradas_y_antiguas(db):
+    aprobada, rechazada, reciente, observada, pendiente = (crear(db) for _ in range(5))
+    solicitud_repository.actualizar_estado(db, aprobada, "APROBADO", "Conforme")
+    solicitud_repository.actualizar_estado(db, rechazada, "RECHAZADO", "No procede")
+    solicitud_repository.actualizar_estado(db, reciente, "APROBADO", "Conforme")
+    solicitud_repository.derivar_solicitud(db, observada, DerivacionInput(area_destino="Alumno", checklist_valido=False))
+    envejecer(db, [aprobada, rechazada, observada], meses=13)
+    envejecer(db, [reciente], meses=2)
+
+    bus, publicados = BusEventos(), []
+    bus.suscribir(SOLICITUDES_ARCHIVADAS, lambda ids: publicados.append(ids))
+    resultado = archivador(bus, tamano_lote=1).ejecutar(db)
+
+    assert resultado["solicitudes"] == 2
+    assert publicados == [[aprobada], [rechazada]]  # Una transacción por lote
+    vivas = {s.idSolicitud for s in db.query(Solicitud)}
+    assert vivas == {reciente, observada, pendiente}
+    assert {h.solicitud_id for h in db.query(HistorialDecision)} == {reciente, observada}
+    assert {a.idSolicitud for a in db.query(SolicitudArchivada)} == {aprobada, rechazada}
+    assert [s.idSolicitud for s in solicitud_repository.consultar_historial(db)] == [reciente, observada]
+
+    archivada = archivo_repository.obtener_archivada(db, aprobada)
+    assert archivada["estado_actual"] == "APROBADO" and archivada["archivada"] is True
+    assert [d["accion"] for d in archivada["auditoria_decisiones"]] == ["Dictamen: APROBADO"]
+
+
+def test_el_detalle_de_una_solicitud_archivada_se_lee_del_archivo(cliente, db):
+    id_solicitud = crear(db)
+    solicitud_repository.actualizar_estado(db, id_solicitud, "RECHAZADO", "No procede")
+    url = f"{API_PREFIX}/approvals/{id_solicitud}/detail"
+    antes = cliente.get(url)
+    assert "archivada" not in antes.json()
+
+    envejecer(db, [id_solicitud], meses=24)
+    Archivador(retencion_meses=12, reloj=lambda: AHORA).ejecutar(db)  # Bus del proceso: invalida caché y ETag
+
+    despues = cliente.get(url, headers={"If-None-Match": antes.headers["ETag"]})
+    assert despues.status_code == 200
+    assert despues.json()["archivada"] is True
+    assert despues.json()["estado_actual"] == "RECHAZADO"
+    assert cliente.get(f"{API_PREFIX}/approvals/999999/detail").status_code == 404
+
+
+def test_compacta_la_bitacora_antigua_en_lotes_comprimidos(db):
+    antiguos = [AHORA - timedelta(days=400 - i) for i in range(5)]
+    db.add_all([LogAuditoria(endpoint=f"GET /antiguo/{i}", timestamp=t) for i, t in enumerate(antiguos)])
+    db.add(LogAuditoria(endpoint="GET /reciente", timestamp=AHORA - timedelta(days=3)))
+    db.commit()
+
+    resultado = archivador(tamano_lote=2).ejecutar(db)
+
+    assert resultado["auditoria"] == 5
+    assert [f.endpoint for f in db.query(LogAuditoria)] == ["GET /reciente"]
+    lotes = db.query(LoteAuditoriaArchivado).order_by(LoteAuditoriaArchivado.id).all()
+    assert [l.filas for l in lotes] == [2, 2, 1]
+    registros = [r for l in lotes for r in archivo_repository.descomprimir(l.contenido)]
+    assert [r["endpoint"] for r in registros] == [f"GET /antiguo/{i}" for i in range(5)]
+    assert lotes[0].desde == antiguos[0] and lotes[-1].hasta == antiguos[-1]
+
+
+def test_una_escritura_concurrente_no_se_pierde_al_archivar(tmp_path):
+    url = f"sqlite:///{tmp_path / 'archivo.db'}"
+    motor, otro_worker = create_engine(url), create_engine(url)
+    models.Base.metadata.create_all(bind=motor)
+    db = sessionmaker(bind=motor)()
+    inicializar_estados(db)
+    intacta, modificada = crear(db), crear(db)
+    for id_solicitud in (intacta, modificada):
+        solicitud_repository.actualizar_estado(db, id_solicitud, "APROBADO", "Conforme")
+    envejecer(db, [intacta, modificada], meses=24)
+
+    def serializar_mientras_otro_worker_escribe(solicitud):
+        if solicitud.idSolicitud == modificada:
+            # Un adjunto se confirma entre la lectura del lote y el borrado
+            with otro_worker.begin() as conn:
+                conn.execute(text("UPDATE solicitudes SET adjuntos = '[{\"sha256\": \"abc\"}]', version = version + 1 "
+                                  "WHERE idSolicitud = :id"), {"id": modificada})
+        return formatear_archivada(solicitud)
+
+    try:
+        ids = archivo_repository.archivar_lote_solicitudes(db, restar_meses(AHORA, 12), 10, serializar_mientras_otro_worker_escribe)
+
+        assert ids == [intacta]
+        assert {a.idSolicitud for a in db.query(SolicitudArchivada)} == {intacta}
+        viva = db.get(Solicitud, modificada)
+        assert viva.adjuntos == [{"sha256": "abc"}]
+        assert [h.solicitud_id for h in db.query(HistorialDecision)] == [modificada]
+    finally:
+        db.close()
+        motor.dispose()
+        otro_worker.dispose()
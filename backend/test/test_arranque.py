@@ -0,0 +1,78 @@
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.repositories import estado_repository
+from app.services.arranque import MedidorArranque
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_la_app_no_abre_conexiones(tmp_path):
+    archivo_bd = tmp_path / "campus360.db"
+    entorno = {**os.environ, "DATABASE_URL": f"sqlite:///{archivo_bd}", "DB_MODO": "sync"}
+
+    resultado = subprocess.run([sys.executable, "-c", "import app.main"], cwd=BACKEND, env=entorno,
+                               capture_output=True, text=True)
+
+    assert resultado.returncode == 0, resultado.stderr
+    assert not archivo_bd.exists()  # SQLite crea el archivo en la primera conexión
+
+
+@pytest.fixture
+def app_aislada(tmp_path, monkeypatch):
+    """app.main sobre un SQLite vacío en disco, sin servicios de fondo."""
+    import app.main as principal
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'campus360.db'}")
+    monkeypatch.setattr(principal, "engine", engine)
+    monkeypatch.setattr(principal, "SessionLocal", sessionmaker(autoflush=False, bind=engine))
+    for bandera in ("AUDITORIA_HABILITADA", "SLA_PLANIFICADOR_HABILITADO", "ARCHIVO_HABILITADO"):
+        monkeypatch.setattr(settings, bandera, False)
+    estado_repository.invalidar_catalogo_estados()
+    yield principal.app, engine
+    estado_repository.invalidar_catalogo_estados()
+    engine.dispose()
+
+
+def test_el_ciclo_de_vida_crea_el_esquema_y_precarga_el_catalogo(app_aislada, monkeypatch):
+    app, engine = app_aislada
+    monkeypatch.setattr(settings, "DB_CREAR_ESQUEMA", True)
+
+    with TestClient(app) as cliente:
+        assert {"estados", "solicitudes", "log_auditoria"} <= set(inspect(engine).get_table_names())
+        assert set(estado_repository.catalogo_ids_por_estado()) == {"PENDIENTE", "POR_APROBAR", "APROBADO", "OBSERVADO", "RECHAZADO"}
+        metricas = cliente.get("/api/v1/metrics/arranque").json()
+
+    assert {"importacion", "esquema", "catalogo", "servicios"} <= set(metricas["fases_ms"])
+    assert metricas["total_ms"] is not None and metricas["dentro_del_presupuesto"] is not None
+
+
+def test_sin_esquema_el_worker_arranca_y_difiere_el_catalogo(app_aislada, caplog):
+    app, engine = app_aislada
+
+    with caplog.at_level(logging.ERROR), TestClient(app):
+        assert inspect(engine).get_table_names() == []  # Esquema gestionado por Alembic
+        assert estado_repository.catalogo_ids_por_estado() == {}
+    assert "catálogo de estados" in caplog.text
+
+
+def test_advierte_cuando_el_arranque_supera_el_presupuesto(caplog):
+    medidor = MedidorArranque(presupuesto_ms=0)
+    with medidor.fase("catalogo"):
+        pass
+
+    with caplog.at_level(logging.WARNING):
+        total = medidor.finalizar()
+
+    assert total > 0
+    assert "supera el presupuesto" in caplog.text
+    assert medidor.instantanea()["dentro_del_presupuesto"] is False
+    assert "catalogo" in medidor.instantanea()["fases_ms"]
@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime, timedelta
+
+from app.domain.enums import EstadoSolicitud
+from app.domain.models import Solicitud
+from app.repositories import solicitud_repository
+from app.repositories.estado_repository import obtener_ids_estados
+from app.services.bandeja_facade import BandejaAprobacionFacade
+
+
+def sembrar_bandeja(db, cantidad: int):
+    """Crea solicitudes alternando prioridades y SLAs (incluye vencidas)."""
+    ahora = datetime.now()
+    for i in range(cantidad):
+        tipo = "Matricula Extemporánea" if i % 3 == 0 else "Rectificación de Nota"
+        sol = solicitud_repository.crear_solicitud(db, tipo, f"Alumno {i}", "Sustento")
+        sol.slaObjetivo = ahora + timedelta(hours=(i * 7) % 50 - 10)
+    db.commit()
+
+
+def test_paginas_concatenadas_respetan_orden_de_negocio(db):
+    sembrar_bandeja(db, 23)
+    fachada = BandejaAprobacionFacade(db)
+
+    recorridas, cursor, paginas = [], None, 0
+    while True:
+        pagina, cursor = fachada.obtener_bandeja_ordenada(limite=5, cursor=cursor)
+        assert len(pagina) <= 5
+        recorridas.extend(pagina)
+        paginas += 1
+        if not cursor:
+            break
+
+    assert paginas == 5
+    assert len({dto.id for dto in recorridas}) == 23
+
+    rango = {"ALTA": 1, "NORMAL": 2}
+    por_id = {s.idSolicitud: s for s in db.query(Solicitud).all()}
+    esperado = sorted(
+        por_id.values(),
+        key=lambda s: (rango[s.prioridad], s.slaObjetivo, s.idSolicitud)
+    )
+    assert [dto.id for dto in recorridas] == [s.idSolicitud for s in esperado]
+
+
+def test_vencidas_aparecen_primero_dentro_de_su_prioridad(db):
+    sembrar_bandeja(db, 12)
+    pagina, _ = BandejaAprobacionFacade(db).obtener_bandeja_ordenada(limite=50)
+
+    alta = [dto.semaforo_sla for dto in pagina if dto.prioridad == "ALTA"]
+    assert alta == sorted(alta, key=lambda s: s != "ROJO")
+
+
+def test_cursor_invalido_lanza_value_error(db):
+    fachada = BandejaAprobacionFacade(db)
+    with pytest.raises(ValueError):
+        fachada.obtener_bandeja_ordenada(cursor="no-es-un-cursor")
+
+
+def plan_de_ejecucion(db, consulta) -> str:
+    compilada = consulta.compile(dialect=db.get_bind().dialect)
+    parametros = tuple(compilada.params[nombre] for nombre in compilada.positiontup)
+    filas = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compilada), parametros).all()
+    return "\n".join(fila[-1] for fila in filas)
+
+
+@pytest.mark.parametrize("area", [None, "Jefatura"])
+def test_cada_tramo_es_un_recorrido_de_indice_sin_ordenar_el_backlog(db, area):
+    ids = obtener_ids_estados(db, solicitud_repository.ESTADOS_BANDEJA)
+    cursor = (1, datetime.now(), 10)
+    rango_sla = (datetime.now() - timedelta(days=1), None)
+
+    consultas = solicitud_repository.construir_consultas_tramo_bandeja(ids, 1, "ALTA", cursor, 51, rango_sla, area)
+
+    assert len(consultas) == len(ids)
+    for consulta in consultas:
+        plan = plan_de_ejecucion(db, consulta)
+        assert "ix_solicitudes_bandeja" in plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_la_pagina_intercala_los_estados_en_orden_de_sla(db):
+    sembrar_bandeja(db, 12)
+    por_aprobar = [s.idSolicitud for s in db.query(Solicitud).filter(Solicitud.prioridad == "NORMAL")][:3]
+    id_por_aprobar = obtener_ids_estados(db, [EstadoSolicitud.POR_APROBAR])[0]
+    db.query(Solicitud).filter(Solicitud.idSolicitud.in_(por_aprobar)).update({"estado_id": id_por_aprobar})
+    db.commit()
+
+    pagina, hay_mas = solicitud_repository.listar_solicitudes_por_aprobar(db, limite=50)
+
+    assert not hay_mas
+    normales = [s for s in pagina if s.prioridad == "NORMAL"]
+    assert {s.idSolicitud for s in normales} >= set(por_aprobar)
+    assert [(s.slaObjetivo, s.idSolicitud) for s in normales] == sorted((s.slaObjetivo, s.idSolicitud) for s in normales)
@@ -0,0 +1,92 @@
+from app.domain.enums import RolFlujo
+from app.domain.models import Solicitud
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+from app.services.bandeja_facade import BandejaAprobacionFacade
+
+API_PREFIX = "/api/v1"
+
+
+def derivar(db, id_solicitud: int, area: str = "Jefatura", valido: bool = True):
+    solicitud_repository.derivar_solicitud(
+        db, id_solicitud, DerivacionInput(area_destino=area, checklist_valido=valido, comentario="Revisión")
+    )
+
+
+def sembrar_flujo(db) -> dict:
+    """Una solicitud por estado abierto y área: la bandeja general las incluye a todas."""
+    ids = [
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento").idSolicitud
+        for i in range(4)
+    ]
+    pendiente, observada, jefatura, decanato = ids
+    derivar(db, observada, area="Alumno", valido=False)
+    derivar(db, jefatura, area="Jefatura")
+    derivar(db, decanato, area="Decanato")
+    return {"pendiente": pendiente, "observada": observada, "jefatura": jefatura, "decanato": decanato}
+
+
+def ids_bandeja(db, **filtros) -> set:
+    bandeja, _ = BandejaAprobacionFacade(db).obtener_bandeja_ordenada(limite=50, **filtros)
+    return {s.id for s in bandeja}
+
+
+def test_cada_rol_consulta_solo_su_porcion_de_la_bandeja(db):
+    ids = sembrar_flujo(db)
+
+    assert ids_bandeja(db) == set(ids.values())
+    assert ids_bandeja(db, rol=RolFlujo.SECRETARIO) == {ids["pendiente"], ids["observada"]}
+    assert ids_bandeja(db, rol=RolFlujo.APROBADOR) == {ids["jefatura"], ids["decanato"]}
+    assert ids_bandeja(db, rol=RolFlujo.APROBADOR, area="Decanato") == {ids["decanato"]}
+
+
+def test_area_destino_solo_se_persiste_en_derivaciones_validas(db):
+    ids = sembrar_flujo(db)
+    assert db.get(Solicitud, ids["jefatura"]).areaDestino == "Jefatura"
+    assert db.get(Solicitud, ids["observada"]).areaDestino is None
+
+    # Subsanada la observación, el Secretario la deriva y entra a la bandeja de esa área
+    derivar(db, ids["observada"], area="Jefatura")
+    db.expire_all()
+    assert db.get(Solicitud, ids["observada"]).areaDestino == "Jefatura"
+    assert ids_bandeja(db, rol=RolFlujo.APROBADOR, area="Jefatura") == {ids["jefatura"], ids["observada"]}
+
+
+def test_derivacion_masiva_persiste_el_area_destino(db):
+    ids = [
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento").idSolicitud
+        for i in range(3)
+    ]
+    solicitud_repository.derivar_solicitud_lote(db, ids, DerivacionInput(area_destino=" Decanato ", checklist_valido=True))
+    db.expire_all()
+
+    assert {db.get(Solicitud, i).areaDestino for i in ids} == {"Decanato"}
+    assert ids_bandeja(db, rol=RolFlujo.APROBADOR, area="Decanato") == set(ids)
+
+
+def test_endpoint_por_rol_filtra_y_versiona_cada_bandeja_por_separado(cliente, db):
+    ids = sembrar_flujo(db)
+
+    secretaria = cliente.get(f"{API_PREFIX}/approvals/pending/secretaria")
+    jefatura = cliente.get(f"{API_PREFIX}/approvals/pending/jefatura", params={"area": "Jefatura"})
+
+    assert secretaria.status_code == 200
+    assert {s["id"] for s in secretaria.json()} == {ids["pendiente"], ids["observada"]}
+    assert [s["id"] for s in jefatura.json()] == [ids["jefatura"]]
+    assert secretaria.headers["ETag"] != jefatura.headers["ETag"]
+    revalidada = cliente.get(f"{API_PREFIX}/approvals/pending/secretaria", headers={"If-None-Match": secretaria.headers["ETag"]})
+    assert revalidada.status_code == 304
+    assert cliente.get(f"{API_PREFIX}/approvals/pending/alumnos").status_code == 422
+
+
+def test_derivacion_rechaza_areas_en_blanco_o_mas_largas_que_la_columna(cliente, db):
+    id_solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+    url = f"{API_PREFIX}/workflow/{id_solicitud}/escalate"
+
+    for area in ("", "   ", "J" * 51):
+        assert cliente.post(url, json={"area_destino": area, "checklist_valido": True}).status_code == 422
+
+    # Al observar, el área no se persiste: basta con que venga informada
+    observar = {"area_destino": " ", "checklist_valido": False, "comentario": "Falta el sustento firmado"}
+    assert cliente.post(url, json=observar).status_code == 200
+    assert db.get(Solicitud, id_solicitud).areaDestino is None
@@ -0,0 +1,175 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.config.database import get_db
+from app.controllers.approval_controller import router
+from app.controllers.middleware_auditoria import MiddlewareAuditoria
+from app.domain.models import LogAuditoria
+from app.services.bitacora_auditoria import EscritorAuditoria
+
+
+def crear_escritor(tmp_path, **opciones) -> EscritorAuditoria:
+    return EscritorAuditoria(ruta_spool=str(tmp_path / "spool.ndjson"), **opciones)
+
+
+def test_vaciado_por_lotes_con_insert_multi_fila(db, contar_consultas, tmp_path):
+    escritor = crear_escritor(tmp_path, tamano_lote=3)
+    escritor._motor = db.get_bind()
+    for i in range(7):
+        escritor.registrar(f"GET /api/v1/recurso/{i}")
+
+    with contar_consultas() as contador:
+        escritor.vaciar()
+
+    assert db.query(LogAuditoria).count() == 7
+    assert sum("INSERT INTO log_auditoria" in s for s in contador.sentencias) == 3
+    assert db.query(LogAuditoria).first().usuario == "Sistema/Admin"
+
+
+def test_falla_de_base_de_datos_va_al_spool_y_se_reprocesa(db, tmp_path):
+    escritor = crear_escritor(tmp_path)
+    escritor._motor = create_engine("sqlite://", poolclass=StaticPool)  # sin tablas: el INSERT falla
+    escritor.registrar("POST /api/v1/approvals/1/verdict", usuario="Jefatura")
+    escritor.vaciar()
+
+    assert (tmp_path / "spool.ndjson").exists()
+    assert escritor.instantanea()["fallos_de_escritura"] == 1
+
+    escritor._motor = db.get_bind()
+    escritor.registrar("GET /api/v1/approvals/pending")
+    escritor.vaciar()
+
+    assert not (tmp_path / "spool.ndjson").exists()
+    assert {fila.usuario for fila in db.query(LogAuditoria)} == {"Jefatura", "Sistema/Admin"}
+    assert escritor.instantanea()["reprocesados_desde_spool"] == 1
+
+
+def test_cola_llena_desborda_en_memoria_y_el_hilo_lo_lleva_al_spool(tmp_path):
+    escritor = crear_escritor(tmp_path, capacidad=2)
+    for i in range(5):
+        escritor.registrar(f"GET /api/v1/recurso/{i}")
+
+    metricas = escritor.instantanea()
+    assert (metricas["en_cola"], metricas["en_desborde"], metricas["enviados_a_spool"]) == (2, 3, 0)
+    assert not (tmp_path / "spool.ndjson").exists()  # registrar() no hace E/S en el event loop
+
+    escritor._volcar_desborde()
+    assert escritor.instantanea()["en_desborde"] == 0
+    assert len((tmp_path / "spool.ndjson").read_text().splitlines()) == 3
+
+
+def test_hilo_de_fondo_persiste_lo_pendiente_al_detenerse(db, tmp_path):
+    escritor = crear_escritor(tmp_path, intervalo_ms=10)
+    escritor.iniciar(db.get_bind())
+    for i in range(20):
+        escritor.registrar(f"GET /api/v1/recurso/{i}")
+    escritor.detener()
+
+    assert db.query(LogAuditoria).count() == 20
+    assert escritor.instantanea()["activo"] is False
+
+
+def test_middleware_audita_lecturas_con_el_usuario_de_la_cabecera(db, tmp_path):
+    escritor = crear_escritor(tmp_path)
+    escritor._motor = db.get_bind()
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = lambda: db
+    app.add_middleware(MiddlewareAuditoria, escritor=escritor)
+
+    TestClient(app).get("/api/v1/approvals/history", headers={"X-Usuario": "Secretaria"})
+    escritor.vaciar()
+
+    registro = db.query(LogAuditoria).one()
+    assert (registro.usuario, registro.endpoint) == ("Secretaria", "GET /api/v1/approvals/history")
+
+
+def test_reproceso_del_spool_es_todo_o_nada(db, tmp_path):
+    escritor = crear_escritor(tmp_path, capacidad=1, tamano_lote=2)
+    for i in range(5):
+        escritor.registrar(f"GET /api/v1/recurso/{i}")
+    escritor._volcar_desborde()  # 4 eventos en el spool
+    motor = escritor._motor = db.get_bind()
+
+    inserciones = []
+
+    def cortar_en_el_segundo_bloque(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO log_auditoria"):
+            inserciones.append(statement)
+            if len(inserciones) == 2:
+                raise OperationalError(statement, parameters, Exception("corte simulado"))
+
+    event.listen(motor, "before_cursor_execute", cortar_en_el_segundo_bloque)
+    try:
+        escritor._reprocesar_spool()
+    finally:
+        event.remove(motor, "before_cursor_execute", cortar_en_el_segundo_bloque)
+
+    # El primer bloque no quedó confirmado: reintentar no duplica filas
+    assert db.query(LogAuditoria).count() == 0
+    assert len((tmp_path / "spool.ndjson").read_text().splitlines()) == 4
+
+    escritor._reprocesar_spool()
+    assert db.query(LogAuditoria).count() == 4
+    assert not (tmp_path / "spool.ndjson").exists()
+    assert escritor.instantanea()["reprocesados_desde_spool"] == 4
+
+
+def test_linea_truncada_del_spool_va_a_cuarentena(db, tmp_path):
+    escritor = crear_escritor(tmp_path, capacidad=1)
+    for i in range(3):
+        escritor.registrar(f"GET /api/v1/recurso/{i}")
+    escritor._volcar_desborde()  # 2 eventos en el spool
+    with open(tmp_path / "spool.ndjson", "a", encoding="utf-8") as spool:
+        spool.write('{"usuario": "Jefatura", "endpoint": "GET /api/v1/rec')  # corte a mitad de línea
+    escritor._motor = db.get_bind()
+
+    escritor._reprocesar_spool()
+
+    assert db.query(LogAuditoria).count() == 2
+    assert not (tmp_path / "spool.ndjson").exists()
+    assert (tmp_path / "spool.ndjson.corrupto").read_text().startswith('{"usuario": "Jefatura"')
+    assert escritor.instantanea()["lineas_en_cuarentena"] == 1
+
+
+def test_desborde_acotado_descarta_y_cuenta(tmp_path):
+    escritor = crear_escritor(tmp_path, capacidad=1, capacidad_desborde=2)
+    for i in range(5):
+        escritor.registrar(f"GET /api/v1/recurso/{i}")
+
+    metricas = escritor.instantanea()
+    assert (metricas["en_cola"], metricas["en_desborde"], metricas["descartados_por_desborde"]) == (1, 2, 2)
+
+
+def test_el_hilo_sobrevive_a_un_error_inesperado(db, tmp_path, monkeypatch):
+    escritor = crear_escritor(tmp_path, intervalo_ms=10)
+    original = escritor._persistir
+    fallos = []
+
+    def fallar_una_vez(lote):
+        if not fallos:
+            fallos.append(lote)
+            raise RuntimeError("error inesperado")
+        original(lote)
+
+    monkeypatch.setattr(escritor, "_persistir", fallar_una_vez)
+    escritor.iniciar(db.get_bind())
+    escritor.registrar("GET /api/v1/recurso/0")
+    for _ in range(200):
+        if fallos:
+            break
+        time.sleep(0.01)
+    escritor.registrar("GET /api/v1/recurso/1")
+    for _ in range(200):
+        if escritor.instantanea()["escritos"]:
+            break
+        time.sleep(0.01)
+
+    assert escritor.instantanea()["activo"] is True
+    escritor.detener()
+    assert [fila.endpoint for fila in db.query(LogAuditoria)] == ["GET /api/v1/recurso/1"]
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.repositories import solicitud_repository
+from app.services.busqueda import normalizar_terminos
+
+API_PREFIX = "/api/v1"
+
+
+def sembrar(db) -> dict:
+    datos = {
+        "garcia_nota": ("Rectificación de Nota", "María García", "Error en el acta de Cálculo"),
+        "garcia_matricula": ("Matrícula Extemporánea", "Pedro García", "Pago fuera de plazo"),
+        "quispe_nota": ("Rectificación de Nota", "Ana Quispe", "Nota de Física mal registrada"),
+    }
+    return {
+        clave: solicitud_repository.crear_solicitud(db, tramite, alumno, descripcion).idSolicitud
+        for clave, (tramite, alumno, descripcion) in datos.items()
+    }
+
+
+def ids(filas) -> list:
+    return [sol.idSolicitud for sol, _ in filas]
+
+
+def test_normalizar_terminos_descarta_operadores_cortos_y_repetidos():
+    assert normalizar_terminos('  +García* "nota" de NOTA -x ') == ["garcía", "nota"]
+    with pytest.raises(ValueError):
+        normalizar_terminos("de *")
+
+
+def test_busqueda_por_prefijo_exige_todos_los_terminos_y_ordena_por_relevancia(db):
+    sembradas = sembrar(db)
+
+    filas, hay_mas = solicitud_repository.buscar_solicitudes(db, ["garc"])
+    assert set(ids(filas)) == {sembradas["garcia_nota"], sembradas["garcia_matricula"]}
+    assert not hay_mas
+
+    # 'nota' aparece en el trámite y en la descripción de Quispe: mayor relevancia
+    filas, _ = solicitud_repository.buscar_solicitudes(db, ["nota"])
+    assert ids(filas) == [sembradas["quispe_nota"], sembradas["garcia_nota"]]
+
+    filas, _ = solicitud_repository.buscar_solicitudes(db, ["garc", "nota"])
+    assert ids(filas) == [sembradas["garcia_nota"]]
+
+
+def test_busqueda_filtra_por_estado_y_pagina(db):
+    sembradas = sembrar(db)
+    solicitud_repository.actualizar_estado(db, sembradas["garcia_nota"], "APROBADO", "Conforme")
+
+    filas, _ = solicitud_repository.buscar_solicitudes(db, ["garc"], estados=["APROBADO"])
+    assert ids(filas) == [sembradas["garcia_nota"]]
+
+    primera, hay_mas = solicitud_repository.buscar_solicitudes(db, ["rectificación"], limite=1)
+    segunda, fin = solicitud_repository.buscar_solicitudes(db, ["rectificación"], limite=1, desplazamiento=1)
+    assert hay_mas and not fin
+    assert set(ids(primera) + ids(segunda)) == {sembradas["garcia_nota"], sembradas["quispe_nota"]}
+
+
+def test_en_mysql_usa_match_against_en_modo_booleano():
+    consulta = solicitud_repository.construir_consulta_busqueda("mysql", ["garc", "nota"])
+    sql = str(consulta.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "MATCH (solicitudes.solicitante, solicitudes.`tipoSolicitud`, solicitudes.descripcion)" in sql
+    assert "AGAINST ('+garc* +nota*' IN BOOLEAN MODE)" in sql
+    assert "LIKE" not in sql
+
+
+def test_endpoint_de_busqueda(cliente, db):
+    sembradas = sembrar(db)
+
+    respuesta = cliente.get(f"{API_PREFIX}/approvals/search", params={"q": "garc", "limite": 1})
+    assert respuesta.status_code == 200
+    assert len(respuesta.json()) == 1 and respuesta.json()[0]["relevancia"] > 0
+    assert respuesta.headers["X-Siguiente-Desplazamiento"] == "1"
+
+    filtrada = cliente.get(f"{API_PREFIX}/approvals/search", params={"q": "garcía plazo", "estado": "PENDIENTE"})
+    assert [r["id"] for r in filtrada.json()] == [sembradas["garcia_matricula"]]
+    assert cliente.get(f"{API_PREFIX}/approvals/search", params={"q": "de"}).status_code == 400
+    assert cliente.get(f"{API_PREFIX}/approvals/search", params={"q": "garc", "estado": "BORRADOR"}).status_code == 400
@@ -0,0 +1,78 @@
+from app.repositories import solicitud_repository
+from app.services.cache_detalle import CacheDetalle, CacheMemoriaLRU
+from app.services.eventos import SOLICITUDES_TRANSICIONADAS, BusEventos
+from app.services.versiones_bandeja import VersionesBandeja
+
+API_PREFIX = "/api/v1"
+
+
+def crear(db) -> int:
+    return solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+
+
+def cache_aislada(capacidad: int = 10, ttl_seg: int = 60):
+    bus = BusEventos()
+    backend = CacheMemoriaLRU(capacidad=capacidad, ttl_seg=ttl_seg, versiones=VersionesBandeja(bus))
+    return CacheDetalle(backend, bus), bus
+
+
+def test_detalle_repetido_se_sirve_desde_la_cache_sin_consultar_la_base(cliente, db, contar_consultas):
+    id_solicitud = crear(db)
+    primera = cliente.get(f"{API_PREFIX}/approvals/{id_solicitud}/detail").json()
+
+    with contar_consultas() as contador:
+        segunda = cliente.get(f"{API_PREFIX}/approvals/{id_solicitud}/detail").json()
+
+    assert segunda == primera
+    assert contador.total == 0
+
+
+def test_transicion_invalida_solo_el_detalle_afectado(cliente, db, contar_consultas):
+    propia, ajena = crear(db), crear(db)
+    cliente.get(f"{API_PREFIX}/approvals/{propia}/detail")
+    cliente.get(f"{API_PREFIX}/approvals/{ajena}/detail")
+
+    solicitud_repository.actualizar_estado(db, propia, "APROBADO", "Conforme")
+
+    with contar_consultas() as contador:
+        assert cliente.get(f"{API_PREFIX}/approvals/{ajena}/detail").status_code == 200
+    assert contador.total == 0
+    detalle = cliente.get(f"{API_PREFIX}/approvals/{propia}/detail").json()
+    assert detalle["estado_actual"] == "APROBADO"
+    assert detalle["auditoria_decisiones"][-1]["comentario"] == "Conforme"
+
+
+def test_carga_concurrente_con_una_transicion_no_deja_un_detalle_obsoleto():
+    cache, bus = cache_aislada()
+
+    def cargar_mientras_se_dictamina():
+        # La transición se confirma entre la lectura de la base y el guardado
+        bus.publicar(SOLICITUDES_TRANSICIONADAS, ids=[1], estado="APROBADO")
+        return {"estado_actual": "PENDIENTE"}
+
+    assert cache.obtener(1, cargar_mientras_se_dictamina) == {"estado_actual": "PENDIENTE"}
+    assert cache.obtener(1, lambda: {"estado_actual": "APROBADO"}) == {"estado_actual": "APROBADO"}
+    assert cache.instantanea()["fallos"] == 2
+
+
+def test_lru_expulsa_la_menos_usada_y_respeta_el_ttl():
+    cache, _ = cache_aislada(capacidad=2)
+    for id_solicitud in (1, 2):
+        cache.obtener(id_solicitud, lambda: {"id": id_solicitud})
+    cache.obtener(1, lambda: None)             # 1 pasa a ser la más reciente
+    cache.obtener(3, lambda: {"id": 3})        # expulsa a 2
+
+    assert cache.obtener(2, lambda: None) is None
+    assert cache.obtener(1, lambda: None) == {"id": 1}
+    metricas = cache.instantanea()
+    assert metricas["expulsiones"] == 1 and metricas["entradas"] == 2
+
+    vencida, _ = cache_aislada(ttl_seg=0)
+    vencida.obtener(1, lambda: {"id": 1})
+    assert vencida.obtener(1, lambda: None) is None
+
+
+def test_solicitud_inexistente_no_se_guarda():
+    cache, _ = cache_aislada()
+    assert cache.obtener(99, lambda: None) is None
+    assert cache.instantanea()["entradas"] == 0
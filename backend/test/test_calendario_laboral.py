@@ -0,0 +1,71 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+from app.config import settings
+from app.services.calendario_laboral import CalendarioLaboral, domingo_de_pascua
+from app.services.sla_strategy import TramiteRegularCalendarioStrategy, TramiteUrgenteCalendarioStrategy
+from app.services.solicitud_factory import SolicitudFactory
+
+JORNADA = [(time(8), time(13)), (time(14), time(17))]
+
+
+def calendario(**opciones) -> CalendarioLaboral:
+    return CalendarioLaboral(JORNADA, **opciones)
+
+
+def sumar_minuto_a_minuto(cal: CalendarioLaboral, desde: datetime, horas: float) -> datetime:
+    """Referencia por fuerza bruta para contrastar las tablas precalculadas."""
+    restante, instante = int(horas * 60), desde.replace(second=0, microsecond=0)
+    while restante:
+        laborable = (
+            instante.weekday() in cal.dias_laborables and not cal.es_feriado(instante.date())
+            and any(inicio <= instante.time() < fin for inicio, fin in cal.jornada)
+        )
+        instante += timedelta(minutes=1)
+        restante -= laborable
+    return instante
+
+
+def test_pascua_y_semana_santa():
+    assert domingo_de_pascua(2026) == date(2026, 4, 5)
+    cal = calendario()
+    assert cal.es_feriado(date(2026, 4, 2)) and cal.es_feriado(date(2026, 4, 3))
+
+
+def test_salta_refrigerio_fin_de_semana_y_feriados():
+    cal = calendario()
+    # Viernes 16:00 + 2 h -> lunes 09:00
+    assert cal.sumar_horas_laborables(datetime(2026, 3, 6, 16), 2) == datetime(2026, 3, 9, 9)
+    # Lunes 12:30 + 1 h -> 14:30 (refrigerio de 13:00 a 14:00)
+    assert cal.sumar_horas_laborables(datetime(2026, 3, 9, 12, 30), 1) == datetime(2026, 3, 9, 14, 30)
+    # Fiestas Patrias (28 y 29 de julio)
+    assert cal.sumar_horas_laborables(datetime(2026, 7, 27, 16), 2) == datetime(2026, 7, 30, 9)
+    # Una jornada completa desde el inicio termina al cierre del mismo día
+    assert cal.sumar_horas_laborables(datetime(2026, 3, 9, 8), 8) == datetime(2026, 3, 9, 17)
+
+
+def test_cruza_de_año_y_respeta_feriados_extra():
+    cal = calendario(feriados_extra=[date(2027, 1, 4)])
+    # 31/12 16:00 + 2 h: 1/1 feriado, 2-3 fin de semana, 4 feriado institucional
+    assert cal.sumar_horas_laborables(datetime(2026, 12, 31, 16), 2) == datetime(2027, 1, 5, 9)
+
+
+def test_coincide_con_el_conteo_minuto_a_minuto():
+    cal = calendario()
+    aleatorio = random.Random(13)
+    for _ in range(60):
+        desde = datetime(2026, 1, 1) + timedelta(minutes=aleatorio.randint(0, 60 * 24 * 365))
+        horas = aleatorio.choice([0.5, 1, 8, 24, 27.25])
+        assert cal.sumar_horas_laborables(desde, horas) == sumar_minuto_a_minuto(cal, desde, horas), desde
+
+
+def test_estrategias_en_dias_habiles(monkeypatch):
+    cal = calendario()
+    jueves = datetime(2026, 3, 5, 10)
+    assert TramiteUrgenteCalendarioStrategy(cal).calcular_sla(jueves) == datetime(2026, 3, 6, 10)
+    assert TramiteRegularCalendarioStrategy(cal).calcular_sla(jueves) == datetime(2026, 3, 10, 10)
+
+    monkeypatch.setattr(settings, "SLA_CALENDARIO_LABORAL", True)
+    estrategia = SolicitudFactory.resolver_estrategia("Matricula Extemporánea")
+    assert isinstance(estrategia, TramiteUrgenteCalendarioStrategy)
+    assert estrategia.obtener_prioridad() == "ALTA"
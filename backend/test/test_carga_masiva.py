@@ -0,0 +1,73 @@
+import json
+
+from app.domain.models import Solicitud
+from app.domain.schemas import SolicitudCreateInput
+from app.repositories import solicitud_repository
+
+API_PREFIX = "/api/v1"
+
+
+def item(i: int, tipo: str = "Rectificación de Nota") -> dict:
+    return {"tipo_tramite": tipo, "solicitante": f"Alumno {i}", "descripcion": "Sustento"}
+
+
+def test_carga_masiva_inserta_por_lotes_y_aplica_estrategias(db, contar_consultas):
+    items = [SolicitudCreateInput(**item(i, "Matricula Extemporánea" if i % 2 else "Rectificación de Nota")) for i in range(25)]
+
+    with contar_consultas() as contador:
+        resultados = solicitud_repository.crear_solicitudes_masivo(db, items, tamano_lote=10)
+
+    inserts = [sql for sql in contador.sentencias if sql.startswith("INSERT")]
+    assert len(inserts) == 3  # 25 ítems en lotes de 10 -> 3 sentencias multi-fila
+    assert [r["indice"] for r in resultados] == list(range(25))
+    assert all(r["error"] is None for r in resultados)
+
+    por_id = {s.idSolicitud: s for s in db.query(Solicitud).all()}
+    for r, original in zip(resultados, items):
+        creada = por_id[r["id"]]
+        assert creada.solicitante == original.solicitante
+        assert creada.prioridad == ("ALTA" if "Extemporánea" in original.tipo_tramite else "NORMAL")
+
+
+def test_carga_masiva_reporta_errores_por_item_sin_abortar_el_lote(db):
+    items = [SolicitudCreateInput(**item(0)), SolicitudCreateInput(**{**item(1), "solicitante": "x" * 101}), SolicitudCreateInput(**item(2))]
+
+    resultados = solicitud_repository.crear_solicitudes_masivo(db, items)
+
+    assert resultados[0]["id"] is not None and resultados[2]["id"] is not None
+    assert resultados[1]["id"] is None and "solicitante" in resultados[1]["error"]
+    assert db.query(Solicitud).count() == 2
+
+
+def test_endpoint_ndjson_procesa_el_stream_y_reporta_lineas_invalidas(cliente):
+    lineas = [json.dumps(item(0)), "{no es json", json.dumps(item(2)), "", json.dumps({"tipo_tramite": "X"})]
+    cuerpo = ("\n".join(lineas)).encode("utf-8")
+
+    r = cliente.post(f"{API_PREFIX}/approvals/bulk/ndjson", content=cuerpo, headers={"Content-Type": "application/x-ndjson"})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert (data["total"], data["creadas"], data["con_error"]) == (4, 2, 2)
+    assert [res["indice"] for res in data["resultados"] if res["error"]] == [1, 3]
+
+
+def test_endpoint_json_devuelve_ids_por_item(cliente):
+    r = cliente.post(f"{API_PREFIX}/approvals/bulk", json=[item(i) for i in range(3)])
+    assert r.status_code == 200
+    assert r.json()["creadas"] == 3
+    assert all(res["id"] for res in r.json()["resultados"])
+
+
+def test_carga_masiva_recupera_los_ids_por_la_clave_del_lote(db, contar_consultas):
+    items = [SolicitudCreateInput(**item(i)) for i in range(7)]
+
+    with contar_consultas() as contador:
+        resultados = solicitud_repository.crear_solicitudes_masivo(db, items, tamano_lote=4)
+
+    lecturas = [sql for sql in contador.sentencias if sql.startswith("SELECT") and "loteCarga" in sql]
+    assert len(lecturas) == 2  # Un SELECT por lote, sin suponer ids consecutivos
+    creadas = {s.idSolicitud: s for s in db.query(Solicitud).all()}
+    lotes = [creadas[r["id"]].loteCarga for r in resultados]
+    assert len(set(lotes[:4])) == 1 and len(set(lotes[4:])) == 1 and lotes[0] != lotes[4]
+    assert [creadas[r["id"]].posicionLote for r in resultados] == [0, 1, 2, 3, 0, 1, 2]
+    assert [creadas[r["id"]].solicitante for r in resultados] == [i.solicitante for i in items]
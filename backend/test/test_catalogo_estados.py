@@ -0,0 +1,44 @@
+from app.domain.enums import EstadoSolicitud
+from app.domain.schemas import DerivacionInput
+from app.repositories import estado_repository, solicitud_repository
+
+
+def consultas_a_estados(contador) -> int:
+    return sum(1 for sql in contador.sentencias if "FROM estados" in sql)
+
+
+def test_rutas_de_escritura_no_consultan_el_catalogo(db, contar_consultas):
+    with contar_consultas() as contador:
+        creada = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Dante", "Sustento")
+        payload = DerivacionInput(area_destino="JEFATURA", checklist_valido=True)
+        solicitud_repository.derivar_solicitud(db, creada.idSolicitud, payload)
+        solicitud_repository.actualizar_estado(db, creada.idSolicitud, "APROBADO", "Conforme")
+        solicitud_repository.listar_solicitudes_por_aprobar(db)
+        solicitud_repository.consultar_historial(db)
+
+    assert consultas_a_estados(contador) == 0
+
+
+def test_invalidacion_fuerza_una_unica_recarga(db, contar_consultas):
+    estado_repository.invalidar_catalogo_estados()
+
+    with contar_consultas() as contador:
+        id_pendiente = estado_repository.obtener_id_estado(db, EstadoSolicitud.PENDIENTE)
+        id_aprobado = estado_repository.obtener_id_estado(db, "APROBADO")
+
+    assert consultas_a_estados(contador) == 1
+    assert estado_repository.obtener_nombre_estado(db, id_pendiente) == "PENDIENTE"
+    assert estado_repository.obtener_nombre_estado(db, id_aprobado) == "APROBADO"
+
+
+def test_la_recarga_no_vacia_el_catalogo_que_leen_otros_hilos(db):
+    ids_vigentes = estado_repository._catalogo[0]
+    esperado = dict(ids_vigentes)
+
+    estado_repository.cargar_catalogo_estados(db)
+    estado_repository.invalidar_catalogo_estados()
+
+    # Un lector que tomó la referencia antes de la recarga sigue viendo el catálogo completo
+    assert ids_vigentes == esperado and ids_vigentes["PENDIENTE"]
+    assert estado_repository.catalogo_ids_por_estado() == {}
+    assert estado_repository.obtener_id_estado(db, "PENDIENTE") == esperado["PENDIENTE"]
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.domain import models
+from app.domain.excepciones import ConflictoTransicion
+from app.domain.models import HistorialDecision, Solicitud
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+from app.repositories.estado_repository import inicializar_estados
+
+CLIENTES = 8
+
+
+@pytest.fixture
+def fabrica_sesiones(tmp_path):
+    """SQLite en archivo: cada hilo usa su propia conexión, como workers reales."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'concurrencia.db'}", connect_args={"timeout": 30})
+    models.Base.metadata.create_all(bind=engine)
+    Sesion = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Sesion() as sesion:
+        inicializar_estados(sesion)
+    yield Sesion
+    engine.dispose()
+
+
+def en_paralelo(fabrica_sesiones, operacion, clientes: int = CLIENTES) -> list:
+    """Ejecuta 'operacion(db)' en varios hilos que leen a la vez; devuelve 'ok' o 'conflicto' por hilo."""
+    barrera = threading.Barrier(clientes)
+
+    def cliente(_):
+        with fabrica_sesiones() as db:
+            barrera.wait()
+            try:
+                operacion(db)
+                return "ok"
+            except ConflictoTransicion:
+                return "conflicto"
+
+    with ThreadPoolExecutor(max_workers=clientes) as ejecutor:
+        return list(ejecutor.map(cliente, range(clientes)))
+
+
+def test_dictamenes_simultaneos_solo_uno_gana_y_los_demas_reciben_conflicto(fabrica_sesiones):
+    with fabrica_sesiones() as db:
+        id_solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+
+    resultados = en_paralelo(
+        fabrica_sesiones,
+        lambda db: solicitud_repository.actualizar_estado(db, id_solicitud, "APROBADO", "Conforme")
+    )
+
+    assert resultados.count("ok") == 1
+    assert resultados.count("conflicto") == CLIENTES - 1
+    with fabrica_sesiones() as db:
+        assert db.get(Solicitud, id_solicitud).version == 2
+        assert db.scalar(select(func.count()).select_from(HistorialDecision)) == 1
+
+
+def test_sin_actualizaciones_perdidas_entre_derivaciones_y_observaciones(fabrica_sesiones):
+    """Cada transición confirmada deja exactamente una versión y una fila de historial."""
+    with fabrica_sesiones() as db:
+        id_solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+    observar = DerivacionInput(area_destino="Alumno", checklist_valido=False, comentario="Falta sustento")
+
+    confirmadas = 0
+    for _ in range(5):
+        resultados = en_paralelo(
+            fabrica_sesiones, lambda db: solicitud_repository.derivar_solicitud(db, id_solicitud, observar)
+        )
+        confirmadas += resultados.count("ok")
+
+    with fabrica_sesiones() as db:
+        solicitud = db.get(Solicitud, id_solicitud)
+        historial = db.scalar(select(func.count()).select_from(HistorialDecision))
+    assert confirmadas >= 5
+    assert solicitud.version == 1 + confirmadas
+    assert historial == confirmadas
+
+
+def test_version_esperada_desactualizada_se_rechaza_sin_escribir(db):
+    solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento")
+    vista = solicitud.version
+    solicitud_repository.derivar_solicitud(
+        db, solicitud.idSolicitud, DerivacionInput(area_destino="Jefatura", checklist_valido=True, version=vista)
+    )
+
+    with pytest.raises(ConflictoTransicion, match="cambió desde que fue consultada"):
+        solicitud_repository.actualizar_estado(db, solicitud.idSolicitud, "APROBADO", "Conforme", version_esperada=vista)
+    assert db.get(Solicitud, solicitud.idSolicitud).estado_actual.tipoEstado == "POR_APROBAR"
+
+
+def test_dictamen_en_conflicto_responde_409(cliente, db):
+    id_solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+    dictamen = {"decision": "APROBADO", "comentario": "Conforme"}
+
+    assert cliente.post(f"/api/v1/approvals/{id_solicitud}/verdict", json=dictamen).status_code == 200
+    repetido = cliente.post(f"/api/v1/approvals/{id_solicitud}/verdict", json=dictamen)
+    assert repetido.status_code == 409
+    assert "ya fue resuelta" in repetido.json()["detail"]
@@ -0,0 +1,77 @@
+"""
+Arnés de conteo de consultas: cada endpoint de aprobaciones debe emitir un
+número de sentencias SQL constante, independiente del tamaño del resultado.
+"""
+from fastapi import Request, Response
+
+from app.controllers import approval_controller
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+
+
+def peticion() -> Request:
+    """Petición GET mínima para invocar los controladores sin el servidor ASGI."""
+    return Request({"type": "http", "path": "/api/v1/approvals/pending", "query_string": b"", "headers": []})
+
+
+def sembrar_pendientes(db, cantidad: int):
+    return [
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento").idSolicitud
+        for i in range(cantidad)
+    ]
+
+
+def sembrar_resueltas(db, cantidad: int):
+    for id_solicitud in sembrar_pendientes(db, cantidad):
+        solicitud_repository.actualizar_estado(db, id_solicitud, "APROBADO", "Conforme")
+
+
+def consultas_bandeja(db, contar_consultas) -> int:
+    with contar_consultas() as contador:
+        approval_controller.listar_pendientes(peticion(), Response(), limite=50, cursor=None, sla=None, horas=None, db=db)
+    return contador.total
+
+
+def consultas_historial(db, contar_consultas) -> int:
+    with contar_consultas() as contador:
+        approval_controller.consultar_historial(peticion(), Response(), db=db)
+    return contador.total
+
+
+def test_bandeja_no_crece_con_el_numero_de_filas(db, contar_consultas):
+    sembrar_pendientes(db, 3)
+    pocas = consultas_bandeja(db, contar_consultas)
+
+    ids = sembrar_pendientes(db, 30)
+    for id_solicitud in ids[::3]:
+        solicitud_repository.actualizar_estado(db, id_solicitud, "OBSERVADO", "Falta sustento")
+    for id_solicitud in ids[1::3]:
+        solicitud_repository.derivar_solicitud(db, id_solicitud, DerivacionInput(area_destino="Jefatura", checklist_valido=True))
+    muchas = consultas_bandeja(db, contar_consultas)
+
+    assert muchas == pocas, f"N+1 en /approvals/pending: {pocas} vs {muchas} consultas"
+
+
+def test_historial_no_crece_con_el_numero_de_filas(db, contar_consultas):
+    sembrar_resueltas(db, 3)
+    pocas = consultas_historial(db, contar_consultas)
+
+    sembrar_resueltas(db, 30)
+    muchas = consultas_historial(db, contar_consultas)
+
+    assert muchas == pocas, f"N+1 en /approvals/history: {pocas} vs {muchas} consultas"
+
+
+def test_detalle_no_crece_con_el_historial(db, contar_consultas):
+    id_corto, id_largo = sembrar_pendientes(db, 2)
+    solicitud_repository.actualizar_estado(db, id_corto, "OBSERVADO", "Falta sustento")
+    for _ in range(25):
+        solicitud_repository.actualizar_estado(db, id_largo, "OBSERVADO", "Falta sustento")
+
+    with contar_consultas() as corto:
+        approval_controller.ver_detalle_solicitud(id_corto, peticion(), Response(), db=db)
+    with contar_consultas() as largo:
+        detalle = approval_controller.ver_detalle_solicitud(id_largo, peticion(), Response(), db=db)
+
+    assert len(detalle["auditoria_decisiones"]) == 25
+    assert largo.total == corto.total, f"N+1 en /approvals/{{id}}/detail: {corto.total} vs {largo.total} consultas"
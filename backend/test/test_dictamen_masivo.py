@@ -0,0 +1,83 @@
+from app.domain.models import HistorialDecision, Solicitud
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+from app.repositories.estado_repository import obtener_nombre_estado
+
+API_PREFIX = "/api/v1"
+
+
+def sembrar(db, cantidad: int):
+    return [
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento").idSolicitud
+        for i in range(cantidad)
+    ]
+
+
+def test_dictamen_masivo_reporta_resultado_por_id(db):
+    abierta, resuelta = sembrar(db, 2)
+    solicitud_repository.actualizar_estado(db, resuelta, "APROBADO", "Conforme")
+
+    resultados = solicitud_repository.actualizar_estado_lote(db, [abierta, resuelta, 999999, abierta], "RECHAZADO", "No cumple requisitos")
+
+    por_id = {r["id"]: r for r in resultados}
+    assert len(resultados) == 3  # ids duplicados se procesan una vez
+    assert por_id[abierta]["nuevo_estado"] == "RECHAZADO" and por_id[abierta]["error"] is None
+    assert "resuelta" in por_id[resuelta]["error"]
+    assert "no encontrada" in por_id[999999]["error"]
+    assert obtener_nombre_estado(db, solicitud_repository.obtener_detalle(db, abierta).estado_id) == "RECHAZADO"
+
+
+def test_dictamen_masivo_usa_sentencias_constantes_y_un_commit(db, contar_consultas):
+    pocas_ids, muchas_ids = sembrar(db, 3), sembrar(db, 40)
+
+    with contar_consultas() as pocas:
+        solicitud_repository.actualizar_estado_lote(db, pocas_ids, "APROBADO", "Conforme")
+    with contar_consultas() as muchas:
+        solicitud_repository.actualizar_estado_lote(db, muchas_ids, "APROBADO", "Conforme")
+
+    assert muchas.total == pocas.total
+    assert db.query(HistorialDecision).count() == 43
+
+
+def test_endpoint_derivacion_masiva_respeta_estados_de_origen(cliente, db):
+    pendiente, por_aprobar = sembrar(db, 2)
+    solicitud_repository.derivar_solicitud(db, por_aprobar, DerivacionInput(area_destino="Jefatura", checklist_valido=True))
+
+    r = cliente.post(
+        f"{API_PREFIX}/workflow/escalate/batch",
+        json={"ids": [pendiente, por_aprobar], "area_destino": "JEFATURA", "checklist_valido": True}
+    )
+
+    assert r.status_code == 200
+    data = r.json()
+    assert (data["procesadas"], data["rechazadas"]) == (1, 1)
+    assert data["resultados"][0]["nuevo_estado"] == "POR_APROBAR"
+
+
+def test_endpoint_dictamen_masivo_exige_comentario_al_rechazar(cliente, db):
+    ids = sembrar(db, 2)
+    r = cliente.post(f"{API_PREFIX}/approvals/verdict/batch", json={"ids": ids, "decision": "RECHAZADO", "comentario": "no"})
+    assert r.status_code == 422
+
+
+def test_endpoints_masivos_rechazan_una_version_que_no_aplicarian(cliente, db):
+    ids = sembrar(db, 2)
+    dictamen = {"ids": ids, "decision": "APROBADO", "comentario": "Conforme", "version": 1}
+    derivacion = {"ids": ids, "area_destino": "Jefatura", "checklist_valido": True, "version": 1}
+
+    assert cliente.post(f"{API_PREFIX}/approvals/verdict/batch", json=dictamen).status_code == 422
+    assert cliente.post(f"{API_PREFIX}/workflow/escalate/batch", json=derivacion).status_code == 422
+    assert {obtener_nombre_estado(db, s.estado_id) for s in db.query(Solicitud)} == {"PENDIENTE"}
+
+
+def test_historial_y_detalle_expuestos_junto_a_los_endpoints_masivos(cliente, db):
+    (id_solicitud,) = sembrar(db, 1)
+    solicitud_repository.actualizar_estado(db, id_solicitud, "APROBADO", "Conforme")
+
+    historial = cliente.get(f"{API_PREFIX}/approvals/history")
+    detalle = cliente.get(f"{API_PREFIX}/approvals/{id_solicitud}/detail")
+
+    assert historial.status_code == 200
+    assert [fila["id"] for fila in historial.json()] == [id_solicitud]
+    assert detalle.status_code == 200
+    assert detalle.json()["auditoria_decisiones"][-1]["accion"] == "Dictamen: APROBADO"
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from app.domain.models import Solicitud
+from app.repositories import solicitud_repository
+
+API_PREFIX = "/api/v1"
+
+
+def sembrar_resueltas(db, cantidad: int, decision: str = "APROBADO"):
+    ids = []
+    for i in range(cantidad):
+        creada = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento")
+        solicitud_repository.actualizar_estado(db, creada.idSolicitud, decision, "Motivo de la decisión")
+        ids.append(creada.idSolicitud)
+    return ids
+
+
+def test_iterar_historial_recorre_por_bloques_keyset(db, contar_consultas):
+    ids = sembrar_resueltas(db, 7)
+    solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Pendiente", "Sustento")
+
+    with contar_consultas() as contador:
+        bloques = list(solicitud_repository.iterar_historial(db, tamano_bloque=3))
+
+    assert [len(b) for b in bloques] == [3, 3, 1]
+    assert [fila["id"] for b in bloques for fila in b] == ids
+    assert all(fila["fecha_decision"] is not None for b in bloques for fila in b)
+    # Una consulta por bloque (la fecha sale de la proyección) y una última vacía
+    assert contador.total == len(bloques) + 1
+
+
+def test_exportacion_ndjson_filtra_por_estado(cliente, db):
+    aprobadas = sembrar_resueltas(db, 2, "APROBADO")
+    sembrar_resueltas(db, 3, "RECHAZADO")
+
+    r = cliente.get(f"{API_PREFIX}/approvals/history/export", params={"estado": "APROBADO"})
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    filas = [json.loads(linea) for linea in r.text.splitlines()]
+    assert [f["id"] for f in filas] == aprobadas
+    assert {f["estado_final"] for f in filas} == {"APROBADO"}
+
+
+def test_exportacion_csv_filtra_por_rango_de_decision(cliente, db):
+    antiguas = sembrar_resueltas(db, 2)
+    db.query(Solicitud).filter(Solicitud.idSolicitud.in_(antiguas)).update(
+        {Solicitud.fechaUltimaDecision: datetime.now() - timedelta(days=400)}, synchronize_session=False
+    )
+    db.commit()
+    recientes = sembrar_resueltas(db, 2)
+
+    desde = (datetime.now() - timedelta(days=30)).isoformat()
+    r = cliente.get(f"{API_PREFIX}/approvals/history/export", params={"formato": "csv", "desde": desde})
+
+    assert r.status_code == 200
+    filas = list(csv.DictReader(io.StringIO(r.text)))
+    assert [int(f["id"]) for f in filas] == recientes
+
+
+def test_exportacion_rechaza_estados_no_finales(cliente):
+    r = cliente.get(f"{API_PREFIX}/approvals/history/export", params={"estado": "PENDIENTE"})
+    assert r.status_code == 400
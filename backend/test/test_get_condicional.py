@@ -0,0 +1,55 @@
+from app.repositories import solicitud_repository
+from app.services.eventos import SEMAFORO_SLA_CAMBIADO, bus_eventos
+
+API_PREFIX = "/api/v1"
+
+
+def crear(db, alumno: str = "Alumno") -> int:
+    return solicitud_repository.crear_solicitud(db, "Rectificación de Nota", alumno, "Sustento").idSolicitud
+
+
+def revalidar(cliente, ruta: str, etag: str, **params):
+    return cliente.get(f"{API_PREFIX}{ruta}", headers={"If-None-Match": etag}, params=params)
+
+
+def test_bandeja_sin_cambios_responde_304_sin_consultar_la_base(cliente, db, contar_consultas):
+    crear(db)
+    primera = cliente.get(f"{API_PREFIX}/approvals/pending")
+    etag = primera.headers["ETag"]
+    assert primera.headers["Cache-Control"] == "no-cache"
+
+    with contar_consultas() as contador:
+        r = revalidar(cliente, "/approvals/pending", etag)
+
+    assert r.status_code == 304 and r.content == b""
+    assert r.headers["ETag"] == etag
+    assert contador.total == 0
+
+
+def test_bandeja_cambia_de_version_con_altas_semaforo_y_parametros(cliente, db):
+    crear(db)
+    etag = cliente.get(f"{API_PREFIX}/approvals/pending").headers["ETag"]
+    assert revalidar(cliente, "/approvals/pending", etag, limite=1).status_code == 200
+
+    crear(db, "Otro alumno")
+    nueva = revalidar(cliente, "/approvals/pending", etag)
+    assert nueva.status_code == 200 and len(nueva.json()) == 2
+
+    etag = nueva.headers["ETag"]
+    bus_eventos.publicar(SEMAFORO_SLA_CAMBIADO, id=1, semaforo="ROJO")
+    assert revalidar(cliente, "/approvals/pending", etag).status_code == 200
+
+
+def test_historial_y_detalle_se_invalidan_solo_con_sus_transiciones(cliente, db):
+    propia, ajena = crear(db), crear(db)
+    etag_historial = cliente.get(f"{API_PREFIX}/approvals/history").headers["ETag"]
+    etag_detalle = cliente.get(f"{API_PREFIX}/approvals/{propia}/detail").headers["ETag"]
+
+    solicitud_repository.actualizar_estado(db, ajena, "APROBADO", "Conforme")
+    assert revalidar(cliente, "/approvals/history", etag_historial).status_code == 200
+    assert revalidar(cliente, f"/approvals/{propia}/detail", etag_detalle).status_code == 304
+
+    solicitud_repository.actualizar_estado(db, propia, "OBSERVADO", "Falta sustento")
+    detalle = revalidar(cliente, f"/approvals/{propia}/detail", etag_detalle)
+    assert detalle.status_code == 200
+    assert detalle.json()["estado_actual"] == "OBSERVADO"
@@ -0,0 +1,70 @@
+import pytest
+
+from app.domain.enums import EstadoSolicitud, RolFlujo
+from app.domain.excepciones import ConflictoTransicion
+from app.domain.maquina_estados import MaquinaEstados, Regla, maquina_estados
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+
+API_PREFIX = "/api/v1"
+
+
+@pytest.mark.parametrize("origen, destino, rol, valida", [
+    ("PENDIENTE", "POR_APROBAR", RolFlujo.SECRETARIO, True),
+    ("OBSERVADO", "OBSERVADO", RolFlujo.SECRETARIO, True),
+    ("POR_APROBAR", "POR_APROBAR", RolFlujo.SECRETARIO, False),
+    ("PENDIENTE", "APROBADO", RolFlujo.SECRETARIO, False),
+    ("POR_APROBAR", "APROBADO", RolFlujo.APROBADOR, True),
+    ("PENDIENTE", "POR_APROBAR", RolFlujo.APROBADOR, False),
+    ("APROBADO", "RECHAZADO", RolFlujo.APROBADOR, False),
+])
+def test_tabla_compilada_por_origen_destino_y_rol(origen, destino, rol, valida):
+    assert maquina_estados.es_valida(origen, destino, rol) is valida
+
+
+def test_motivos_de_rechazo_distinguen_estado_final_y_origen_no_admitido():
+    with pytest.raises(ConflictoTransicion, match="ya fue resuelta"):
+        maquina_estados.validar(EstadoSolicitud.RECHAZADO, EstadoSolicitud.APROBADO, RolFlujo.APROBADOR)
+    with pytest.raises(ConflictoTransicion, match="desde: PENDIENTE, OBSERVADO"):
+        maquina_estados.validar(EstadoSolicitud.POR_APROBAR, EstadoSolicitud.POR_APROBAR, RolFlujo.SECRETARIO)
+
+
+def test_reglas_declarativas_se_compilan_en_destinos_y_origenes():
+    maquina = MaquinaEstados([
+        Regla(RolFlujo.SECRETARIO, origenes=(EstadoSolicitud.PENDIENTE,), destinos=(EstadoSolicitud.POR_APROBAR,))
+    ])
+    assert maquina.destinos(RolFlujo.SECRETARIO) == ["POR_APROBAR"]
+    assert maquina.origenes("POR_APROBAR", "SECRETARIO") == ("PENDIENTE",)
+    assert not maquina.admite_destino("APROBADO", RolFlujo.APROBADOR)
+
+
+def test_validar_lote_separa_validos_y_rechazados_en_una_pasada():
+    validos, rechazados = maquina_estados.validar_lote(
+        {1: "PENDIENTE", 2: "APROBADO", 3: "POR_APROBAR"}, "RECHAZADO", RolFlujo.APROBADOR
+    )
+    assert validos == [1, 3]
+    assert list(rechazados) == [2] and "ya fue resuelta" in rechazados[2]
+
+
+def test_validar_una_transicion_no_consulta_la_base(db, contar_consultas):
+    solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento")
+    estado = solicitud.estado_actual.tipoEstado
+    with contar_consultas() as contador:
+        for _ in range(100):
+            maquina_estados.validar(estado, "POR_APROBAR", RolFlujo.SECRETARIO)
+    assert contador.total == 0
+
+
+def test_endpoints_aplican_la_misma_tabla(cliente, db):
+    id_solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento").idSolicitud
+
+    invalido = cliente.post(f"{API_PREFIX}/approvals/{id_solicitud}/verdict", json={"decision": "POR_APROBAR"})
+    assert invalido.status_code == 400
+
+    solicitud_repository.derivar_solicitud(db, id_solicitud, DerivacionInput(area_destino="Jefatura", checklist_valido=True))
+    repetida = cliente.post(
+        f"{API_PREFIX}/workflow/{id_solicitud}/escalate",
+        json={"area_destino": "Jefatura", "checklist_valido": True}
+    )
+    assert repetida.status_code == 409
+    assert "POR_APROBAR" in repetida.json()["detail"]
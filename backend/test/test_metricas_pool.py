@@ -0,0 +1,29 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.config.metricas_pool import QueuePoolInstrumentado, instantanea_pool
+
+
+def test_pool_instrumentado_registra_checkouts_y_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePoolInstrumentado,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+
+    conexion = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    datos = instantanea_pool(engine.pool)
+    assert datos["prestadas"] == 1
+    assert datos["checkouts"] == 1
+    assert datos["timeouts"] == 1
+    assert datos["esperando"] == 0
+    assert datos["latencia_checkout_ms"]["histograma"]["le_inf"] == 1
+
+    conexion.close()
+    engine.dispose()
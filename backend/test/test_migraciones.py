@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+pytest.importorskip("alembic")
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.domain import models
+
+RAIZ_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_migraciones_hasta_head_coinciden_con_los_modelos(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migraciones.db'}"
+    cfg = Config(os.path.join(RAIZ_BACKEND, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(RAIZ_BACKEND, "migrations"))
+    cfg.set_main_option("sqlalchemy.url", url)
+
+    command.upgrade(cfg, "head")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        contexto = MigrationContext.configure(conn, opts={"include_object": models.incluir_en_dialecto("sqlite")})
+        diferencias = compare_metadata(contexto, models.Base.metadata)
+    engine.dispose()
+
+    assert diferencias == [], f"Los modelos ORM tienen cambios sin migración: {diferencias}"
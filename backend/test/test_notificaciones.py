@@ -0,0 +1,150 @@
+import asyncio
+
+from app.domain.schemas import SolicitudCreateInput
+from app.repositories import solicitud_repository
+from app.services import notificaciones
+from app.services.eventos import SEMAFORO_SLA_CAMBIADO, bus_eventos
+from app.services.notificaciones import BrokerMemoria, broker_notificaciones, flujo_sse
+
+
+async def recibir(broker, cantidad: int, ultimo_id=None, publicar=None):
+    """Se suscribe, ejecuta 'publicar' desde otro hilo y devuelve los primeros eventos."""
+    suscripcion = broker.suscribir(ultimo_id)
+    recibidos = []
+    primero = asyncio.ensure_future(suscripcion.__anext__())
+    await asyncio.sleep(0)  # La suscripción queda registrada antes de publicar
+    if publicar:
+        await asyncio.to_thread(publicar)
+    recibidos.append(await asyncio.wait_for(primero, 1))
+    while len(recibidos) < cantidad:
+        recibidos.append(await asyncio.wait_for(suscripcion.__anext__(), 1))
+    await suscripcion.aclose()
+    return recibidos
+
+
+def test_broker_reparte_a_cada_suscriptor_los_eventos_publicados_desde_otro_hilo():
+    broker = BrokerMemoria(primer_id=1)
+
+    async def dos_clientes():
+        def publicar():
+            broker.publicar("creada", {"ids": [1]})
+            broker.publicar("dictamen", {"ids": [1], "estado": "APROBADO"})
+        a = broker.suscribir()
+        b = broker.suscribir()
+        siguientes = [asyncio.ensure_future(a.__anext__()), asyncio.ensure_future(b.__anext__())]
+        await asyncio.sleep(0)
+        await asyncio.to_thread(publicar)
+        primeros = await asyncio.gather(*siguientes)
+        segundos = await asyncio.gather(a.__anext__(), b.__anext__())
+        await a.aclose()
+        await b.aclose()
+        return primeros, segundos
+
+    primeros, segundos = asyncio.run(dos_clientes())
+    assert [e["tipo"] for e in primeros] == ["creada", "creada"]
+    assert [e["id"] for e in segundos] == [2, 2]
+    assert broker._suscriptores == set()
+
+
+def test_reanuda_desde_el_ultimo_id_o_pide_resincronizar_si_el_historial_no_alcanza():
+    broker = BrokerMemoria(tamano_historial=3, primer_id=1)
+    for i in range(5):
+        broker.publicar("creada", {"ids": [i]})
+
+    reanudados = asyncio.run(recibir(broker, 2, ultimo_id=3))
+    assert [e["id"] for e in reanudados] == [4, 5]
+
+    perdidos = asyncio.run(recibir(broker, 1, ultimo_id=0))
+    assert perdidos[0]["tipo"] == "resincronizar"
+
+
+def test_tras_un_reinicio_el_ultimo_id_anterior_pide_resincronizar():
+    anterior = BrokerMemoria()
+    for i in range(500):
+        anterior.publicar("creada", {"ids": [i]})
+    ultimo_visto = anterior._historial[-1]["id"]  # Last-Event-ID del cliente al caer el proceso
+
+    reiniciado = BrokerMemoria()
+    assert asyncio.run(recibir(reiniciado, 1, ultimo_id=ultimo_visto))[0]["tipo"] == "resincronizar"
+
+    reiniciado.publicar("dictamen", {"ids": [7], "estado": "APROBADO"})  # Cambio durante el corte
+    resincronizar = asyncio.run(recibir(reiniciado, 1, ultimo_id=ultimo_visto))[0]
+    assert resincronizar["tipo"] == "resincronizar"
+    assert resincronizar["id"] > ultimo_visto  # Desde ahí el cliente reanuda sin perder eventos
+
+    # Un id adelantado a la secuencia de este proceso tampoco se da por válido
+    assert asyncio.run(recibir(BrokerMemoria(primer_id=1), 1, ultimo_id=500))[0]["tipo"] == "resincronizar"
+
+
+def test_puente_traduce_las_escrituras_del_repositorio_a_eventos_del_stream(db):
+    def escribir():
+        solicitud = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento")
+        solicitud_repository.actualizar_estado(db, solicitud.idSolicitud, "APROBADO", "Conforme")
+        bus_eventos.publicar(SEMAFORO_SLA_CAMBIADO, id=solicitud.idSolicitud, semaforo="ROJO")
+
+    eventos = asyncio.run(recibir(broker_notificaciones, 3, publicar=escribir))
+
+    assert [e["tipo"] for e in eventos] == ["creada", "dictamen", "sla_vencido"]
+    assert eventos[1]["datos"] == {"ids": eventos[0]["datos"]["ids"], "estado": "APROBADO"}
+
+
+def test_las_altas_viajan_con_su_fila_de_bandeja_salvo_en_cargas_grandes(db, monkeypatch):
+    monkeypatch.setattr(notificaciones, "FILAS_POR_EVENTO", 2)
+    items = [SolicitudCreateInput(tipo_tramite="Matricula Extemporánea", solicitante=f"Alumno {i}", descripcion="Sustento")
+             for i in range(3)]
+
+    def escribir():
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento")
+        solicitud_repository.crear_solicitudes_masivo(db, items)
+
+    individual, masiva = asyncio.run(recibir(broker_notificaciones, 2, publicar=escribir))
+
+    (fila,) = individual["datos"]["filas"]
+    assert individual["datos"]["estado"] == "PENDIENTE"
+    assert fila == {"id": individual["datos"]["ids"][0], "alumno": "Alumno", "tipo_tramite": "Rectificación de Nota",
+                    "estado": "PENDIENTE", "prioridad": "NORMAL", "semaforo_sla": "VERDE", "descripcion": "Sustento"}
+    assert len(masiva["datos"]["ids"]) == 3 and "filas" not in masiva["datos"]
+
+
+def test_flujo_sse_emite_latidos_y_eventos_en_formato_event_stream():
+    broker = BrokerMemoria(primer_id=1)
+
+    async def leer():
+        flujo = flujo_sse(broker, latido_seg=0.01)
+        trozos = [await flujo.__anext__(), await flujo.__anext__()]
+        broker.publicar("derivacion", {"ids": [7], "estado": "POR_APROBAR"})
+        while not trozos[-1].startswith("id:"):
+            trozos.append(await flujo.__anext__())
+        await flujo.aclose()
+        return trozos
+
+    trozos = asyncio.run(leer())
+    assert trozos[0].startswith("retry:")
+    assert trozos[1] == ": latido\n\n"
+    assert trozos[-1] == 'id: 1\nevent: derivacion\ndata: {"ids": [7], "estado": "POR_APROBAR"}\n\n'
+
+
+def test_desconectar_a_mitad_del_stream_retira_al_suscriptor_sin_errores():
+    broker = BrokerMemoria(primer_id=1)
+
+    async def cliente_que_se_desconecta():
+        recibidos = []
+
+        async def consumir():
+            async for trozo in flujo_sse(broker, latido_seg=60):
+                recibidos.append(trozo)
+
+        tarea = asyncio.create_task(consumir())
+        while not broker._suscriptores:
+            await asyncio.sleep(0)
+        broker.publicar("creada", {"ids": [1]})
+        while len(recibidos) < 2:
+            await asyncio.sleep(0)
+        tarea.cancel()  # Starlette cancela la respuesta al cerrarse la conexión
+        resultado = await asyncio.gather(tarea, return_exceptions=True)
+        return recibidos, resultado[0]
+
+    recibidos, resultado = asyncio.run(cliente_que_se_desconecta())
+    assert recibidos[-1].startswith("id: 1\nevent: creada")
+    assert isinstance(resultado, asyncio.CancelledError), resultado
+    assert broker._suscriptores == set()
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.models import Solicitud
+from app.repositories import solicitud_repository
+from app.services.eventos import (
+    SEMAFORO_SLA_CAMBIADO, SOLICITUDES_CREADAS, SOLICITUDES_TRANSICIONADAS, BusEventos, bus_eventos
+)
+from app.services.planificador_sla import PlanificadorSla, clasificar_semaforo
+
+API_PREFIX = "/api/v1"
+AHORA = datetime(2026, 3, 2, 9, 0)
+
+
+def sembrar_con_sla(db, *vencimientos: timedelta):
+    ids = []
+    for i, delta in enumerate(vencimientos):
+        creada = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento")
+        creada.slaObjetivo = AHORA + delta
+        ids.append(creada.idSolicitud)
+    db.commit()
+    return ids
+
+
+def crear_planificador(db, reloj, umbral_horas: int = 12):
+    """Planificador con un bus propio para sus publicaciones (las altas/cierres se conectan aparte)."""
+    publicados = []
+    planificador = PlanificadorSla(bus=BusEventos(), umbral_horas=umbral_horas, ventana_min=60, reloj=reloj)
+    planificador._fabrica_sesion = sessionmaker(bind=db.get_bind())
+    planificador.bus.suscribir(SEMAFORO_SLA_CAMBIADO, lambda id, semaforo: publicados.append((id, semaforo)))
+    return planificador, publicados
+
+
+def test_clasificar_semaforo_por_umbral():
+    assert clasificar_semaforo(AHORA - timedelta(minutes=1), AHORA, umbral_horas=12) == "ROJO"
+    assert clasificar_semaforo(AHORA + timedelta(hours=11), AHORA, umbral_horas=12) == "AMBAR"
+    assert clasificar_semaforo(AHORA + timedelta(hours=13), AHORA, umbral_horas=12) == "VERDE"
+
+
+def test_publica_ambar_y_rojo_al_llegar_cada_instante(db):
+    cercana, ambar_pronto, lejana = sembrar_con_sla(db, timedelta(hours=1), timedelta(hours=12, minutes=30), timedelta(hours=20))
+    reloj = [AHORA]
+    planificador, publicados = crear_planificador(db, lambda: reloj[0])
+
+    planificador.cargar_ventana()
+    assert planificador.instantanea()["seguidas"] == 2  # la de 20 h queda fuera de la ventana
+
+    assert planificador.procesar_vencidos(AHORA + timedelta(minutes=10)) == []
+    assert planificador.procesar_vencidos(AHORA + timedelta(minutes=31)) == [(ambar_pronto, "AMBAR")]
+    assert planificador.procesar_vencidos(AHORA + timedelta(hours=1)) == [(cercana, "ROJO")]
+
+    # Al avanzar la ventana se incorpora la solicitud lejana
+    reloj[0] = AHORA + timedelta(hours=7, minutes=30)
+    planificador.cargar_ventana()
+    assert planificador.procesar_vencidos(AHORA + timedelta(hours=8, minutes=1)) == [(lejana, "AMBAR")]
+    assert publicados == [(ambar_pronto, "AMBAR"), (cercana, "ROJO"), (lejana, "AMBAR")]
+
+
+def test_altas_y_cierres_llegan_por_el_bus(db):
+    planificador, _ = crear_planificador(db, datetime.now, umbral_horas=48)  # ventana que cubre el SLA de 24 h
+    planificador.cargar_ventana()
+    bus_eventos.suscribir(SOLICITUDES_CREADAS, planificador._al_crear)
+    bus_eventos.suscribir(SOLICITUDES_TRANSICIONADAS, planificador._al_transicionar)
+    try:
+        creada = solicitud_repository.crear_solicitud(db, "Rectificación de Nota Extemporánea", "Alumno", "Sustento")
+        assert planificador.instantanea()["seguidas"] == 1
+
+        solicitud_repository.actualizar_estado(db, creada.idSolicitud, "APROBADO", "Conforme")
+        assert planificador.instantanea()["seguidas"] == 0
+        assert planificador.procesar_vencidos(creada.slaObjetivo + timedelta(seconds=1)) == []
+    finally:
+        bus_eventos.desuscribir(SOLICITUDES_CREADAS, planificador._al_crear)
+        bus_eventos.desuscribir(SOLICITUDES_TRANSICIONADAS, planificador._al_transicionar)
+
+
+def test_bandeja_filtra_vencidas_y_por_vencer(cliente, db):
+    ahora = datetime.now()
+    vencida, por_vencer, holgada = [
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento").idSolicitud
+        for i in range(3)
+    ]
+    for id_solicitud, delta in ((vencida, -2), (por_vencer, 3), (holgada, 48)):
+        db.get(Solicitud, id_solicitud).slaObjetivo = ahora + timedelta(hours=delta)
+    db.commit()
+
+    vencidas = cliente.get(f"{API_PREFIX}/approvals/pending", params={"sla": "vencidas"}).json()
+    proximas = cliente.get(f"{API_PREFIX}/approvals/pending", params={"sla": "por_vencer", "horas": 5}).json()
+
+    assert [(s["id"], s["semaforo_sla"]) for s in vencidas] == [(vencida, "ROJO")]
+    assert [(s["id"], s["semaforo_sla"]) for s in proximas] == [(por_vencer, "AMBAR")]
+    assert cliente.get(f"{API_PREFIX}/approvals/pending", params={"sla": "otro"}).status_code == 422
@@ -0,0 +1,67 @@
+"""
+La proyección de la última decisión en 'solicitudes' debe coincidir con la
+última fila de historial_decisiones en todas las rutas de escritura.
+"""
+from fastapi import Request, Response
+
+from app.controllers import approval_controller
+from app.domain.models import HistorialDecision, Solicitud
+from app.domain.schemas import DerivacionInput
+from app.repositories import solicitud_repository
+
+
+def ultima_decision(db, id_solicitud: int) -> HistorialDecision:
+    return (
+        db.query(HistorialDecision)
+        .filter(HistorialDecision.solicitud_id == id_solicitud)
+        .order_by(HistorialDecision.fecha.desc(), HistorialDecision.id.desc())
+        .first()
+    )
+
+
+def assert_proyeccion_consistente(db, id_solicitud: int):
+    db.expire_all()
+    solicitud = db.get(Solicitud, id_solicitud)
+    decision = ultima_decision(db, id_solicitud)
+    assert solicitud.fechaUltimaDecision == decision.fecha
+    assert solicitud.actorUltimaDecision == decision.usuario_id
+    assert solicitud.accionUltimaDecision == decision.accion
+
+
+def test_dictamen_y_derivacion_individual_mantienen_la_proyeccion(db):
+    creada = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", "Alumno", "Sustento")
+    assert creada.fechaUltimaDecision is None
+
+    solicitud_repository.derivar_solicitud(
+        db, creada.idSolicitud, DerivacionInput(area_destino="JEFATURA", checklist_valido=True, comentario="")
+    )
+    assert_proyeccion_consistente(db, creada.idSolicitud)
+
+    solicitud_repository.actualizar_estado(db, creada.idSolicitud, "APROBADO", "Conforme")
+    assert_proyeccion_consistente(db, creada.idSolicitud)
+
+
+def test_dictamen_masivo_mantiene_la_proyeccion(db):
+    ids = [
+        solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento").idSolicitud
+        for i in range(3)
+    ]
+    solicitud_repository.actualizar_estado_lote(db, ids, "RECHAZADO", "No procede")
+
+    for id_solicitud in ids:
+        assert_proyeccion_consistente(db, id_solicitud)
+
+
+def test_historial_se_lista_con_una_sola_consulta(db, contar_consultas):
+    for i in range(5):
+        creada = solicitud_repository.crear_solicitud(db, "Rectificación de Nota", f"Alumno {i}", "Sustento")
+        solicitud_repository.actualizar_estado(db, creada.idSolicitud, "APROBADO", "Conforme")
+
+    with contar_consultas() as contador:
+        historial = approval_controller.consultar_historial(
+            Request({"type": "http", "query_string": b"", "headers": []}), Response(), db=db
+        )
+
+    assert len(historial) == 5
+    assert all(fila["fecha_decision"] is not None for fila in historial)
+    assert contador.total == 1
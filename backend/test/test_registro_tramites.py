@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from app.config import settings
+from app.services.registro_tramites import RegistroTramites, cargar_configuracion, normalizar_tipo, registro_tramites
+from app.services.sla_strategy import TramiteRegularStrategy, TramiteUrgenteStrategy
+from app.services.solicitud_factory import SolicitudFactory
+
+
+def test_normaliza_tildes_mayusculas_y_espacios():
+    assert normalizar_tipo("  Matrícula   EXTEMPORÁNEA ") == "matricula extemporanea"
+
+
+def test_resuelve_nombres_libres_con_estrategias_compartidas():
+    urgente = registro_tramites.resolver("Matricula Extemporánea")
+
+    assert isinstance(urgente, TramiteUrgenteStrategy)
+    assert registro_tramites.resolver("MATRICULA EXTEMPORANEA") is urgente
+    assert registro_tramites.resolver("Retiro urgente de curso") is urgente
+    assert isinstance(registro_tramites.resolver("Rectificación de Nota"), TramiteRegularStrategy)
+    assert SolicitudFactory.resolver_estrategia("Matricula Extemporánea") is urgente
+
+
+def test_recarga_en_caliente_desde_archivo(tmp_path):
+    registro = RegistroTramites()
+    assert registro.familia("Constancia de Estudios") == "REGULAR"
+
+    ruta = tmp_path / "tramites.json"
+    ruta.write_text(json.dumps({
+        "por_defecto": "REGULAR",
+        "tipos": {"Constancia de Estudios": "URGENTE", "Reserva Urgente de Matrícula": "REGULAR"},
+        "palabras_clave": {"urgente": "URGENTE"}
+    }), encoding="utf-8")
+    registro.recargar(cargar_configuracion(str(ruta)))
+
+    assert registro.familia("constancia de estudios") == "URGENTE"
+    assert registro.familia("Reserva Urgente de Matrícula") == "REGULAR"  # el tipo exacto prevalece
+    assert registro.familia("Matricula Extemporánea") == "REGULAR"       # la palabra clave ya no existe
+
+
+def test_configuracion_invalida_conserva_la_vigente():
+    registro = RegistroTramites()
+    with pytest.raises(ValueError):
+        registro.recargar({"por_defecto": "INEXISTENTE"})
+    assert registro.familia("Matricula Extemporánea") == "URGENTE"
+
+
+def test_configuracion_vacia_no_se_confunde_con_releer_el_archivo():
+    registro = RegistroTramites()
+    registro.recargar({})
+    assert registro.familia("Matricula Extemporánea") == "REGULAR"
+
+
+@pytest.mark.parametrize("contenido", [
+    [],
+    {"tipos": ["Constancia de Estudios"]},
+    {"palabras_clave": "urgente"},
+    {"por_defecto": ["URGENTE"]},
+    "{no es json",
+])
+def test_endpoint_de_recarga_rechaza_archivos_mal_formados(tmp_path, monkeypatch, contenido):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.controllers.monitoring_controller import router
+
+    ruta = tmp_path / "tramites.json"
+    ruta.write_text(contenido if isinstance(contenido, str) else json.dumps(contenido), encoding="utf-8")
+    monkeypatch.setattr(settings, "TRAMITES_REGISTRO_RUTA", str(ruta))
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+
+    respuesta = TestClient(app).post("/api/v1/config/tramites/recargar")
+
+    assert respuesta.status_code == 400
+    assert registro_tramites.familia("Matricula Extemporánea") == "URGENTE"
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.domain import models
+from app.repositories import solicitud_repository, solicitud_repository_async
+from app.repositories.estado_repository import inicializar_estados
+
+
+async def ejecutar_flujo_async(ruta_bd):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{ruta_bd}")
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    SesionAsync = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with SesionAsync() as db:
+        await db.run_sync(inicializar_estados)
+        creadas = [
+            await db.run_sync(solicitud_repository.crear_solicitud, tipo, "Dante", "Sustento")
+            for tipo in ("Rectificación de Nota", "Matricula Extemporánea", "Rectificación de Nota")
+        ]
+        await solicitud_repository_async.actualizar_estado(db, creadas[2].idSolicitud, "APROBADO", "Conforme")
+
+        pagina, hay_mas = await solicitud_repository_async.listar_solicitudes_por_aprobar(db, limite=10)
+        historial = await solicitud_repository_async.consultar_historial(db)
+        detalle = await solicitud_repository_async.obtener_detalle(db, creadas[2].idSolicitud)
+
+    await engine.dispose()
+    return creadas, pagina, hay_mas, historial, detalle
+
+
+def test_repositorio_async_equivale_al_sincrono(tmp_path):
+    creadas, pagina, hay_mas, historial, detalle = asyncio.run(ejecutar_flujo_async(tmp_path / "async.db"))
+
+    # La urgente (ALTA) encabeza la bandeja; la aprobada ya no figura en ella
+    assert [s.idSolicitud for s in pagina] == [creadas[1].idSolicitud, creadas[0].idSolicitud]
+    assert hay_mas is False
+    assert [s.idSolicitud for s in historial] == [creadas[2].idSolicitud]
+    assert detalle.estado_actual.tipoEstado == "APROBADO"
+    assert len(detalle.historial_decisiones) == 1
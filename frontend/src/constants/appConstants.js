@@ -24,4 +24,10 @@ export const ACTIONS = {
   OBSERVADO: 'Observado',
   APROBADO: 'Aprobado',
   RECHAZADO: 'Rechazado',
-};
\ No newline at end of file
+};
+
+// 5. Bandejas particionadas por rol (GET /approvals/pending/{bandeja})
+export const INBOXES = {
+  SECRETARIA: 'secretaria',
+  JEFATURA: 'jefatura',
+};
@@ -1,5 +1,5 @@
 // src/hooks/useApprovals.js
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { approvalService } from '../services/approvalService';
 
 /* =========================================================
@@ -10,26 +10,62 @@ import { approvalService } from '../services/approvalService';
    y los componentes visuales.
 
    Lógica de Negocio:
-   Implementa el filtrado de estados según el rol:
+   Consulta la bandeja particionada del rol (el backend solo devuelve los
+   estados que le corresponden), una página a la vez: loadMore trae la
+   siguiente cuando el usuario la pide (hasMore indica si queda alguna):
    - Secretaría
    - Jefatura
+   Mantiene la bandeja al día aplicando los cambios del stream del backend
+   en lugar de sondear: las altas se insertan con la fila que trae el evento,
+   las transiciones y el semáforo se aplican en local, y los eventos de
+   estados que esta bandeja no muestra se ignoran. Solo se recarga ante un
+   pedido de resincronización, una carga masiva (el evento trae solo los ids)
+   o una solicitud que entra a la bandeja desde otra (ej. derivada a Jefatura).
 */
 
-export const useApprovals = (allowedStates = []) => {
+const SEMAFORO_POR_EVENTO = { sla_por_vencer: 'AMBAR', sla_vencido: 'ROJO' };
+// Orden de negocio de la bandeja (PRIORIDAD_RANGO del backend)
+const PRIORIDAD_RANGO = { ALTA: 1, NORMAL: 2, BAJA: 3 };
+const rangoPrioridad = (solicitud) => PRIORIDAD_RANGO[solicitud.prioridad] ?? 99;
+
+export const useApprovals = (allowedStates = [], bandeja = null) => {
   const [requests, setRequests] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Copia del cursor legible desde applyChange (registrado una sola vez al montar)
+  const nextCursorRef = useRef(null);
+  nextCursorRef.current = nextCursor;
+
+  const correspondeALaVista = (estado) => allowedStates.length === 0 || allowedStates.includes(estado);
+
+  // Una alta tiene el SLA más lejano de su tramo: va al final de su prioridad.
+  // Si cae tras la última fila cargada y quedan páginas, llegará con loadMore.
+  const insertarFilas = (prev, filas) => {
+    const presentes = new Set(prev.map(s => s.id));
+    const lista = [...prev];
+    filas.filter(fila => !presentes.has(fila.id)).forEach(fila => {
+      const posicion = lista.findIndex(s => rangoPrioridad(s) > rangoPrioridad(fila));
+      if (posicion >= 0) {
+        lista.splice(posicion, 0, fila);
+      } else if (!nextCursorRef.current) {
+        lista.push(fila);
+      }
+    });
+    return lista;
+  };
+
+  const filtrarPermitidas = (data) => allowedStates.length > 0
+    ? data.filter(s => allowedStates.includes(s.estado))
+    : data;
 
   const fetchRequests = async () => {
     setLoading(true);
     try {
-      const data = await approvalService.getPendingApprovals();
-
-      const filteredData = allowedStates.length > 0 
-        ? data.filter(s => allowedStates.includes(s.estado))
-        : data;
-      
-      setRequests(filteredData);
+      const { solicitudes, siguienteCursor } = await approvalService.getPendingApprovals(bandeja);
+      setRequests(filtrarPermitidas(solicitudes));
+      setNextCursor(siguienteCursor);
       setError(null);
     } catch (err) {
       setError(err.message);
@@ -38,7 +74,55 @@ export const useApprovals = (allowedStates = []) => {
     }
   };
 
-  useEffect(() => { fetchRequests(); }, []);
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const { solicitudes, siguienteCursor } = await approvalService.getPendingApprovals(bandeja, nextCursor);
+      // Un cambio en vivo pudo insertar ya alguna de estas filas
+      setRequests(prev => {
+        const presentes = new Set(prev.map(s => s.id));
+        return [...prev, ...filtrarPermitidas(solicitudes).filter(s => !presentes.has(s.id))];
+      });
+      setNextCursor(siguienteCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const applyChange = (tipo, datos) => {
+    if (tipo === 'resincronizar') {
+      fetchRequests();
+    } else if (tipo === 'creada') {
+      // Las altas entran como PENDIENTE: la bandeja de Jefatura no las muestra
+      if (!correspondeALaVista(datos.estado)) return;
+      if (datos.filas) {
+        setRequests(prev => insertarFilas(prev, datos.filas));
+      } else {
+        fetchRequests();
+      }
+    } else if (SEMAFORO_POR_EVENTO[tipo]) {
+      setRequests(prev => prev.map(s =>
+        s.id === datos.id ? { ...s, semaforo_sla: SEMAFORO_POR_EVENTO[tipo] } : s
+      ));
+    } else if (!correspondeALaVista(datos.estado)) {
+      // La solicitud salió de la bandeja de este rol
+      setRequests(prev => prev.filter(s => !datos.ids.includes(s.id)));
+    } else {
+      // Puede entrar a la bandeja de este rol (ej. derivada a Jefatura)
+      fetchRequests();
+    }
+  };
 
-  return { requests, loading, error, refresh: fetchRequests };
+  useEffect(() => {
+    fetchRequests();
+    return approvalService.subscribeToChanges(applyChange);
+  }, []);
+
+  return {
+    requests, loading, error, refresh: fetchRequests,
+    loadMore, loadingMore, hasMore: Boolean(nextCursor)
+  };
 };
\ No newline at end of file
@@ -11,16 +11,29 @@ import { API_CONFIG, ROLES, ACTIONS } from '../constants/appConstants';
    - Lista solicitudes pendientes.
    - Registra veredictos técnicos.
    - Consulta la bitácora histórica.
+   - Busca solicitudes por texto (alumno, trámite, descripción).
+   - Sube y descarga adjuntos.
+   - Se suscribe a los cambios en vivo de la bandeja (SSE).
 
 */
 
 export const approvalService = {
   // GET: Obtener lista de pendientes [cite: 83]
-  getPendingApprovals: async () => {
+  // La bandeja es paginada por cursor: devuelve una página y el cursor de la
+  // siguiente (cabecera X-Siguiente-Cursor, null en la última); el hook pide
+  // más páginas solo cuando el usuario las solicita. Con cache 'no-cache' el
+  // navegador revalida con If-None-Match y reutiliza la copia si recibe 304.
+  // Con 'bandeja' (INBOXES) el backend devuelve solo la porción de ese rol.
+  getPendingApprovals: async (bandeja = null, cursor = null) => {
     try {
-      const response = await fetch(`${API_CONFIG.BASE_URL}/approvals/pending`);
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const ruta = bandeja ? `/approvals/pending/${bandeja}` : '/approvals/pending';
+      const response = await fetch(`${API_CONFIG.BASE_URL}${ruta}${query}`, { cache: 'no-cache' });
       if (!response.ok) throw new Error('Error al obtener pendientes');
-      return await response.json();
+      return {
+        solicitudes: await response.json(),
+        siguienteCursor: response.headers.get('X-Siguiente-Cursor')
+      };
     } catch (error) {
       console.error("Fallo de conexión:", error);
       throw error;
@@ -51,7 +64,8 @@ export const approvalService = {
 
     const response = await fetch(url, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      // X-Usuario identifica al actor en la bitácora de auditoría del backend
+      headers: { 'Content-Type': 'application/json', 'X-Usuario': userRole },
       body: JSON.stringify(payload)
     });
 
@@ -71,9 +85,56 @@ export const approvalService = {
     return await response.json();
   },
 
+  // SSE: cambios incrementales de la bandeja (creada, derivacion, dictamen,
+  // sla_por_vencer, sla_vencido, resincronizar). EventSource reconecta solo y
+  // reenvía Last-Event-ID. Devuelve la función para cancelar la suscripción.
+  subscribeToChanges: (onChange) => {
+    const source = new EventSource(`${API_CONFIG.BASE_URL}/approvals/stream`);
+    const tipos = ['creada', 'derivacion', 'dictamen', 'sla_por_vencer', 'sla_vencido', 'resincronizar'];
+    tipos.forEach(tipo =>
+      source.addEventListener(tipo, (event) => onChange(tipo, JSON.parse(event.data)))
+    );
+    return () => source.close();
+  },
+
+  // GET: Búsqueda por alumno, trámite o descripción (índice de texto completo
+  // en el backend, resultados por relevancia). 'estados' limita la búsqueda.
+  searchRequests: async (texto, estados = []) => {
+    try {
+      const params = new URLSearchParams({ q: texto });
+      estados.forEach(estado => params.append('estado', estado));
+      const response = await fetch(`${API_CONFIG.BASE_URL}/approvals/search?${params}`);
+      if (!response.ok) throw new Error('Fallo en la búsqueda');
+      return await response.json();
+    } catch (error) {
+      console.error("Error en la búsqueda:", error);
+      throw error;
+    }
+  },
+
+  // POST: Adjuntar un archivo (File del input). Se envía el binario tal cual
+  // (sin multipart) y el backend lo guarda en streaming; retorna la referencia.
+  uploadAttachment: async (requestId, file) => {
+    const params = new URLSearchParams({ nombre: file.name });
+    const response = await fetch(`${API_CONFIG.BASE_URL}/approvals/${requestId}/attachments?${params}`, {
+      method: 'POST',
+      headers: { 'Content-Type': file.type || 'application/octet-stream' },
+      body: file
+    });
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || 'No se pudo adjuntar el archivo');
+    }
+    return await response.json();
+  },
+
+  // URL de descarga de un adjunto (referencia con 'sha256' del detalle)
+  getAttachmentUrl: (requestId, adjunto) =>
+    `${API_CONFIG.BASE_URL}/approvals/${requestId}/attachments/${adjunto.sha256}`,
+
   getHistory: async () => {
     try {
-      const response = await fetch(`${API_CONFIG.BASE_URL}/approvals/history`);
+      const response = await fetch(`${API_CONFIG.BASE_URL}/approvals/history`, { cache: 'no-cache' });
       if (!response.ok) throw new Error('Fallo al recuperar la bitácora');
       return await response.json();
     } catch (error) {
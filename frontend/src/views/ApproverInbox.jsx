@@ -3,13 +3,13 @@ import { useApprovals } from '../hooks/useApprovals';
 import { approvalService } from '../services/approvalService';
 import ApprovalTable from '../components/approval/ApprovalTable';
 import '../styles/ApproverInbox.css';
-import { REQUEST_STATES, ROLES } from '../constants/appConstants';
+import { REQUEST_STATES, ROLES, INBOXES } from '../constants/appConstants';
 
 const ApproverInbox = ({ onSelectRequest }) => {
   const [searchTerm, setSearchTerm] = useState('');
   
   const allowedStates = [REQUEST_STATES.POR_APROBAR];
-  const { requests, loading, error, refresh } = useApprovals(allowedStates);
+  const { requests, loading, error, refresh, loadMore, loadingMore, hasMore } = useApprovals(allowedStates, INBOXES.JEFATURA);
 
   const handleApprove = async (id) => {
     try {
@@ -54,6 +54,12 @@ const ApproverInbox = ({ onSelectRequest }) => {
         onSelect={onSelectRequest} 
         onApprove={handleApprove} 
       />
+
+      {hasMore && (
+        <button className="btn-clear" onClick={loadMore} disabled={loadingMore}>
+          {loadingMore ? 'Cargando...' : 'Cargar más'}
+        </button>
+      )}
       
       {filtradas.length === 0 && (
         <p className="empty-state">No se encontraron solicitudes pendientes en esta área.</p>
@@ -2,11 +2,18 @@ import React, { useState, useEffect } from 'react';
 import { approvalService } from '../services/approvalService';
 import ApprovalTable from '../components/approval/ApprovalTable';
 import '../styles/ApproverInbox.css';
+import { REQUEST_STATES } from '../constants/appConstants';
+
+// Estados finales visibles en la bitácora
+const ESTADOS_HISTORIAL = [REQUEST_STATES.APROBADO, REQUEST_STATES.RECHAZADO, REQUEST_STATES.OBSERVADO];
+// A partir de 3 caracteres (no numéricos) se busca en el servidor
+const MIN_CARACTERES_BUSQUEDA = 3;
 
 const HistoryView = ({ onSelectRequest }) => {
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
 
   // 1. Carga de datos delegada al servicio (Arquitectura en Capas)
   const loadHistoryData = async () => {
@@ -25,10 +32,27 @@ const HistoryView = ({ onSelectRequest }) => {
     loadHistoryData();
   }, []);
 
+  // Búsqueda de texto en el servidor (con espera de 300 ms entre pulsaciones)
+  useEffect(() => {
+    const texto = searchTerm.trim();
+    if (texto.length < MIN_CARACTERES_BUSQUEDA || /^\d+$/.test(texto)) {
+      setSearchResults(null);
+      return undefined;
+    }
+    const temporizador = setTimeout(async () => {
+      try {
+        setSearchResults(await approvalService.searchRequests(texto, ESTADOS_HISTORIAL));
+      } catch (err) {
+        setSearchResults(null);
+      }
+    }, 300);
+    return () => clearTimeout(temporizador);
+  }, [searchTerm]);
+
   if (loading) return <div className="loading">Accediendo a la bitácora técnica de la FISI...</div>;
 
-  // 2. Lógica de filtrado simple (KISS)
-  const filteredHistory = (history || []).filter(item => 
+  // 2. Resultados del servidor o filtrado simple por ID (KISS)
+  const filteredHistory = searchResults || (history || []).filter(item => 
     String(item.id).includes(searchTerm) || 
     (item.alumno || "").toLowerCase().includes(searchTerm.toLowerCase())
   );
@@ -43,7 +67,7 @@ const HistoryView = ({ onSelectRequest }) => {
       <div className="filters-panel">
         <input 
           type="text" 
-          placeholder="🔍 Buscar por ID o alumno..." 
+          placeholder="🔍 Buscar por ID, alumno, trámite o descripción..." 
           className="search-input"
           value={searchTerm}
           onChange={(e) => setSearchTerm(e.target.value)}
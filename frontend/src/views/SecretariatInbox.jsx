@@ -1,7 +1,7 @@
 import React, { useState } from 'react';
 import { useApprovals } from '../hooks/useApprovals';
 import { approvalService } from '../services/approvalService';
-import { ROLES, ACTIONS, REQUEST_STATES } from '../constants/appConstants';
+import { ROLES, ACTIONS, REQUEST_STATES, INBOXES } from '../constants/appConstants';
 import ApprovalTable from '../components/approval/ApprovalTable';
 import '../styles/ApproverInbox.css'; 
 
@@ -10,7 +10,7 @@ const SecretariatInbox = ({ onSelectRequest }) => {
   
   // Definimos qué estados puede ver el secretario según el informe (Caso de Uso 04)
   const allowedStates = [REQUEST_STATES.PENDIENTE, REQUEST_STATES.OBSERVADO];
-  const { requests, loading, refresh } = useApprovals(allowedStates);
+  const { requests, loading, refresh, loadMore, loadingMore, hasMore } = useApprovals(allowedStates, INBOXES.SECRETARIA);
 
   const handleForward = async (id) => {
     try {
@@ -57,6 +57,12 @@ const SecretariatInbox = ({ onSelectRequest }) => {
         onSelect={onSelectRequest} 
         onApprove={handleForward} // Aquí 'Approve' actúa como 'Derivar' para el secretario
       />
+
+      {hasMore && (
+        <button className="btn-clear" onClick={loadMore} disabled={loadingMore}>
+          {loadingMore ? 'Cargando...' : 'Cargar más'}
+        </button>
+      )}
     </div>
   );
 };